@@ -2,30 +2,45 @@ import logging
 import os
 from dotenv import load_dotenv
 import uvicorn
+from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from urllib.parse import urlparse
 from starlette.datastructures import State
 
-from google.adk.artifacts.gcs_artifact_service import GcsArtifactService
-from google.adk.memory.vertex_ai_rag_memory_service import VertexAiRagMemoryService
-from google.adk.sessions.database_session_service import DatabaseSessionService
-from google.adk.sessions.vertex_ai_session_service import VertexAiSessionService
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.events import InMemoryQueueManager
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-
 env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 print(".env path: ", env_path)
 load_dotenv(env_path)
 
 logging.basicConfig()
 
-from a2adk.adk_agent_executor import ADKAgentExecutor
+from a2adk.startup import startup_report
+
+# 세션/아티팩트/메모리/작업 저장소 구현은 a2adk.backends에서 선택된 것만 import합니다.
+with startup_report.stage('a2a', 'import'):
+    from a2a.server.apps import A2AStarletteApplication
+with startup_report.stage('executor', 'import'):
+    from a2adk.adk_agent_executor import ADKAgentExecutor
+from a2adk.agent_host import AgentHost
+from a2adk.agents import get_agent_names
 from a2adk.agents.card import get_agent_card
+from a2adk.backends import create_backend
+from a2adk.http_client import close_http_client
+from a2adk.lifespan import lifespan, on_shutdown
+from a2adk.memory import MEMORY_CACHE, CachingMemoryService
+from a2adk.metrics import mark_worker_dead, prepare_multiprocess_dir
+from a2adk.request_handler import ADKRequestHandler
 from a2adk.routes import get_routes
+from a2adk.sessions import (
+    SESSION_CACHE,
+    SESSION_CACHE_INVALIDATION,
+    SESSION_COMPACTION,
+    CachingSessionService,
+    CompactingSessionService,
+    SessionSummaryIndex,
+    SummaryIndexingSessionService,
+    create_session_versions,
+)
+from a2adk.utils import get_data_path
 
 A2A_SERVER_URL = os.getenv("VITE_A2A_SERVER_URL")
 # A2A_SERVER_URL에서 호스트와 포트 추출
@@ -33,48 +48,30 @@ parsed_url = urlparse(A2A_SERVER_URL)
 DEFAULT_HOST = parsed_url.hostname if parsed_url.hostname else 'localhost'
 DEFAULT_PORT = parsed_url.port if parsed_url.port else 10008
 ROOT_AGENT_NAME = os.getenv("ROOT_AGENT_NAME") or "root_agent"
+# 여러 에이전트를 한 프로세스에서 /agents/{이름} 경로로 제공합니다(이름,... 또는 * = 등록된 모든 에이전트).
+A2A_AGENT_MOUNTS = os.getenv("A2A_AGENT_MOUNTS")
+SESSION_SUMMARY_INDEX = os.getenv("SESSION_SUMMARY_INDEX") or get_data_path("session_index.db")
 UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS") or 4)
 
-def create_app(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, agent: str = ROOT_AGENT_NAME):
-    # Verify an API key is set. Not required if using Vertex AI APIs, since those can use gcloud credentials.
-    if not os.getenv('GOOGLE_GENAI_USE_VERTEXAI') == 'TRUE':
-        if not os.getenv('GOOGLE_API_KEY'):
-            raise Exception(
-                'GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE.'
-            )
-        
-    if os.getenv('GCS_ARTIFACT_SERVICE'):
-        artifact_service = GcsArtifactService(bucket_name=os.getenv('GCS_ARTIFACT_SERVICE'))
-    else:
-        artifact_service = None
-
-    if os.getenv('DATABASE_SESSION_SERVICE'):
-        session_service = DatabaseSessionService(db_url=os.getenv('DATABASE_SESSION_SERVICE'))
-    elif os.getenv('VERTEXAI_SESSION_SERVICE'):
-        vertexai_value = os.getenv('VERTEXAI_SESSION_SERVICE').split(":")
-        if len(vertexai_value) == 2:
-            session_service = VertexAiSessionService(project=vertexai_value[0], location=vertexai_value[1])
-        else:
-            session_service = VertexAiSessionService(project=vertexai_value[0])
-    else:
-        session_service = None
-        
-    if os.getenv('VERTEXAIRAG_MEMORY_SERVICE'):
-        memory_service = VertexAiRagMemoryService(rag_corpus=os.getenv('VERTEXAIRAG_MEMORY_SERVICE'))
-    else:
-        memory_service = None
+def _create_single_agent_app(
+    host, port, agent, artifact_service, session_service, agent_session_service, memory_service, session_index
+):
+    with startup_report.stage('executor'):
+        agent_executor = ADKAgentExecutor(
+            agent_name=agent,
+            artifact_service=artifact_service,
+            session_service=agent_session_service,
+            memory_service=memory_service,
+        )
+    on_shutdown(agent_executor.close)
+    task_store, queue_manager = create_backend('task_store')
 
-    agent_executor = ADKAgentExecutor(
-        agent_name=agent,
-        artifact_service=artifact_service,
-        session_service=session_service,
-        memory_service=memory_service,
-    )
     agent_card = get_agent_card(host, port)
-    request_handler = DefaultRequestHandler(
+    request_handler = ADKRequestHandler(
         agent_executor=agent_executor, 
-        task_store=InMemoryTaskStore(), 
-        queue_manager=InMemoryQueueManager()
+        task_store=task_store, 
+        queue_manager=queue_manager,
+        agent_name=agent,
     )
     
     # A2AStarletteApplication 인스턴스 생성 (빌더 역할)
@@ -83,20 +80,110 @@ def create_app(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, agent: str =
         http_handler=request_handler
     )
     
-    custom_routes = get_routes()
+    # 원격 A2A 호출에 사용하는 공용 커넥션 풀은 서버 종료 시 정리합니다.
+    on_shutdown(close_http_client)
+    on_shutdown(mark_worker_dead)
+
+    with startup_report.stage('routes'):
+        custom_routes = get_routes()
     if custom_routes and len(custom_routes) > 0:
         routes = a2a_app_config.routes() # 빌더에서 기본 라우트 가져오기
         routes.extend(custom_routes)
         # 최종 Starlette 앱 빌드
-        app_instance = a2a_app_config.build(routes=routes)
+        app_instance = a2a_app_config.build(routes=routes, lifespan=lifespan)
     else:
         # 최종 Starlette 앱 빌드
-        app_instance = a2a_app_config.build()
+        app_instance = a2a_app_config.build(lifespan=lifespan)
     
     # State 객체 생성 및 설정
     app_state = State()
-    app_state.session_service = agent_executor._runner.session_service
+    app_state.session_service = session_service
+    app_state.session_index = session_index
+    app_state.agent_executor = agent_executor
+    app_state.admission = request_handler.admission
     app_instance.state = app_state # 빌드된 Starlette 앱에 state 할당
+    return app_instance
+
+def create_app(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, agent: str = ROOT_AGENT_NAME):
+    # Verify an API key is set. Not required if using Vertex AI APIs, since those can use gcloud credentials.
+    if not os.getenv('GOOGLE_GENAI_USE_VERTEXAI') == 'TRUE':
+        if not os.getenv('GOOGLE_API_KEY'):
+            raise Exception(
+                'GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE.'
+            )
+        
+    artifact_service = create_backend('artifact')
+    session_service = create_backend('session')
+    session_cache = None
+    if SESSION_CACHE:
+        # 턴마다 반복되는 세션 조회를 캐시에서 처리합니다. 여러 워커는 버전 채널로 서로의 변경을 확인합니다.
+        invalidation = SESSION_CACHE_INVALIDATION
+        if not invalidation and UVICORN_WORKERS > 1:
+            invalidation = 'sqlite:///' + get_data_path("session_versions.db")
+        session_service = session_cache = CachingSessionService(
+            session_service, versions=create_session_versions(invalidation) if invalidation else None
+        )
+        on_shutdown(session_cache.close)
+
+    # 세션 목록 API가 전체 이력을 읽지 않도록 요약 인덱스를 함께 갱신합니다.
+    with startup_report.stage('session_index'):
+        session_index = SessionSummaryIndex(SESSION_SUMMARY_INDEX)
+        session_service = SummaryIndexingSessionService(session_service, session_index)
+
+    # 에이전트에는 압축된 이력을 주고, 세션 메시지 API는 전체 이력을 읽습니다.
+    agent_session_service = session_service
+    if SESSION_COMPACTION:
+        agent_session_service = CompactingSessionService(session_service)
+        on_shutdown(agent_session_service.close)
+
+    memory_service = create_backend('memory')
+    memory_cache = None
+    if MEMORY_CACHE and memory_service is not None:
+        # preload_memory_tool이 턴마다 원격 검색을 하지 않도록 검색 결과를 캐시합니다.
+        memory_service = memory_cache = CachingMemoryService(memory_service)
+
+    if A2A_AGENT_MOUNTS:
+        task_store, queue_manager = create_backend('task_store')
+        # 에이전트는 처음 요청될 때 만들고, 서비스와 작업 저장소는 모든 에이전트가 공유합니다.
+        agent_host = AgentHost(
+            host=host,
+            port=port,
+            artifact_service=artifact_service,
+            session_service=agent_session_service,
+            memory_service=memory_service,
+            task_store=task_store,
+            queue_manager=queue_manager,
+        )
+        on_shutdown(agent_host.close)
+        if A2A_AGENT_MOUNTS.strip() == '*':
+            agent_names = get_agent_names()
+        else:
+            agent_names = [name.strip() for name in A2A_AGENT_MOUNTS.split(',') if name.strip()]
+        on_shutdown(close_http_client)
+        on_shutdown(mark_worker_dead)
+        with startup_report.stage('routes'):
+            routes = [agent_host.mount(name) for name in agent_names]
+            routes.extend(get_routes())
+        app_instance = Starlette(routes=routes, lifespan=lifespan)
+
+        app_state = State()
+        app_state.session_service = session_service
+        app_state.session_index = session_index
+        app_state.agent_host = agent_host
+        app_state.admission = agent_host.admission
+        app_instance.state = app_state
+    else:
+        app_instance = _create_single_agent_app(
+            host, port, agent, artifact_service, session_service, agent_session_service, memory_service,
+            session_index,
+        )
+
+    if SESSION_COMPACTION:
+        app_instance.state.session_compaction = agent_session_service
+    if session_cache is not None:
+        app_instance.state.session_cache = session_cache
+    if memory_cache is not None:
+        app_instance.state.memory_cache = memory_cache
 
     # CORS 미들웨어 추가 (최종 앱 인스턴스에)
     app_instance.add_middleware(
@@ -106,12 +193,16 @@ def create_app(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, agent: str =
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    startup_report.finish()
     return app_instance
 
 def create_app_for_uvicorn():
     return create_app()
 
 def main():
+    if UVICORN_WORKERS > 1:
+        # 워커별 지표를 /metrics에서 합산할 수 있도록 공유 디렉터리를 지정합니다.
+        prepare_multiprocess_dir(os.getenv("PROMETHEUS_MULTIPROC_DIR") or get_data_path("prometheus"))
     uvicorn.run("a2adk.__main__:create_app_for_uvicorn", host=DEFAULT_HOST, port=DEFAULT_PORT, workers=UVICORN_WORKERS, factory=True)
 
 if __name__ == '__main__':
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Literal
+
+from google.adk.tools import BaseTool, ToolContext
+
+from a2a.types import Part, SendMessageSuccessResponse, TaskState, TextPart
+
+from a2adk.a2atool import A2ATool
+
+logger = logging.getLogger(__name__)
+
+FanOutMode = Literal['all', 'first', 'quorum']
+
+
+class A2AFanOutTool(BaseTool):
+    """Tool that sends one message to several remote A2A agents concurrently.
+
+    Modes:
+    - `all`: wait for every agent until the deadline and return what arrived.
+    - `first`: return as soon as `min_results` agents answered (default 1).
+    - `quorum`: return as soon as a majority (or `min_results`) answered.
+
+    Agents that fail or miss the deadline are reported in the result instead
+    of failing the whole call. Each answer is also forwarded as a `working`
+    status update as soon as it arrives, when running under ADKAgentExecutor.
+    """
+
+    def __init__(
+        self,
+        agent_urls: list[str],
+        *,
+        name: str = 'a2a_fan_out',
+        description: str | None = None,
+        mode: FanOutMode = 'all',
+        min_results: int | None = None,
+        timeout: float = 30.0,
+    ):
+        if not agent_urls:
+            raise ValueError('A2AFanOutTool requires at least one agent URL')
+        if mode not in ('all', 'first', 'quorum'):
+            raise ValueError(f'Unknown fan-out mode: {mode}')
+        super().__init__(
+            name=name,
+            description=description or f'Ask {len(agent_urls)} remote agents the same question at once.',
+        )
+        self._tools = [A2ATool(agent_url) for agent_url in agent_urls]
+        self._mode = mode
+        self._timeout = timeout
+        if min_results is not None:
+            self._min_results = max(1, min(min_results, len(agent_urls)))
+        elif mode == 'first':
+            self._min_results = 1
+        elif mode == 'quorum':
+            self._min_results = len(agent_urls) // 2 + 1
+        else:
+            self._min_results = len(agent_urls)
+
+    async def __call__(self, message: str, tool_context: ToolContext):
+        """Send the same message to all configured agents and collect their answers."""
+        context_id = tool_context._invocation_context.session.id
+        task_updater = getattr(
+            tool_context._invocation_context.run_config, 'current_task_updater', None
+        )
+        started = time.monotonic()
+        pending = {
+            asyncio.create_task(self._ask(tool, message, context_id)): tool
+            for tool in self._tools
+        }
+        results = []
+        failed = []
+        try:
+            while pending and len(results) < self._min_results:
+                remaining = self._timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                if self._mode != 'all' and len(results) + len(pending) < self._min_results:
+                    # 남은 에이전트가 모두 응답해도 정족수를 채울 수 없습니다.
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    tool = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.debug('Fan-out to %s failed: %s', tool._agent_endpoint, e)
+                        failed.append({'agent': tool.name, 'url': tool._agent_endpoint, 'error': str(e)})
+                        continue
+                    results.append(result)
+                    if task_updater is not None:
+                        task_updater.update_status(
+                            TaskState.working,
+                            message=task_updater.new_agent_message(
+                                [Part(TextPart(text=f"[{result['agent']}] {result['response']}"))]
+                            ),
+                        )
+        finally:
+            for task in pending:
+                task.cancel()
+        timed_out = [
+            {'agent': tool.name, 'url': tool._agent_endpoint}
+            for tool in pending.values()
+        ]
+        return {
+            'response': '\n\n'.join(f"[{r['agent']}]\n{r['response']}" for r in results),
+            'mode': self._mode,
+            'complete': len(results) >= self._min_results,
+            'results': results,
+            'failed': failed,
+            'timed_out': timed_out,
+        }
+
+    async def _ask(self, tool: A2ATool, message: str, context_id: str) -> dict:
+        started = time.monotonic()
+        await tool.resolve()
+        response = await tool._send_agent_message(tool._new_request(message, context_id=context_id))
+        if not isinstance(response.root, SendMessageSuccessResponse):
+            raise Exception(f'Agent returned an error: {response.root.error.message}')
+        content, task = tool._parse_response(response)
+        return {
+            'agent': tool.name,
+            'url': tool._agent_endpoint,
+            'response': '\n'.join(content),
+            'state': task.status.state.value if task else None,
+            'elapsed': round(time.monotonic() - started, 3),
+        }
@@ -1,13 +1,22 @@
-import httpx
 from uuid import uuid4
 import asyncio
+import json
 import logging
+import os
+import random
+import re
+import time
+from collections import Counter
 from typing import Any
+from urllib.parse import urlparse
+
+from httpx_sse import aconnect_sse
 
 from google.adk.tools import BaseTool, ToolContext
 
 from a2a.types import (
     AgentCard,
+    CancelTaskRequest,
     SendMessageRequest,
     MessageSendParams,
     Message,
@@ -15,75 +24,311 @@ from a2a.types import (
     Part,
     TextPart,
     SendMessageSuccessResponse,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
     Task,
     TaskState,
+    TaskIdParams,
+    TaskResubscriptionRequest,
+    TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
     GetTaskRequest,
     GetTaskSuccessResponse,
     TaskQueryParams,
     TextPart,
 )
-from a2a.client import A2AClient, A2ACardResolver
+from a2a.client import A2AClient
 from a2a.utils import get_text_parts
 
+from a2adk.agent_card_cache import agent_card_cache
+from a2adk.http_client import get_http_client
+from a2adk.metrics import count_a2a_call, count_a2a_task_wait, stage_timer
+from a2adk.resilience import CircuitOpenError, get_circuit_breaker, get_latency_tracker, peek_circuit_breaker
+
 logger = logging.getLogger(__name__)
 
+# 스트리밍을 지원하지 않는 에이전트의 작업 상태를 조회하는 지수 백오프 설정입니다.
+AUTH_TASK_POLLING_DELAY_SECONDS = float(os.getenv("A2A_TASK_POLL_INITIAL_DELAY") or 0.2)
+AUTH_TASK_POLLING_MAX_DELAY_SECONDS = float(os.getenv("A2A_TASK_POLL_MAX_DELAY") or 5.0)
+AUTH_TASK_WAIT_TIMEOUT_SECONDS = float(os.getenv("A2A_TASK_WAIT_TIMEOUT") or 600.0)
+# 로컬 작업이 취소될 때 원격 작업 취소(tasks/cancel) 요청을 기다리는 최대 시간(초)입니다.
+A2A_REMOTE_CANCEL_TIMEOUT = 5.0
+
+TERMINAL_TASK_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+# polls: 실제 get_task 호출 수
+# polls_avoided: 고정 간격(AUTH_TASK_POLLING_DELAY_SECONDS) 폴링 대비 줄어든 호출 수
+# subscriptions: tasks/resubscribe 스트림으로 대기한 횟수
+wait_stats: Counter = Counter()
+# 엔드포인트 -> 호출 통계(requests, failures, circuit_rejected, hedges_sent, hedges_won)
+_call_stats: dict[str, Counter] = {}
+
+
+def a2a_tool_stats() -> dict:
+    """Call, circuit breaker and latency statistics of every remote A2A endpoint used in this process,
+    and the dependent task wait counters (`wait_stats`)."""
+    endpoints = {}
+    for endpoint, calls in _call_stats.items():
+        breaker = peek_circuit_breaker(endpoint)
+        endpoints[endpoint] = {
+            'calls': dict(calls),
+            'circuit': breaker.stats() if breaker is not None else None,
+            'latency': get_latency_tracker(endpoint).stats(),
+        }
+    return {'endpoints': endpoints, 'task_wait': dict(wait_stats)}
+
+
+def _default_tool_name(agent_url: str) -> str:
+    netloc = urlparse(agent_url).netloc or agent_url
+    return 'a2a_' + re.sub(r'[^a-zA-Z0-9_]', '_', netloc)
+
+
 class A2ATool(BaseTool):
-    def __init__(self, agent_url: str):
+    """Tool that delegates a message to a remote A2A agent.
+
+    Construction never touches the network. The agent card is taken from the
+    card cache (including a persisted snapshot) when available, otherwise it is
+    fetched in the background on the running loop, or on first use. Use
+    `await A2ATool.create(url)` to get a tool whose card is already resolved.
+
+    Calls go through a circuit breaker shared per endpoint, which makes the tool
+    return an error immediately while the peer is degraded. With `hedge=True`,
+    a second request is sent when no reply arrived within the endpoint's
+    `hedge_percentile` latency, and the first reply wins. The peer runs both
+    requests (A2A servers do not deduplicate messages, and the slower remote
+    task is not cancelled), so hedging also requires `idempotent=True`:
+    only use it for agents whose calls have no side effects.
+    """
+
+    def __init__(
+        self,
+        agent_url: str,
+        *,
+        agent_card: AgentCard | None = None,
+        name: str | None = None,
+        description: str | None = None,
+        agent_card_path: str = '/.well-known/agent.json',
+        hedge: bool = False,
+        idempotent: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        circuit_breaker: bool = True,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        if hedge and not idempotent:
+            raise ValueError('hedge=True runs the remote agent twice; it requires idempotent=True')
         self._agent_endpoint = agent_url
-        self._agent_card = self._get_agent_card()
+        self._hedge = hedge
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_delay = hedge_min_delay
+        self._circuit_breaker = (
+            get_circuit_breaker(agent_url, failure_threshold=failure_threshold, recovery_timeout=recovery_timeout)
+            if circuit_breaker else None
+        )
+        self._latency = get_latency_tracker(agent_url)
+        self._call_stats = _call_stats.setdefault(agent_url, Counter())
+        self._agent_card_path = agent_card_path
+        self._explicit_name = name
+        self._explicit_description = description
+        self._agent_card = agent_card or agent_card_cache.get_cached(agent_url, agent_card_path)
+        self._resolve_task: asyncio.Task | None = None
         super().__init__(
-            name=self._agent_card.name,
-            description=self._agent_card.description,
-            is_long_running=self._agent_card.capabilities.pushNotifications,
+            name=name or _default_tool_name(agent_url),
+            description=description or f'Remote A2A agent at {agent_url}',
         )
+        if self._agent_card is not None:
+            self._apply_agent_card(self._agent_card)
+        else:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._resolve_task = loop.create_task(self.resolve())
+                self._resolve_task.add_done_callback(self._on_background_resolve_done)
+
+    @classmethod
+    async def create(cls, agent_url: str, **kwargs) -> 'A2ATool':
+        """Create the tool and wait until its agent card is resolved."""
+        tool = cls(agent_url, **kwargs)
+        await tool.resolve()
+        return tool
+
+    async def resolve(self, http_kwargs: dict[str, Any] | None = None) -> AgentCard:
+        """Return the agent card, fetching it through the card cache if needed."""
+        if self._agent_card is None:
+            agent_card = await agent_card_cache.get(
+                self._agent_endpoint, self._agent_card_path, http_kwargs=http_kwargs
+            )
+            self._apply_agent_card(agent_card)
+        return self._agent_card
+
+    def _apply_agent_card(self, agent_card: AgentCard):
+        self._agent_card = agent_card
+        self.name = self._explicit_name or agent_card.name
+        self.description = self._explicit_description or agent_card.description
+        self.is_long_running = bool(agent_card.capabilities.pushNotifications)
+
+    def _on_background_resolve_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            # 첫 호출 시 다시 조회합니다.
+            logger.warning('Resolving agent card for %s failed: %s', self._agent_endpoint, task.exception())
+
+    def stats(self) -> dict:
+        """Hedging, circuit breaker and latency statistics for this tool's endpoint (shared by its tools)."""
+        return {
+            'endpoint': self._agent_endpoint,
+            'calls': dict(self._call_stats),
+            'circuit': self._circuit_breaker.stats() if self._circuit_breaker else None,
+            'latency': self._latency.stats(),
+        }
 
     async def __call__(self, message: str, tool_context: ToolContext):
         """Send a message to the calendar agent."""
+        try:
+            await self.resolve()
+        except Exception as e:
+            return {'error': f'Remote agent at {self._agent_endpoint} is not reachable: {e}'}
         # We take an overly simplistic approach to the A2A state machine:
         # - All requests to the calendar agent use the current session ID as the context ID.
         # - If the last response from the calendar agent (in this session) produced a non-terminal
         #   task state, the request references that task.
-        request = SendMessageRequest(
+        request = self._new_request(
+            message,
+            context_id=tool_context._invocation_context.session.id,
+            task_id=tool_context.state.get('task_id'),
+        )
+        try:
+            with stage_timer(tool_context.agent_name, 'remote_a2a', self.name):
+                response = await self._send_agent_message(request)
+        except CircuitOpenError as e:
+            return {
+                'error': f'Remote agent {self.name} is temporarily unavailable (too many recent failures). '
+                         f'Retry in {e.retry_after:.0f}s.'
+            }
+        except asyncio.CancelledError:
+            # 이어서 진행 중이던 원격 작업이 있으면 함께 취소합니다.
+            if request.params.message.taskId:
+                await asyncio.shield(self._cancel_remote_task(request.params.message.taskId))
+            raise
+        logger.debug('[A2A Client] Received response: %s', response)
+        content, task = self._parse_response(response)
+        task_id = None
+        if task is not None:
+            # Ideally should be "is terminal state"
+            if task.status.state != TaskState.completed:
+                task_id = task.id
+            if task.status.state == TaskState.auth_required:
+                tool_context.state['task_suspended'] = True
+                tool_context.state['dependent_task'] = task.model_dump()
+        tool_context.state['task_id'] = task_id
+        # Just turn it all into a string.
+        return {'response': '\n'.join(content)}
+
+    def _new_request(self, message: str, context_id: str, task_id: str | None = None) -> SendMessageRequest:
+        return SendMessageRequest(
             params=MessageSendParams(
                 message=Message(
-                    contextId=tool_context._invocation_context.session.id,
-                    taskId=tool_context.state.get('task_id'),
+                    contextId=context_id,
+                    taskId=task_id,
                     messageId=str(uuid4()),
                     role=Role.user,
                     parts=[Part(TextPart(text=message))],
                 )
             )
         )
-        response = await self._send_agent_message(request)
-        logger.debug('[A2A Client] Received response: %s', response)
-        task_id = None
+
+    def _parse_response(self, response) -> tuple[list[str], Task | None]:
+        """Extract the text content and, if the agent answered with one, the task."""
         content = []
+        task = None
         if isinstance(response.root, SendMessageSuccessResponse):
             if isinstance(response.root.result, Task):
                 task = response.root.result
                 if task.artifacts:
                     for artifact in task.artifacts:
                         content.extend(get_text_parts(artifact.parts))
-                if not content:
+                if not content and task.status.message:
                     content.extend(get_text_parts(task.status.message.parts))
-                # Ideally should be "is terminal state"
-                if task.status.state != TaskState.completed:
-                    task_id = task.id
-                if task.status.state == TaskState.auth_required:
-                    tool_context.state['task_suspended'] = True
-                    tool_context.state['dependent_task'] = task.model_dump()
             else:
                 content.extend(get_text_parts(response.root.result.parts))
-        tool_context.state['task_id'] = task_id
-        # Just turn it all into a string.
-        return {'response': '\n'.join(content)}
+        return content, task
 
     async def _send_agent_message(self, request: SendMessageRequest):
-        async with httpx.AsyncClient() as client:
-            calendar_agent_client = A2AClient(
-                httpx_client=client, url=self._agent_endpoint
-            )
-            return await calendar_agent_client.send_message(request)
+        if self._circuit_breaker:
+            try:
+                self._circuit_breaker.before_call()
+            except CircuitOpenError:
+                self._count('circuit_rejected')
+                raise
+        self._count('requests')
+        try:
+            if self._hedge:
+                response = await self._send_hedged(request)
+            else:
+                response = await self._send_once(request)
+        except asyncio.CancelledError:
+            if self._circuit_breaker:
+                self._circuit_breaker.release()
+            raise
+        except Exception:
+            self._count('failures')
+            if self._circuit_breaker:
+                self._circuit_breaker.record_failure()
+            raise
+        if self._circuit_breaker:
+            if isinstance(response.root, SendMessageSuccessResponse):
+                self._circuit_breaker.record_success()
+            else:
+                self._circuit_breaker.record_failure()
+        return response
+
+    def _count(self, event: str):
+        self._call_stats[event] += 1
+        count_a2a_call(self._agent_endpoint, event)
+
+    async def _send_once(self, request: SendMessageRequest):
+        started = time.monotonic()
+        calendar_agent_client = A2AClient(
+            httpx_client=get_http_client(), url=self._agent_endpoint
+        )
+        response = await calendar_agent_client.send_message(request)
+        self._latency.record(time.monotonic() - started)
+        return response
+
+    async def _send_hedged(self, request: SendMessageRequest):
+        hedge_delay = self._latency.percentile(self._hedge_percentile)
+        if hedge_delay is None:
+            # 지연 시간 표본이 충분히 쌓일 때까지는 헤징하지 않습니다.
+            return await self._send_once(request)
+        primary = asyncio.create_task(self._send_once(request))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=max(hedge_delay, self._hedge_min_delay))
+            if done:
+                return primary.result()
+            # 원격 에이전트는 두 요청을 모두 실행하므로 idempotent=True인 에이전트에만 헤징합니다.
+            self._count('hedges_sent')
+            hedge = asyncio.create_task(self._send_once(request.model_copy(update={'id': str(uuid4())})))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count('hedges_won')
+                        return task.result()
+            # 두 요청 모두 실패한 경우 첫 요청의 예외를 전달합니다.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
         
     async def _auth_required_task(self,tool_context: ToolContext) -> dict | None:
         """Handle requests that return auth-required"""
@@ -117,41 +362,114 @@ class A2ATool(BaseTool):
         return {'response': '\n'.join(content)}
     
     async def _wait_for_dependent_task(self, dependent_task: Task):
-        async with httpx.AsyncClient() as client:
-            # Subscribe would be good. We'll poll instead.
-            a2a_client = A2AClient(
-                httpx_client=client, url=self._agent_endpoint
-            )
-            # We want to wait until the task is in a terminal state.
-            while not self._is_task_complete(dependent_task):
-                await asyncio.sleep(0.2)  # AUTH_TASK_POLLING_DELAY_SECONDS
-                response = await a2a_client.get_task(
-                    GetTaskRequest(params=TaskQueryParams(id=dependent_task.id))
-                )
-                if not isinstance(response.root, GetTaskSuccessResponse):
-                    logger.debug('Getting dependent task failed: %s', response)
-                    # In a real scenario, may want to feed this response back to
-                    # the agent loop to decide what to do. We'll just fail the
-                    # task.
-                    raise Exception('Getting dependent task failed')
-                dependent_task = response.root.result
-            return dependent_task
+        # We want to wait until the task is in a terminal state.
+        agent_card = await self.resolve()
+        started = time.monotonic()
+        polls = Counter()
+        try:
+            async with asyncio.timeout(AUTH_TASK_WAIT_TIMEOUT_SECONDS):
+                if agent_card.capabilities.streaming:
+                    subscribed_task = await self._subscribe_dependent_task(dependent_task)
+                    if subscribed_task is not None:
+                        dependent_task = subscribed_task
+                        wait_stats['subscriptions'] += 1
+                        count_a2a_task_wait('subscriptions')
+                dependent_task = await self._poll_dependent_task(dependent_task, polls)
+        except TimeoutError as e:
+            raise Exception(
+                f'Timed out after {AUTH_TASK_WAIT_TIMEOUT_SECONDS}s waiting for dependent task {dependent_task.id}'
+            ) from e
+        except asyncio.CancelledError:
+            await asyncio.shield(self._cancel_remote_task(dependent_task.id))
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            polls_avoided = max(0, int(elapsed / AUTH_TASK_POLLING_DELAY_SECONDS) - polls['polls'])
+            wait_stats['polls'] += polls['polls']
+            wait_stats['polls_avoided'] += polls_avoided
+            count_a2a_task_wait('polls', polls['polls'])
+            count_a2a_task_wait('polls_avoided', polls_avoided)
+        return dependent_task
 
-    def _is_task_complete(self, task: Task) -> bool:
-        return task.status.state == TaskState.completed
+    async def _subscribe_dependent_task(self, dependent_task: Task) -> Task | None:
+        """Follow the remote task over tasks/resubscribe until it reaches a terminal state.
 
-    def _get_agent_card(self, agent_card_path: str = '/.well-known/agent.json', http_kwargs: dict[str, Any] | None = None) -> AgentCard:
-        async def _get():
-            async with httpx.AsyncClient() as client:
-                agent_card = A2ACardResolver(
-                    client, base_url=self._agent_endpoint, agent_card_path=agent_card_path
-                )
-                return await agent_card.get_agent_card(http_kwargs=http_kwargs)
+        Returns None when the stream ends early or the peer rejects the subscription,
+        so that the caller can fall back to polling.
+        """
+        request = TaskResubscriptionRequest(
+            id=str(uuid4()), params=TaskIdParams(id=dependent_task.id)
+        )
         try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
-        if loop and loop.is_running():
-            return asyncio.run_coroutine_threadsafe(_get(), loop).result()
-        else:
-            return asyncio.run(_get())
+            async with aconnect_sse(
+                get_http_client(),
+                'POST',
+                self._agent_endpoint,
+                json=request.model_dump(mode='json', exclude_none=True),
+                timeout=None,
+            ) as event_source:
+                async for sse in event_source.aiter_sse():
+                    response = SendStreamingMessageResponse(**json.loads(sse.data))
+                    if not isinstance(response.root, SendStreamingMessageSuccessResponse):
+                        logger.debug('Subscribing to dependent task failed: %s', response)
+                        return None
+                    event = response.root.result
+                    if isinstance(event, Task):
+                        dependent_task = event
+                    elif isinstance(event, TaskStatusUpdateEvent):
+                        dependent_task = dependent_task.model_copy(update={'status': event.status})
+                    elif isinstance(event, TaskArtifactUpdateEvent):
+                        dependent_task = dependent_task.model_copy(
+                            update={'artifacts': [*(dependent_task.artifacts or []), event.artifact]}
+                        )
+                    if self._is_task_complete(dependent_task):
+                        return dependent_task
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug('Subscribing to dependent task failed, falling back to polling: %s', e)
+        return None
+
+    async def _poll_dependent_task(self, dependent_task: Task, polls: Counter) -> Task:
+        """Poll get_task with exponential backoff and jitter.
+
+        A task that already reached a terminal state over the stream is fetched
+        once more so that the artifacts produced before subscribing are included.
+        """
+        a2a_client = A2AClient(
+            httpx_client=get_http_client(), url=self._agent_endpoint
+        )
+        delay = AUTH_TASK_POLLING_DELAY_SECONDS
+        fetch_final = self._is_task_complete(dependent_task)
+        while fetch_final or not self._is_task_complete(dependent_task):
+            if not fetch_final:
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, AUTH_TASK_POLLING_MAX_DELAY_SECONDS)
+            response = await a2a_client.get_task(
+                GetTaskRequest(params=TaskQueryParams(id=dependent_task.id))
+            )
+            polls['polls'] += 1
+            if not isinstance(response.root, GetTaskSuccessResponse):
+                logger.debug('Getting dependent task failed: %s', response)
+                # In a real scenario, may want to feed this response back to
+                # the agent loop to decide what to do. We'll just fail the
+                # task.
+                raise Exception('Getting dependent task failed')
+            dependent_task = response.root.result
+            fetch_final = False
+        return dependent_task
+
+    async def _cancel_remote_task(self, task_id: str):
+        """Best-effort tasks/cancel for a remote task we no longer wait for."""
+        a2a_client = A2AClient(
+            httpx_client=get_http_client(), url=self._agent_endpoint
+        )
+        try:
+            async with asyncio.timeout(A2A_REMOTE_CANCEL_TIMEOUT):
+                await a2a_client.cancel_task(CancelTaskRequest(params=TaskIdParams(id=task_id)))
+            logger.debug('Cancelled remote task %s at %s', task_id, self._agent_endpoint)
+        except Exception as e:
+            logger.debug('Cancelling remote task %s failed: %s', task_id, e)
+
+    def _is_task_complete(self, task: Task) -> bool:
+        return task.status.state in TERMINAL_TASK_STATES
@@ -1,15 +1,21 @@
+import asyncio
 import logging
+import os
+import time
+import uuid
 from collections.abc import AsyncGenerator
-from typing import Any, AsyncIterable, Optional
+from typing import Optional
 from pydantic import ConfigDict
 
 from google.adk import Runner
 from google.adk.agents import RunConfig
+from google.adk.agents.run_config import StreamingMode
 from google.adk.artifacts import InMemoryArtifactService, BaseArtifactService
 from google.adk.events import Event
 from google.adk.memory import InMemoryMemoryService, BaseMemoryService
 from google.adk.sessions import InMemorySessionService, BaseSessionService, Session
 from google.adk.tools import ToolContext
+from google.adk.tools.load_artifacts_tool import load_artifacts_tool, LoadArtifactsTool
 from google.adk.tools.load_memory_tool import load_memory_tool, LoadMemoryTool
 from google.adk.tools.preload_memory_tool import preload_memory_tool, PreloadMemoryTool
 from google.genai import types
@@ -18,10 +24,10 @@ from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
-    Artifact,
+    FilePart,
+    Part,
     TaskState,
-    TaskStatus,
-    UnsupportedOperationError,
+    TaskNotCancelableError,
 )
 from a2a.utils.errors import ServerError
 
@@ -30,11 +36,20 @@ from a2adk.utils import (
     convert_genai_parts_to_a2a,
 )
 from a2adk.agents import get_agent
+from a2adk.artifacts import convert_a2a_parts_to_genai_spilling, spill_large_inline_parts
+from a2adk.mailbox import A2A_CONTEXT_MAILBOX, ContextMailbox
+from a2adk.memory import CachingMemoryService, MemoryIngestionQueue, memory_session
+from a2adk.memory.cache import MEMORY_PREFETCH
+from a2adk.metrics import count_turn, instrument_agent, observe_stage, stage_timer
+from a2adk.response_cache import RESPONSE_CACHE, ResponseCache, response_cache_key
+from a2adk.streaming import ArtifactStreamCoalescer
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
 AUTH_TASK_POLLING_DELAY_SECONDS = 0.2
+# sse로 설정하면 모델의 부분 응답(토큰)을 아티팩트 청크로 스트리밍합니다.
+ADK_STREAMING_MODE = StreamingMode.SSE if (os.getenv("ADK_STREAMING_MODE") or '').lower() == 'sse' else StreamingMode.NONE
 
 class A2ARunConfig(RunConfig):
     """Custom override of ADK RunConfig to smuggle extra data through the event loop"""
@@ -45,6 +60,18 @@ class A2ARunConfig(RunConfig):
     current_task_updater: TaskUpdater
 
 
+class _QueuedMessage:
+    """A converted request message waiting in the context mailbox."""
+
+    def __init__(self, content: types.Content, session_id: str, task_updater: TaskUpdater, use_response_cache: bool):
+        self.content = content
+        self.session_id = session_id
+        self.task_updater = task_updater
+        self.use_response_cache = use_response_cache
+        # 다른 요청의 턴에 합쳐져 처리되었는지 여부입니다.
+        self.merged = False
+
+
 class ADKAgentExecutor(AgentExecutor):
     """An AgentExecutor that runs an ADK-based Agent."""
 
@@ -54,6 +81,7 @@ class ADKAgentExecutor(AgentExecutor):
                  artifact_service: BaseArtifactService,
                  session_service: BaseSessionService,
                  memory_service: BaseMemoryService,
+                 response_cache: Optional[ResponseCache] = None,
     ):
         self._agent = get_agent(agent_name)
 
@@ -67,7 +95,10 @@ class ADKAgentExecutor(AgentExecutor):
                     self._agent.tools.append(load_memory_tool)
                 if not any(isinstance(tool, PreloadMemoryTool) for tool in self._agent.tools):
                     self._agent.tools.append(preload_memory_tool)
-            
+        if self._use_artifacts and not any(isinstance(tool, LoadArtifactsTool) for tool in self._agent.tools):
+            # 큰 업로드 파일은 아티팩트로 저장되므로 에이전트가 읽을 수 있도록 도구를 추가합니다.
+            self._agent.tools.append(load_artifacts_tool)
+
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
@@ -75,6 +106,25 @@ class ADKAgentExecutor(AgentExecutor):
             session_service=session_service if session_service else InMemorySessionService(),
             memory_service=memory_service if memory_service else InMemoryMemoryService(),
         )
+        self._running_tasks: dict[str, asyncio.Task] = {}
+        # 같은 대화의 메시지가 세션을 동시에 읽고 쓰지 않도록 차례로 실행합니다.
+        self._mailbox = ContextMailbox(self._agent.name) if A2A_CONTEXT_MAILBOX else None
+        # 메모리 저장은 응답 경로 밖에서 모아서 처리합니다.
+        self._memory_ingestion = (
+            MemoryIngestionQueue(self._runner.memory_service, self._runner.session_service)
+            if self._use_memory else None
+        )
+        # preload_memory_tool이 검색할 질의를 세션을 불러오는 동안 미리 검색합니다.
+        self._memory_prefetch = (
+            self._use_memory and MEMORY_PREFETCH and isinstance(self._runner.memory_service, CachingMemoryService)
+        )
+        # 여러 에이전트를 한 프로세스에서 실행할 때는 공유 캐시를 받아 쓰고, 닫지 않습니다.
+        self._owns_response_cache = response_cache is None
+        if response_cache is None and RESPONSE_CACHE:
+            response_cache = ResponseCache()
+        self._response_cache = response_cache
+        # 모델/도구 호출 시간을 /metrics에 기록합니다(prometheus_client가 설치된 경우).
+        instrument_agent(self._agent)
 
     def _run_agent(
         self,
@@ -86,7 +136,12 @@ class ADKAgentExecutor(AgentExecutor):
             session_id=session_id,
             user_id='self',
             new_message=new_message,
-            run_config=A2ARunConfig(current_task_updater=task_updater, save_input_blobs_as_artifacts=self._use_artifacts),
+            run_config=A2ARunConfig(
+                current_task_updater=task_updater,
+                # 큰 파일만 _convert_request_parts에서 아티팩트로 저장하고, 작은 파일은 그대로 모델에 전달합니다.
+                save_input_blobs_as_artifacts=False,
+                streaming_mode=ADK_STREAMING_MODE,
+            ),
         )
 
     def _get_task_updater(self, tool_context: ToolContext):
@@ -114,62 +169,152 @@ class ADKAgentExecutor(AgentExecutor):
         new_message: types.Content,
         session_id: str,
         task_updater: TaskUpdater,
-    ) -> AsyncIterable[TaskStatus | Artifact]:
-        session_obj = await self._upsert_session(
-            session_id,
-        )
+        *,
+        use_response_cache: bool = True,
+    ) -> Optional[list[Part]]:
+        """Run one turn and return the final response parts (None if there was none)."""
+        if self._memory_prefetch and new_message.parts and new_message.parts[0].text:
+            self._runner.memory_service.prefetch(self._runner.app_name, 'self', session_id, new_message.parts[0].text)
+        with stage_timer(self._agent.name, 'upsert_session'):
+            session_obj = await self._upsert_session(
+                session_id,
+            )
         session_id = session_obj.id
+        cache_key = None
+        if self._response_cache is not None and use_response_cache:
+            cache_key = response_cache_key(
+                self._agent.name, new_message, session_obj.state, self._response_cache.state_keys
+            )
+            cached = await self._response_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return await self._replay_cached_response(session_obj, new_message, cached, task_updater)
+        # 상태나 아티팩트를 바꾼 턴은 캐시 적중 시 재현할 수 없으므로 저장하지 않습니다.
+        cacheable = cache_key is not None
+        stream = ArtifactStreamCoalescer(task_updater)
         try:
-            async for event in self._run_agent(session_id, new_message, task_updater):
-                if event.is_final_response():
-                    if self._use_memory:
-                        await self._save_as_memory(self._runner.memory_service, session_obj)
-                    response = convert_genai_parts_to_a2a(event.content.parts)
-                    task_updater.add_artifact(response)
-                    task_updater.complete()
-                    break
-                if not event.get_function_calls():
-                    logger.debug('Yielding update response')
-                    task_updater.update_status(
-                        TaskState.working,
-                        message=task_updater.new_agent_message(
-                            convert_genai_parts_to_a2a(event.content.parts)
-                        ),
-                    )
-                else:
-                    logger.debug('Skipping event')
+            with memory_session(session_id):
+                async for event in self._run_agent(session_id, new_message, task_updater):
+                    if event.actions.state_delta or event.actions.artifact_delta:
+                        cacheable = False
+                    if event.partial:
+                        # 부분 응답은 상태 업데이트 대신 묶어서 아티팩트 청크로 보냅니다.
+                        if event.content and event.content.parts:
+                            stream.add(''.join(
+                                part.text for part in event.content.parts if part.text and not part.thought
+                            ))
+                        continue
+                    if event.is_final_response():
+                        with stage_timer(self._agent.name, 'emit'):
+                            response = await self._convert_response_parts(event.content.parts, session_id)
+                            if stream.chunks_sent:
+                                stream.finish(response)
+                            else:
+                                task_updater.add_artifact(response, artifact_id=stream.artifact_id)
+                            task_updater.complete()
+                        count_turn(self._agent.name, 'completed')
+                        if self._memory_ingestion is not None:
+                            await self._memory_ingestion.submit(self._runner.app_name, 'self', session_id)
+                        if cacheable:
+                            await self._response_cache.put(cache_key, event.content)
+                        return response
+                    if not event.get_function_calls():
+                        logger.debug('Yielding update response')
+                        task_updater.update_status(
+                            TaskState.working,
+                            message=task_updater.new_agent_message(
+                                convert_genai_parts_to_a2a(event.content.parts)
+                            ),
+                        )
+                    else:
+                        logger.debug('Skipping event')
+        except asyncio.CancelledError:
+            stream.discard()
+            raise
         except Exception as e:
             logger.error(f"Exception during agent event processing for session {session_id}: {e}", exc_info=True)
             # In a real scenario, you might want to call task_updater.fail() here
             raise # Re-raise the exception to be handled by higher-level handlers
+        return None
 
-    async def _save_as_memory(self, memory_service: BaseMemoryService, current_session: Session):
-        if memory_service and current_session:
-            # Check if the session history has any actual content
-            has_content = False
-            if current_session.events:
-                for event in current_session.events:
-                    if event.content and event.content.parts:
-                        for part in event.content.parts:
-                            # Check if the part has actual data (e.g., non-empty text or inline_data)
-                            if hasattr(part, 'text') and part.text and part.text.strip():
-                                has_content = True
-                                break
-                            elif hasattr(part, 'inline_data') and part.inline_data and part.inline_data.data:
-                                has_content = True
-                                break
-                    if has_content:
-                        break
-            
-            if not has_content:
-                logger.debug(
-                    f"Session {current_session.id} has no content to save to memory. Skipping."
-                )
-                return
-
-            await memory_service.add_session_to_memory(current_session)
+    async def _process_messages(self, messages: list[_QueuedMessage]) -> Optional[list[Part]]:
+        """Run one turn for messages of the same context, answering on the first one's task."""
+        first = messages[0]
+        for message in messages:
+            message.merged = message is not first
+        if len(messages) == 1:
+            new_message = first.content
         else:
-            logger.debug("Cannot save to memory, memory_service or current_session is None")
+            # 대기 중에 쌓인 메시지들을 하나의 사용자 턴으로 합칩니다.
+            new_message = types.UserContent(
+                parts=[part for message in messages for part in message.content.parts or []]
+            )
+        return await self._process_request(
+            new_message,
+            first.session_id,
+            first.task_updater,
+            use_response_cache=all(message.use_response_cache for message in messages),
+        )
+
+    async def _convert_request_parts(self, parts: list[Part], session_id: str) -> list[types.Part]:
+        if not self._use_artifacts:
+            return convert_a2a_parts_to_genai(parts)
+        return await convert_a2a_parts_to_genai_spilling(
+            parts,
+            artifact_service=self._runner.artifact_service,
+            app_name=self._runner.app_name,
+            user_id='self',
+            session_id=session_id,
+        )
+
+    async def _convert_response_parts(self, parts: list[types.Part], session_id: str) -> list[Part]:
+        if self._use_artifacts:
+            parts = await spill_large_inline_parts(
+                parts,
+                artifact_service=self._runner.artifact_service,
+                app_name=self._runner.app_name,
+                user_id='self',
+                session_id=session_id,
+            )
+        return convert_genai_parts_to_a2a(parts)
+
+    async def _replay_cached_response(
+        self,
+        session: Session,
+        new_message: types.Content,
+        response: types.Content,
+        task_updater: TaskUpdater,
+    ):
+        """Answer from the response cache as if the agent had run.
+
+        The user message and the cached response are appended to the session
+        so the conversation history (and memory) matches an uncached turn.
+        """
+        invocation_id = f'e-{uuid.uuid4()}'
+        response_parts = await self._convert_response_parts(response.parts, session.id)
+        await self._runner.session_service.append_event(
+            session, Event(invocation_id=invocation_id, author='user', content=new_message)
+        )
+        await self._runner.session_service.append_event(
+            session, Event(invocation_id=invocation_id, author=self._agent.name, content=response)
+        )
+        task_updater.add_artifact(response_parts, artifact_id=str(uuid.uuid4()))
+        task_updater.complete()
+        count_turn(self._agent.name, 'cached')
+        if self._memory_ingestion is not None:
+            await self._memory_ingestion.submit(self._runner.app_name, 'self', session.id)
+        return response_parts
+
+    def response_cache_stats(self) -> Optional[dict]:
+        """Hit/miss counters of the response cache, or None if it is disabled."""
+        return self._response_cache.stats() if self._response_cache is not None else None
+
+    def memory_ingestion_stats(self) -> Optional[dict]:
+        """Counters of the background memory ingestion, or None if memory is disabled."""
+        return self._memory_ingestion.stats() if self._memory_ingestion is not None else None
+
+    def mailbox_stats(self) -> Optional[dict]:
+        """Per-context queue depths of the mailbox, or None if it is disabled."""
+        return self._mailbox.stats() if self._mailbox is not None else None
 
     async def execute(
         self,
@@ -182,15 +327,74 @@ class ADKAgentExecutor(AgentExecutor):
         if not context.current_task:
             updater.submit()
         updater.start_work()
-        await self._process_request(
-            types.UserContent(
-                parts=convert_a2a_parts_to_genai(context.message.parts),
-            ),
-            context.context_id,
-            updater,
-        )
+        # 취소 요청 시 실행 중인 에이전트를 중단할 수 있도록 작업별로 기록합니다.
+        self._running_tasks[context.task_id] = asyncio.current_task()
+        started = time.perf_counter()
+        try:
+            message = _QueuedMessage(
+                types.UserContent(
+                    parts=await self._convert_request_parts(context.message.parts, context.context_id),
+                ),
+                context.context_id,
+                updater,
+                # 파일이 포함된 요청은 아티팩트 참조로 바뀌므로 응답 캐시를 쓰지 않습니다.
+                use_response_cache=not any(isinstance(part.root, FilePart) for part in context.message.parts),
+            )
+            if self._mailbox is None:
+                await self._process_messages([message])
+            else:
+                response = await self._mailbox.run(context.context_id, message, self._process_messages)
+                if message.merged:
+                    # 앞선 요청의 턴에 함께 답했으므로 같은 응답으로 이 작업도 끝냅니다.
+                    if response is not None:
+                        updater.add_artifact(response, artifact_id=str(uuid.uuid4()))
+                    updater.complete()
+                    count_turn(self._agent.name, 'merged')
+        except asyncio.CancelledError:
+            # 모델/도구 호출은 이미 중단되었습니다. 작업을 canceled로 끝내고
+            # 큐가 정상적으로 닫히도록 취소 상태를 해제합니다.
+            asyncio.current_task().uncancel()
+            updater.update_status(TaskState.canceled, final=True)
+            count_turn(self._agent.name, 'canceled')
+            logger.info(f"Task {context.task_id} was cancelled")
+        except Exception:
+            count_turn(self._agent.name, 'failed')
+            raise
+        finally:
+            observe_stage(self._agent.name, 'turn', time.perf_counter() - started)
+            self._running_tasks.pop(context.task_id, None)
+
+    async def close(self):
+        """Flush pending memory ingestion; called on server shutdown."""
+        if self._memory_ingestion is not None:
+            await self._memory_ingestion.close()
+        if self._response_cache is not None and self._owns_response_cache:
+            await self._response_cache.close()
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
-        # Ideally: kill any ongoing tasks.
-        raise ServerError(error=UnsupportedOperationError())
+        task = context.current_task
+        if task is not None and task.status.state in (
+            TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected
+        ):
+            raise ServerError(error=TaskNotCancelableError())
+        running = self._running_tasks.get(context.task_id)
+        if running is not None:
+            # execute()가 CancelledError를 받아 canceled 상태를 보냅니다.
+            # DefaultRequestHandler.on_cancel_task는 이 메서드가 끝나자마자 같은 작업을 취소하므로,
+            # 두 번 취소되지 않도록 그 뒤에 아직 아무도 취소하지 않았을 때만 취소합니다.
+            asyncio.get_running_loop().call_soon(self._cancel_running, running)
+        elif task is not None and task.status.state in (TaskState.input_required, TaskState.auth_required):
+            # 입력/인증을 기다리는 작업은 어디에서도 실행 중이 아니므로 상태만 변경합니다.
+            TaskUpdater(event_queue, context.task_id, context.context_id).update_status(
+                TaskState.canceled, final=True
+            )
+        else:
+            # 다른 워커에서 실행 중인 작업은 이 워커에서 멈출 수 없으므로 취소되었다고 알리지 않습니다.
+            raise ServerError(
+                error=TaskNotCancelableError(message='Task is running on another worker and cannot be canceled here')
+            )
 
+    @staticmethod
+    def _cancel_running(running: asyncio.Task):
+        if not running.done() and not running.cancelling():
+            running.cancel()
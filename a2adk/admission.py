@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Hashable, Optional
+
+from a2adk.metrics import count_admission_rejected, observe_stage, set_admission
+
+logger = logging.getLogger(__name__)
+
+# 워커 하나에서 동시에 실행하는 에이전트 작업 수입니다. 0이면 제한하지 않습니다.
+A2A_MAX_CONCURRENT_RUNS = int(os.getenv("A2A_MAX_CONCURRENT_RUNS") or 32)
+# 사용자(인증된 경우) 또는 대화(contextId)별 동시 실행 수입니다. 0이면 제한하지 않습니다.
+A2A_MAX_RUNS_PER_KEY = int(os.getenv("A2A_MAX_RUNS_PER_KEY") or 0)
+# 실행을 기다릴 수 있는 요청 수와 최대 대기 시간(초)입니다. 넘으면 바로 거절합니다.
+A2A_ADMISSION_QUEUE_SIZE = int(os.getenv("A2A_ADMISSION_QUEUE_SIZE") or 100)
+A2A_ADMISSION_TIMEOUT = float(os.getenv("A2A_ADMISSION_TIMEOUT") or 30.0)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a run cannot be admitted; `retry_after` is a hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Global and per-key concurrency limits with a bounded FIFO wait queue.
+
+    `admit(key, agent)` waits for a free slot and holds it for the body of
+    the `async with`; the wait is observed under `agent`. Requests are rejected with `AdmissionRejected` when the
+    queue is full or the wait exceeds `timeout`. Waiters whose key is at its
+    limit do not block waiters with other keys.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = A2A_MAX_CONCURRENT_RUNS,
+        max_per_key: int = A2A_MAX_RUNS_PER_KEY,
+        max_waiting: int = A2A_ADMISSION_QUEUE_SIZE,
+        timeout: float = A2A_ADMISSION_TIMEOUT,
+    ):
+        self._max_concurrent = max_concurrent
+        self._max_per_key = max_per_key
+        self._max_waiting = max_waiting
+        self._timeout = timeout
+        self._running = 0
+        self._running_per_key: Counter = Counter()
+        self._waiters: deque[tuple[Optional[Hashable], asyncio.Future]] = deque()
+        self._stats: Counter = Counter()
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @asynccontextmanager
+    async def admit(self, key: Optional[Hashable] = None, agent: str = ''):
+        await self._acquire(key, agent)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._run_seconds += time.monotonic() - started
+            self._release(key)
+
+    def stats(self) -> dict:
+        admitted = self._stats['admitted']
+        return {
+            'running': self._running,
+            'waiting': len(self._waiters),
+            'avg_wait_seconds': round(self._wait_seconds / admitted, 3) if admitted else None,
+            'max_wait_seconds': round(self._max_wait_seconds, 3),
+            **self._stats,
+        }
+
+    def _can_run(self, key: Optional[Hashable]) -> bool:
+        if self._max_concurrent > 0 and self._running >= self._max_concurrent:
+            return False
+        if key is not None and self._max_per_key > 0 and self._running_per_key[key] >= self._max_per_key:
+            return False
+        return True
+
+    def _start(self, key: Optional[Hashable]):
+        self._running += 1
+        if key is not None:
+            self._running_per_key[key] += 1
+        self._stats['admitted'] += 1
+        set_admission(self._running, len(self._waiters))
+
+    def _release(self, key: Optional[Hashable]):
+        self._running -= 1
+        if key is not None:
+            self._running_per_key[key] -= 1
+            if self._running_per_key[key] <= 0:
+                del self._running_per_key[key]
+        self._wake()
+        set_admission(self._running, len(self._waiters))
+
+    def _wake(self):
+        for waiter in list(self._waiters):
+            key, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+            elif self._can_run(key):
+                self._waiters.remove(waiter)
+                self._start(key)
+                future.set_result(None)
+            elif self._max_concurrent > 0 and self._running >= self._max_concurrent:
+                break
+
+    def _retry_after(self) -> int:
+        # 평균 실행 시간과 대기열 길이로 다시 시도할 시점을 어림합니다.
+        finished = self._stats['admitted'] - self._running
+        average = self._run_seconds / finished if finished > 0 else 1.0
+        slots = self._max_concurrent if self._max_concurrent > 0 else max(self._running, 1)
+        return max(1, math.ceil(average * (len(self._waiters) + 1) / slots))
+
+    async def _acquire(self, key: Optional[Hashable], agent: str):
+        if self._can_run(key) and not any(waiting_key == key for waiting_key, _ in self._waiters):
+            self._start(key)
+            return
+        if len(self._waiters) >= self._max_waiting:
+            self._stats['rejected_queue_full'] += 1
+            count_admission_rejected('queue_full')
+            raise AdmissionRejected('Too many requests are waiting', self._retry_after())
+        future = asyncio.get_running_loop().create_future()
+        waiter = (key, future)
+        self._waiters.append(waiter)
+        self._stats['queued'] += 1
+        set_admission(self._running, len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self._timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # 자리를 받은 직후에 취소되거나 시간이 끝났으면 자리를 돌려줍니다.
+                self._release(key)
+            else:
+                future.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                set_admission(self._running, len(self._waiters))
+            if isinstance(e, TimeoutError):
+                self._stats['rejected_timeout'] += 1
+                count_admission_rejected('timeout')
+                raise AdmissionRejected('Timed out waiting for a free slot', self._retry_after()) from None
+            raise
+        waited = time.monotonic() - started
+        self._wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        observe_stage(agent, 'admission_wait', waited)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import weakref
+from typing import Any
+
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+
+from a2adk.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# 조회한 AgentCard를 재사용할 시간(초)입니다.
+A2A_AGENT_CARD_TTL = float(os.getenv("A2A_AGENT_CARD_TTL") or 300.0)
+# AgentCard 스냅샷 파일 경로입니다. 설정하면 워커가 네트워크 조회 없이 시작할 수 있습니다.
+A2A_AGENT_CARD_SNAPSHOT = os.getenv("A2A_AGENT_CARD_SNAPSHOT")
+
+
+class AgentCardCache:
+    """TTL cache of resolved AgentCards, keyed by agent URL and card path.
+
+    When a snapshot path is configured, fetched cards are persisted to it and
+    loaded back on first access, so a fresh worker can resolve its tools
+    without a network round trip.
+    """
+
+    def __init__(self, ttl: float = A2A_AGENT_CARD_TTL, snapshot_path: str | None = A2A_AGENT_CARD_SNAPSHOT):
+        self._ttl = ttl
+        self._snapshot_path = snapshot_path
+        self._snapshot_loaded = False
+        self._cards: dict[tuple[str, str], tuple[float, AgentCard]] = {}
+        # asyncio.Lock은 이벤트 루프에 묶이므로 루프별로 관리합니다.
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+    def get_cached(self, agent_url: str, agent_card_path: str = '/.well-known/agent.json') -> AgentCard | None:
+        self._load_snapshot()
+        entry = self._cards.get((agent_url, agent_card_path))
+        if entry is None:
+            return None
+        expires_at, card = entry
+        if expires_at < time.monotonic():
+            return None
+        return card
+
+    def put(self, agent_url: str, card: AgentCard, agent_card_path: str = '/.well-known/agent.json'):
+        self._cards[(agent_url, agent_card_path)] = (time.monotonic() + self._ttl, card)
+
+    def invalidate(self, agent_url: str, agent_card_path: str = '/.well-known/agent.json'):
+        self._cards.pop((agent_url, agent_card_path), None)
+
+    async def get(
+        self,
+        agent_url: str,
+        agent_card_path: str = '/.well-known/agent.json',
+        http_kwargs: dict[str, Any] | None = None,
+    ) -> AgentCard:
+        card = self.get_cached(agent_url, agent_card_path)
+        if card is not None:
+            return card
+        key = (agent_url, agent_card_path)
+        loop_locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = loop_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 다른 코루틴이 먼저 조회했을 수 있으므로 다시 확인합니다.
+            card = self.get_cached(agent_url, agent_card_path)
+            if card is not None:
+                return card
+            resolver = A2ACardResolver(
+                get_http_client(), base_url=agent_url, agent_card_path=agent_card_path
+            )
+            card = await resolver.get_agent_card(http_kwargs=http_kwargs)
+            self.put(agent_url, card, agent_card_path)
+            logger.debug('Cached agent card for %s', agent_url)
+            if self._snapshot_path:
+                await asyncio.to_thread(self._save_snapshot)
+            return card
+
+    def _load_snapshot(self):
+        if self._snapshot_loaded or not self._snapshot_path:
+            return
+        self._snapshot_loaded = True
+        try:
+            with open(self._snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Failed to load agent card snapshot {self._snapshot_path}: {e}")
+            return
+        expires_at = time.monotonic() + self._ttl
+        for entry in snapshot.get('cards', []):
+            key = (entry['agent_url'], entry['agent_card_path'])
+            if key not in self._cards:
+                self._cards[key] = (expires_at, AgentCard.model_validate(entry['card']))
+        logger.debug('Loaded %d agent cards from %s', len(snapshot.get('cards', [])), self._snapshot_path)
+
+    def _save_snapshot(self):
+        snapshot = {
+            'cards': [
+                {
+                    'agent_url': agent_url,
+                    'agent_card_path': agent_card_path,
+                    'card': card.model_dump(mode='json', exclude_none=True),
+                }
+                for (agent_url, agent_card_path), (_, card) in self._cards.items()
+            ]
+        }
+        directory = os.path.dirname(os.path.abspath(self._snapshot_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # 여러 워커가 동시에 쓰더라도 파일이 깨지지 않도록 임시 파일을 교체합니다.
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._snapshot_path)
+        except Exception as e:
+            logger.warning(f"Failed to save agent card snapshot {self._snapshot_path}: {e}")
+
+
+agent_card_cache = AgentCardCache()
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Optional
+
+from starlette.routing import Mount
+
+from google.adk.artifacts import BaseArtifactService
+from google.adk.memory import BaseMemoryService
+from google.adk.sessions import BaseSessionService
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import QueueManager
+from a2a.server.tasks import TaskStore
+
+from a2adk.adk_agent_executor import ADKAgentExecutor
+from a2adk.admission import AdmissionController
+from a2adk.agents import AGENT_REGISTRY, get_agent, get_agent_card_factory
+from a2adk.agents.card import get_default_agent_card
+from a2adk.metrics import observe_stage
+from a2adk.request_handler import ADKRequestHandler
+from a2adk.response_cache import RESPONSE_CACHE, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# 마지막 요청 후 이 시간(초)이 지난 에이전트는 내립니다. 0이면 내리지 않습니다.
+A2A_AGENT_IDLE_TTL = float(os.getenv("A2A_AGENT_IDLE_TTL") or 600)
+# 한 번에 올려 둘 에이전트 수입니다. 넘으면 가장 오래 쓰지 않은 유휴 에이전트를 내립니다. 0이면 제한하지 않습니다.
+A2A_MAX_LOADED_AGENTS = int(os.getenv("A2A_MAX_LOADED_AGENTS") or 0)
+
+AGENT_MOUNT_PREFIX = '/agents'
+
+
+class _AgentRuntime:
+    """The executor and A2A app of one loaded agent."""
+
+    def __init__(self, name: str, executor: ADKAgentExecutor, app):
+        self.name = name
+        self.executor = executor
+        self.app = app
+        self.active = 0
+        self.requests = 0
+        self.last_used = time.monotonic()
+
+    def is_idle(self) -> bool:
+        # 비차단(blocking=false) 요청은 응답 후에도 실행 중일 수 있으므로 실행 중인 작업도 확인합니다.
+        return self.active == 0 and not self.executor._running_tasks
+
+
+class _AgentMountApp:
+    """ASGI app of one mount; loads the agent on its first request."""
+
+    def __init__(self, host: 'AgentHost', name: str):
+        self._host = host
+        self._name = name
+
+    async def __call__(self, scope, receive, send):
+        runtime = await self._host.acquire(self._name)
+        try:
+            await runtime.app(scope, receive, send)
+        finally:
+            self._host.release(runtime)
+
+
+class AgentHost:
+    """Serves many registered agents from one process.
+
+    Each agent is mounted at `/agents/{name}` with its own agent card and
+    request handler. The executor and A2A app of an agent are created on its
+    first request. Session, artifact and memory services, the task store,
+    admission control and the response cache are shared by all agents.
+    Runtimes that have been idle for `idle_ttl` seconds, or that exceed
+    `max_loaded`, are dropped; the agent definition itself stays imported.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        artifact_service: Optional[BaseArtifactService],
+        session_service: BaseSessionService,
+        memory_service: Optional[BaseMemoryService],
+        task_store: TaskStore,
+        queue_manager: QueueManager,
+        admission: Optional[AdmissionController] = None,
+        idle_ttl: float = A2A_AGENT_IDLE_TTL,
+        max_loaded: int = A2A_MAX_LOADED_AGENTS,
+    ):
+        self._host = host
+        self._port = port
+        self._artifact_service = artifact_service
+        self._session_service = session_service
+        self._memory_service = memory_service
+        self._task_store = task_store
+        self._queue_manager = queue_manager
+        self.admission = admission if admission is not None else AdmissionController()
+        self._idle_ttl = idle_ttl
+        self._max_loaded = max_loaded
+        self._response_cache = ResponseCache() if RESPONSE_CACHE else None
+        self._mounted: list[str] = []
+        # 이름 -> 런타임. 최근에 쓴 순서로 정렬됩니다.
+        self._runtimes: OrderedDict[str, _AgentRuntime] = OrderedDict()
+        self._loading: dict[str, asyncio.Lock] = {}
+        self._stats: Counter = Counter()
+
+    def path(self, name: str) -> str:
+        return f'{AGENT_MOUNT_PREFIX}/{name}'
+
+    def mount(self, name: str) -> Mount:
+        """Route serving `name`. The agent must be registered but is not imported yet."""
+        if name not in AGENT_REGISTRY:
+            raise ValueError(f'Unknown agent: {name}')
+        self._mounted.append(name)
+        return Mount(self.path(name), app=_AgentMountApp(self, name), name=f'agent_{name}')
+
+    async def acquire(self, name: str) -> _AgentRuntime:
+        runtime = self._runtimes.get(name)
+        if runtime is None:
+            lock = self._loading.setdefault(name, asyncio.Lock())
+            async with lock:
+                runtime = self._runtimes.get(name)
+                if runtime is None:
+                    runtime = self._load(name)
+                    self._runtimes[name] = runtime
+        self._runtimes.move_to_end(name)
+        runtime.active += 1
+        runtime.requests += 1
+        await self._evict_unused()
+        return runtime
+
+    def release(self, runtime: _AgentRuntime):
+        runtime.active -= 1
+        runtime.last_used = time.monotonic()
+
+    def _load(self, name: str) -> _AgentRuntime:
+        started = time.perf_counter()
+        executor = ADKAgentExecutor(
+            agent_name=name,
+            artifact_service=self._artifact_service,
+            session_service=self._session_service,
+            memory_service=self._memory_service,
+            response_cache=self._response_cache,
+        )
+        path = self.path(name)
+        card_factory = get_agent_card_factory(name)
+        if card_factory is not None:
+            agent_card = card_factory(self._host, self._port, path)
+        else:
+            agent_card = get_default_agent_card(get_agent(name), self._host, self._port, path)
+        request_handler = ADKRequestHandler(
+            agent_executor=executor,
+            task_store=self._task_store,
+            queue_manager=self._queue_manager,
+            admission=self.admission,
+            agent_name=name,
+        )
+        app = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).build()
+        seconds = time.perf_counter() - started
+        observe_stage(name, 'agent_load', seconds)
+        self._stats['loads'] += 1
+        logger.info(f"Loaded agent {name} in {seconds:.3f}s")
+        return _AgentRuntime(name, executor, app)
+
+    async def _evict_unused(self):
+        now = time.monotonic()
+        for runtime in list(self._runtimes.values()):
+            if self._idle_ttl > 0 and runtime.is_idle() and now - runtime.last_used > self._idle_ttl:
+                await self.evict(runtime.name)
+        if self._max_loaded > 0:
+            # 가장 오래 쓰지 않은 유휴 에이전트부터 내립니다.
+            for runtime in list(self._runtimes.values()):
+                if len(self._runtimes) <= self._max_loaded:
+                    break
+                if runtime.is_idle():
+                    await self.evict(runtime.name)
+
+    async def evict(self, name: str):
+        """Drop the runtime of `name`; the next request loads it again."""
+        runtime = self._runtimes.pop(name, None)
+        if runtime is None:
+            return
+        self._stats['evictions'] += 1
+        logger.info(f"Evicting idle agent {name}")
+        try:
+            await runtime.executor.close()
+        except Exception as e:
+            logger.error(f"Failed to close agent {name}: {e}", exc_info=True)
+
+    def response_cache_stats(self) -> Optional[dict]:
+        return self._response_cache.stats() if self._response_cache is not None else None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            'mounted': list(self._mounted),
+            'loaded': {
+                name: {
+                    'active': runtime.active,
+                    'running_tasks': len(runtime.executor._running_tasks),
+                    'requests': runtime.requests,
+                    'idle_seconds': round(now - runtime.last_used, 1),
+                    'mailbox': runtime.executor.mailbox_stats(),
+                    'memory_ingestion': runtime.executor.memory_ingestion_stats(),
+                }
+                for name, runtime in self._runtimes.items()
+            },
+            **self._stats,
+        }
+
+    async def close(self):
+        """Close every loaded agent and the shared response cache; called on server shutdown."""
+        for name in list(self._runtimes):
+            await self.evict(name)
+        if self._response_cache is not None:
+            await self._response_cache.close()
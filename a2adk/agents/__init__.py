@@ -1,7 +1,81 @@
-from . import agent
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
 
-def get_agent(name):
-    if name == 'root_agent':
-        return agent.root_agent
-    else:
-        raise ValueError(f'Unknown agent: {name}')
\ No newline at end of file
+from google.adk.agents import BaseAgent
+
+from .tool_cache import apply_tool_cache
+
+
+@dataclass
+class AgentSpec:
+    """Where to find an agent and, optionally, its agent card factory.
+
+    `target` is a `"module:attribute"` string or a callable returning the
+    agent; string targets are imported on the first `get_agent` call.
+    `card` is a `"module:function"` string or a callable with the
+    signature of `a2adk.agents.card.get_agent_card` (`host, port, path`).
+    """
+
+    target: Union[str, Callable[[], BaseAgent]]
+    card: Union[str, Callable, None] = None
+
+
+# 에이전트 이름 -> 위치. 모듈은 해당 에이전트가 처음 요청될 때 import합니다.
+AGENT_REGISTRY: dict[str, AgentSpec] = {
+    'root_agent': AgentSpec('a2adk.agents.agent:root_agent', card='a2adk.agents.card:get_agent_card'),
+}
+# A2ADK_AGENTS=이름=모듈:변수,... 로 다른 패키지의 에이전트를 등록할 수 있습니다.
+A2ADK_AGENTS = os.getenv("A2ADK_AGENTS")
+
+_agents: dict[str, BaseAgent] = {}
+
+
+def _resolve(target: str):
+    module_name, _, attribute = target.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def register_agent(
+    name: str,
+    target: Union[str, Callable[[], BaseAgent]],
+    *,
+    card: Union[str, Callable, None] = None,
+):
+    """Add an agent to the registry; it is only imported when first requested."""
+    AGENT_REGISTRY[name] = AgentSpec(target, card=card)
+    _agents.pop(name, None)
+
+
+def get_agent_names() -> list[str]:
+    return list(AGENT_REGISTRY)
+
+
+def get_agent(name: str) -> BaseAgent:
+    agent = _agents.get(name)
+    if agent is not None:
+        return agent
+    spec = AGENT_REGISTRY.get(name)
+    if spec is None:
+        raise ValueError(f'Unknown agent: {name}')
+    agent = _resolve(spec.target) if isinstance(spec.target, str) else spec.target()
+    # @cached_tool로 선언된 도구에 캐시를 적용합니다.
+    apply_tool_cache(agent)
+    _agents[name] = agent
+    return agent
+
+
+def get_agent_card_factory(name: str) -> Optional[Callable]:
+    spec = AGENT_REGISTRY.get(name)
+    if spec is None or spec.card is None:
+        return None
+    return _resolve(spec.card) if isinstance(spec.card, str) else spec.card
+
+
+if A2ADK_AGENTS:
+    for entry in A2ADK_AGENTS.split(','):
+        agent_name, _, agent_target = entry.strip().partition('=')
+        if not agent_target:
+            raise ValueError(f'A2ADK_AGENTS entries must look like name=module:attribute, got: {entry!r}')
+        register_agent(agent_name, agent_target)
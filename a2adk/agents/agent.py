@@ -2,6 +2,10 @@ import datetime
 from zoneinfo import ZoneInfo
 from google.adk.agents import LlmAgent
 
+from a2adk.agents.tool_cache import cached_tool
+
+
+@cached_tool(ttl=300)
 def get_weather(city: str) -> dict:
     """Retrieves the current weather report for a specified city.
 
@@ -26,6 +30,8 @@ def get_weather(city: str) -> dict:
         }
 
 
+# 현재 시각은 재사용하지 않고, 동시에 들어온 같은 호출만 합칩니다.
+@cached_tool(ttl=0)
 def get_current_time(city: str) -> dict:
     """Returns the current time in a specified city.
 
@@ -4,7 +4,7 @@ from a2a.types import (
     AgentSkill,
 )
 
-def get_agent_card(host: str, port: int) -> AgentCard:
+def get_agent_card(host: str, port: int, path: str = '') -> AgentCard:
     skill = AgentSkill(
         id='plan_parties',
         name='Plan a Birthday Party',
@@ -19,10 +19,31 @@ def get_agent_card(host: str, port: int) -> AgentCard:
     return AgentCard(
         name='Birthday Planner',
         description='I can help you plan fun birthday parties.',
-        url=f'http://{host}:{port}/',
+        url=f'http://{host}:{port}{path}/',
         version='1.0.0',
         defaultInputModes=['text'],
         defaultOutputModes=['text'],
         capabilities=AgentCapabilities(streaming=True),
         skills=[skill],
     )
+
+
+def get_default_agent_card(agent, host: str, port: int, path: str = '') -> AgentCard:
+    """Agent card built from the agent itself, for agents registered without a card."""
+    return AgentCard(
+        name=agent.name,
+        description=agent.description or agent.name,
+        url=f'http://{host}:{port}{path}/',
+        version='1.0.0',
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[
+            AgentSkill(
+                id=agent.name,
+                name=agent.name,
+                description=agent.description or agent.name,
+                tags=[],
+            )
+        ],
+    )
@@ -0,0 +1,170 @@
+import asyncio
+import inspect
+import json
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.tools import FunctionTool, ToolContext
+
+_TOOL_CACHE_ATTR = '__a2adk_tool_cache__'
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    # 결과를 재사용하는 시간(초)입니다. 0이면 동시에 들어온 같은 호출만 합칩니다.
+    ttl: float = 60.0
+    max_entries: int = 1024
+    # 인자 dict를 캐시 키로 바꾸는 함수입니다. 기본값은 인자 전체입니다.
+    key: Optional[Callable[[dict[str, Any]], Any]] = None
+
+
+def cached_tool(
+    ttl: float = 60.0,
+    *,
+    max_entries: int = 1024,
+    key: Optional[Callable[[dict[str, Any]], Any]] = None,
+):
+    """Declare that a function tool's results can be memoized.
+
+    The function itself is not changed; the agent registry wraps it in a
+    `CachedFunctionTool` when the agent is loaded (see `apply_tool_cache`).
+    Only use it for tools whose result depends on their arguments alone.
+
+    ```
+    @cached_tool(ttl=300, key=lambda args: args['city'].lower())
+    def get_weather(city: str) -> dict: ...
+    ```
+    """
+    policy = ToolCachePolicy(ttl=ttl, max_entries=max_entries, key=key)
+
+    def decorator(func):
+        setattr(func, _TOOL_CACHE_ATTR, policy)
+        return func
+
+    return decorator
+
+
+class CachedFunctionTool(FunctionTool):
+    """FunctionTool with TTL memoization and single-flight calls.
+
+    Concurrent calls with the same key share one invocation of the function;
+    blocking (sync) functions run in a worker thread so they can overlap.
+    Exceptions are not cached.
+    """
+
+    def __init__(self, func: Callable[..., Any], policy: ToolCachePolicy):
+        super().__init__(func)
+        self._parameters = inspect.signature(func).parameters
+        if 'tool_context' in self._parameters:
+            raise ValueError(f"Tool '{self.name}' uses tool_context and cannot be cached.")
+        self.policy = policy
+        # FunctionTool과 같이 __call__이 코루틴인 호출 가능 객체도 비동기로 봅니다.
+        self._blocking = not (
+            inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, '__call__', None))
+        )
+        # key -> (expires_at(monotonic), result, duration)
+        self._results: OrderedDict[str, tuple[float, Any, float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats: Counter = Counter()
+        self._saved_seconds = 0.0
+        _cached_tools[self.name] = self
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        # 함수가 받지 않는 인자(모델이 지어낸 인자)는 버립니다. 캐시 키도 호출에 쓰는 인자로 만듭니다.
+        if not any(parameter.kind is inspect.Parameter.VAR_KEYWORD for parameter in self._parameters.values()):
+            args = {name: value for name, value in args.items() if name in self._parameters}
+        if any(arg not in args for arg in self._get_mandatory_args()):
+            # 필수 인자 누락 시 FunctionTool이 모델에게 돌려줄 오류를 만듭니다. 캐시하지 않습니다.
+            return await super().run_async(args=args, tool_context=tool_context)
+        key = self._cache_key(args)
+        self._stats['calls'] += 1
+        entry = self._results.get(key)
+        if entry is not None:
+            expires_at, result, duration = entry
+            if expires_at > time.monotonic():
+                self._results.move_to_end(key)
+                self._stats['hits'] += 1
+                self._saved_seconds += duration
+                return result
+            del self._results[key]
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self._stats['misses'] += 1
+            # 호출자가 취소되어도 함께 기다리는 다른 호출이 결과를 받을 수 있도록 별도 태스크로 실행합니다.
+            inflight = asyncio.create_task(self._call(key, args, tool_context))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._call_done(key, task))
+            result, _ = await asyncio.shield(inflight)
+            return result
+        self._stats['coalesced'] += 1
+        result, duration = await asyncio.shield(inflight)
+        self._saved_seconds += duration
+        return result
+
+    def stats(self) -> dict:
+        lookups = self._stats['calls']
+        saved = self._stats['hits'] + self._stats['coalesced']
+        return {
+            'entries': len(self._results),
+            'hit_ratio': round(saved / lookups, 3) if lookups else None,
+            'saved_seconds': round(self._saved_seconds, 3),
+            **self._stats,
+        }
+
+    async def _call(self, key: str, args: dict[str, Any], tool_context: ToolContext) -> tuple[Any, float]:
+        started = time.monotonic()
+        result = await self._invoke(args, tool_context)
+        duration = time.monotonic() - started
+        if self.policy.ttl > 0:
+            self._results[key] = (time.monotonic() + self.policy.ttl, result, duration)
+            while len(self._results) > self.policy.max_entries:
+                self._results.popitem(last=False)
+        return result, duration
+
+    def _call_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._stats['errors'] += 1
+
+    def _cache_key(self, args: dict[str, Any]) -> str:
+        value = self.policy.key(args) if self.policy.key is not None else args
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+    async def _invoke(self, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        # FunctionTool.run_async와 같은 인자로 호출하되, 결과는 그대로 돌려줍니다.
+        # dict가 아닌 결과는 ADK가 {'result': ...}로 감쌉니다.
+        args_to_call = dict(args)
+        if 'tool_context' in self._parameters:
+            args_to_call['tool_context'] = tool_context
+        if self._blocking:
+            # 함수 호출만 스레드에서 실행합니다.
+            return await asyncio.to_thread(self.func, **args_to_call)
+        return await self.func(**args_to_call)
+
+
+_cached_tools: dict[str, CachedFunctionTool] = {}
+
+
+def apply_tool_cache(agent: BaseAgent):
+    """Wrap the tools declared with `@cached_tool` in the agent tree. Idempotent."""
+    if isinstance(agent, LlmAgent):
+        agent.tools = [_wrap(tool) for tool in agent.tools]
+    for sub_agent in agent.sub_agents:
+        apply_tool_cache(sub_agent)
+
+
+def _wrap(tool):
+    if isinstance(tool, CachedFunctionTool):
+        return tool
+    func = tool.func if isinstance(tool, FunctionTool) else tool
+    policy = getattr(func, _TOOL_CACHE_ATTR, None)
+    return CachedFunctionTool(func, policy) if policy is not None else tool
+
+
+def tool_cache_stats() -> dict[str, dict]:
+    """Per-tool memoization stats of every cached tool loaded in this process."""
+    return {name: tool.stats() for name, tool in _cached_tools.items()}
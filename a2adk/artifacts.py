@@ -0,0 +1,145 @@
+import base64
+import logging
+import mimetypes
+import os
+import re
+from typing import Optional
+from urllib.parse import quote
+from uuid import uuid4
+
+from google.adk.artifacts import BaseArtifactService
+from google.adk.artifacts.gcs_artifact_service import GcsArtifactService
+from google.genai import types
+
+from a2a.types import FilePart, FileWithBytes, Part
+
+from a2adk.utils import convert_a2a_part_to_genai
+
+logger = logging.getLogger(__name__)
+
+# 이 크기(바이트)를 넘는 인라인 파일은 세션/메시지에 복사하지 않고 아티팩트 서비스에 저장합니다.
+A2A_INLINE_FILE_MAX_BYTES = int(os.getenv("A2A_INLINE_FILE_MAX_BYTES") or 1024 * 1024)
+# 클라이언트가 접근하는 서버 주소와 /buckets 라우트가 제공하는 버킷입니다.
+# 아티팩트가 이 버킷에 저장될 때만 응답의 큰 파일을 /buckets URL로 바꿉니다.
+A2A_SERVER_URL = os.getenv("VITE_A2A_SERVER_URL")
+GCS_BUCKET = os.getenv("GCS_BUCKET")
+
+_UNSAFE_FILENAME = re.compile(r'[^\w.\-]+')
+
+
+def _decoded_size(data: str) -> int:
+    """Size of the bytes encoded in a base64 string, without decoding it."""
+    return len(data) * 3 // 4 - data[-2:].count('=')
+
+
+def _artifact_filename(name: Optional[str], mime_type: Optional[str], prefix: str) -> str:
+    name = _UNSAFE_FILENAME.sub('_', os.path.basename(name or '')).strip('._')
+    if not name:
+        name = f'{prefix}_{uuid4().hex[:12]}{mimetypes.guess_extension(mime_type or "") or ""}'
+    return name
+
+
+def artifact_uri(
+    artifact_service: BaseArtifactService,
+    *,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    filename: str,
+    version: int,
+) -> Optional[str]:
+    """HTTP URL of a saved artifact served by the /buckets route, if it is served there."""
+    base_url = _bucket_route_url(artifact_service)
+    if base_url is None:
+        return None
+    blob_name = artifact_service._get_blob_name(app_name, user_id, session_id, filename, version)
+    return f'{base_url}/{quote(blob_name)}'
+
+
+def _bucket_route_url(artifact_service: BaseArtifactService) -> Optional[str]:
+    # gs:// URI는 클라이언트가 가져올 수 없으므로 /buckets 라우트가 같은 버킷을 제공할 때만 URL을 만듭니다.
+    if (
+        not A2A_SERVER_URL
+        or not isinstance(artifact_service, GcsArtifactService)
+        or artifact_service.bucket_name != GCS_BUCKET
+    ):
+        return None
+    return f'{A2A_SERVER_URL.rstrip("/")}/buckets'
+
+
+async def convert_a2a_parts_to_genai_spilling(
+    parts: list[Part],
+    *,
+    artifact_service: BaseArtifactService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    max_bytes: int = A2A_INLINE_FILE_MAX_BYTES,
+) -> list[types.Part]:
+    """Convert A2A parts like `convert_a2a_parts_to_genai`, spilling large files.
+
+    `FileWithBytes` parts larger than `max_bytes` are decoded once and saved
+    to the artifact service; the part is replaced by a text reference that
+    the agent can resolve with the `load_artifacts` tool. Smaller parts stay
+    inline.
+    """
+    converted = []
+    for part in parts:
+        file = part.root.file if isinstance(part.root, FilePart) else None
+        if not isinstance(file, FileWithBytes) or _decoded_size(file.bytes) <= max_bytes:
+            converted.append(convert_a2a_part_to_genai(part))
+            continue
+        filename = _artifact_filename(file.name, file.mimeType, 'upload')
+        data = base64.b64decode(file.bytes)
+        version = await artifact_service.save_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            artifact=types.Part(inline_data=types.Blob(data=data, mime_type=file.mimeType)),
+        )
+        logger.debug(f"Saved {len(data)} byte upload as artifact {filename} (version {version})")
+        converted.append(types.Part(
+            text=(
+                f'Uploaded file: {filename} ({file.mimeType or "unknown type"}, {len(data)} bytes). '
+                'It is saved into artifacts; use load_artifacts to read it.'
+            )
+        ))
+    return converted
+
+
+async def spill_large_inline_parts(
+    parts: list[types.Part],
+    *,
+    artifact_service: BaseArtifactService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    max_bytes: int = A2A_INLINE_FILE_MAX_BYTES,
+) -> list[types.Part]:
+    """Replace large inline data in a response with a URL of a saved artifact.
+
+    Only done when clients can fetch the artifact through the /buckets route
+    (see `artifact_uri`); otherwise the parts are returned unchanged.
+    """
+    if _bucket_route_url(artifact_service) is None:
+        return parts
+    spilled = []
+    for part in parts:
+        if part.inline_data is None or len(part.inline_data.data or b'') <= max_bytes:
+            spilled.append(part)
+            continue
+        filename = _artifact_filename(part.inline_data.display_name, part.inline_data.mime_type, 'response')
+        version = await artifact_service.save_artifact(
+            app_name=app_name, user_id=user_id, session_id=session_id, filename=filename, artifact=part
+        )
+        uri = artifact_uri(
+            artifact_service,
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            version=version,
+        )
+        spilled.append(types.Part(file_data=types.FileData(file_uri=uri, mime_type=part.inline_data.mime_type)))
+    return spilled
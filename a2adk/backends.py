@@ -0,0 +1,171 @@
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from a2adk.lifespan import on_shutdown
+from a2adk.startup import startup_report
+from a2adk.utils import get_data_path
+
+logger = logging.getLogger(__name__)
+
+UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS") or 4)
+
+
+@dataclass
+class Backend:
+    """A service implementation that is imported only when it is selected.
+
+    `modules` are imported before `factory` is called, so the import and the
+    init cost show up separately in the startup report. `enabled` defaults to
+    checking that the environment variable `env` is set; `factory` receives
+    its value (None for backends without `env`).
+    """
+
+    kind: str
+    name: str
+    factory: Callable[[Optional[str]], Any]
+    env: Optional[str] = None
+    modules: tuple[str, ...] = ()
+    enabled: Optional[Callable[[], bool]] = None
+
+    def is_enabled(self) -> bool:
+        if self.enabled is not None:
+            return self.enabled()
+        return self.env is None or bool(os.getenv(self.env))
+
+
+# kind -> 등록 순서대로의 백엔드 목록. 앞에 있는 백엔드가 먼저 선택됩니다.
+_backends: dict[str, list[Backend]] = {}
+
+
+def register_backend(
+    kind: str,
+    name: str,
+    *,
+    env: Optional[str] = None,
+    modules: tuple[str, ...] = (),
+    enabled: Optional[Callable[[], bool]] = None,
+    first: bool = False,
+):
+    """Decorator registering `factory` as the `name` backend for `kind`.
+
+    Backends are tried in registration order (or before all others with
+    `first=True`); the first enabled one is created by `create_backend`.
+    """
+    def decorator(factory: Callable[[Optional[str]], Any]):
+        backend = Backend(kind=kind, name=name, factory=factory, env=env, modules=modules, enabled=enabled)
+        backends = [b for b in _backends.get(kind, []) if b.name != name]
+        _backends[kind] = [backend, *backends] if first else [*backends, backend]
+        return factory
+    return decorator
+
+
+def get_backends(kind: str) -> list[Backend]:
+    return list(_backends.get(kind, []))
+
+
+def create_backend(kind: str) -> Any:
+    """Import and create the first enabled backend of `kind`; None if there is none."""
+    for backend in _backends.get(kind, []):
+        if not backend.is_enabled():
+            continue
+        stage = f'{kind}:{backend.name}'
+        started = time.perf_counter()
+        for module in backend.modules:
+            importlib.import_module(module)
+        startup_report.record(stage, 'import', time.perf_counter() - started)
+        with startup_report.stage(stage, 'init'):
+            instance = backend.factory(os.getenv(backend.env) if backend.env else None)
+        logger.info(f"Using {backend.name} backend for {kind}")
+        return instance
+    return None
+
+
+@register_backend(
+    'artifact', 'gcs', env='GCS_ARTIFACT_SERVICE', modules=('google.adk.artifacts.gcs_artifact_service',)
+)
+def _gcs_artifact_service(bucket_name):
+    from google.adk.artifacts.gcs_artifact_service import GcsArtifactService
+    return GcsArtifactService(bucket_name=bucket_name)
+
+
+@register_backend(
+    'session', 'database', env='DATABASE_SESSION_SERVICE',
+    modules=('google.adk.sessions.database_session_service',),
+)
+def _database_session_service(db_url):
+    from google.adk.sessions.database_session_service import DatabaseSessionService
+    return DatabaseSessionService(db_url=db_url)
+
+
+@register_backend(
+    'session', 'vertexai', env='VERTEXAI_SESSION_SERVICE',
+    modules=('google.adk.sessions.vertex_ai_session_service',),
+)
+def _vertexai_session_service(value):
+    from google.adk.sessions.vertex_ai_session_service import VertexAiSessionService
+    vertexai_value = value.split(":")
+    if len(vertexai_value) == 2:
+        return VertexAiSessionService(project=vertexai_value[0], location=vertexai_value[1])
+    return VertexAiSessionService(project=vertexai_value[0])
+
+
+@register_backend(
+    'session', 'sqlite', env='SQLITE_SESSION_SERVICE',
+    modules=('a2adk.sessions.sqlite_session_service',),
+    # 워커마다 메모리에 세션을 두면 대화가 워커별로 나뉘므로, 여러 워커에서는 SQLite 파일을 공유합니다.
+    enabled=lambda: bool(os.getenv('SQLITE_SESSION_SERVICE')) or UVICORN_WORKERS > 1,
+)
+def _sqlite_session_service(path):
+    from a2adk.sessions.sqlite_session_service import SqliteSessionService
+    session_service = SqliteSessionService(path or get_data_path("sessions.db"))
+    on_shutdown(session_service.close)
+    return session_service
+
+
+@register_backend('session', 'memory', modules=('google.adk.sessions.in_memory_session_service',))
+def _in_memory_session_service(_):
+    from google.adk.sessions.in_memory_session_service import InMemorySessionService
+    return InMemorySessionService()
+
+
+@register_backend(
+    'memory', 'vertexai_rag', env='VERTEXAIRAG_MEMORY_SERVICE',
+    modules=('google.adk.memory.vertex_ai_rag_memory_service',),
+)
+def _vertexai_rag_memory_service(rag_corpus):
+    from google.adk.memory.vertex_ai_rag_memory_service import VertexAiRagMemoryService
+    return VertexAiRagMemoryService(rag_corpus=rag_corpus)
+
+
+# 작업 저장소 백엔드는 (task_store, queue_manager)를 반환합니다.
+# 여러 워커가 작업을 공유하려면 SQLITE_TASK_STORE 또는 REDIS_TASK_STORE를 설정합니다.
+@register_backend('task_store', 'sqlite', env='SQLITE_TASK_STORE', modules=('a2adk.tasks.sqlite_backend',))
+def _sqlite_task_store(path):
+    from a2adk.tasks import DistributedQueueManager, SqliteEventBroker, SqliteTaskStore
+    task_store = SqliteTaskStore(path)
+    queue_manager = DistributedQueueManager(SqliteEventBroker(path))
+    on_shutdown(task_store.close)
+    on_shutdown(queue_manager.aclose)
+    return task_store, queue_manager
+
+
+@register_backend('task_store', 'redis', env='REDIS_TASK_STORE', modules=('a2adk.tasks.redis_backend',))
+def _redis_task_store(url):
+    from a2adk.tasks import DistributedQueueManager
+    from a2adk.tasks.redis_backend import RedisEventBroker, RedisTaskStore, create_redis_client
+    task_store = RedisTaskStore(create_redis_client(url))
+    queue_manager = DistributedQueueManager(RedisEventBroker(create_redis_client(url)))
+    on_shutdown(task_store.close)
+    on_shutdown(queue_manager.aclose)
+    return task_store, queue_manager
+
+
+@register_backend('task_store', 'memory', modules=('a2a.server.tasks', 'a2a.server.events'))
+def _in_memory_task_store(_):
+    from a2a.server.events import InMemoryQueueManager
+    from a2a.server.tasks import InMemoryTaskStore
+    return InMemoryTaskStore(), InMemoryQueueManager()
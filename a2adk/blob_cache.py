@@ -0,0 +1,84 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class BlobCache:
+    """Size-bounded on-disk LRU cache of downloaded blobs.
+
+    Files are keyed by blob name and generation, so a rewritten object never
+    serves stale bytes. Recency is tracked with the file mtime, which lets
+    several workers share one cache directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_entry_bytes: int | None = None):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str, generation) -> str:
+        key = hashlib.sha256(f'{name}#{generation}'.encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, key)
+
+    def accepts(self, size: int | None) -> bool:
+        return size is not None and 0 < size <= self._max_entry_bytes
+
+    def get(self, name: str, generation) -> str | None:
+        """Return the cached file path, marking it as recently used, or None."""
+        path = self._path(name, generation)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, name: str, generation, download) -> str:
+        """Store a blob by calling `download(tmp_path)` and return the cached path.
+
+        `download` must write the full object to the given path. Blocking; call
+        it from a worker thread.
+        """
+        path = self._path(name, generation)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.part')
+        os.close(fd)
+        try:
+            download(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self._evict()
+        return path
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self._directory) as it:
+                for entry in it:
+                    if not entry.is_file() or entry.name.endswith('.part'):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            if total <= self._max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self._max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+            logger.debug('Blob cache evicted down to %d bytes', total)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import os
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# === Connection Pool Settings ===
+# 원격 A2A 에이전트 호출에 공통으로 사용하는 커넥션 풀 설정입니다.
+A2A_HTTP_MAX_CONNECTIONS = int(os.getenv("A2A_HTTP_MAX_CONNECTIONS") or 100)
+A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS") or 20)
+A2A_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("A2A_HTTP_KEEPALIVE_EXPIRY") or 30.0)
+A2A_HTTP_TIMEOUT = float(os.getenv("A2A_HTTP_TIMEOUT") or 60.0)
+A2A_HTTP_CONNECT_TIMEOUT = float(os.getenv("A2A_HTTP_CONNECT_TIMEOUT") or 5.0)
+A2A_HTTP2 = (os.getenv("A2A_HTTP2") or "").upper() in ("1", "TRUE")
+
+# httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 루프마다 하나씩 유지합니다.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _new_client() -> httpx.AsyncClient:
+    http2 = A2A_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("A2A_HTTP2 is set but the 'h2' package is not installed. Falling back to HTTP/1.1.")
+        http2 = False
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=A2A_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=A2A_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(A2A_HTTP_TIMEOUT, connect=A2A_HTTP_CONNECT_TIMEOUT),
+        http2=http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _new_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Close the pooled AsyncClient bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -0,0 +1,27 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+_shutdown_callbacks: list[Callable[[], Awaitable[None]]] = []
+
+
+def on_shutdown(callback: Callable[[], Awaitable[None]]):
+    """Register a coroutine function to run when the server shuts down."""
+    if callback not in _shutdown_callbacks:
+        _shutdown_callbacks.append(callback)
+    return callback
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Starlette lifespan that runs the registered shutdown callbacks in reverse order."""
+    try:
+        yield
+    finally:
+        for callback in reversed(_shutdown_callbacks):
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"Shutdown callback {callback.__qualname__} failed: {e}", exc_info=True)
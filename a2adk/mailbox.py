@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Hashable
+
+from a2adk.metrics import add_mailbox_waiting, observe_stage
+
+logger = logging.getLogger(__name__)
+
+# 같은 대화(contextId)의 메시지를 차례로 처리합니다. 끄면 동시에 실행되어 이력이 섞일 수 있습니다.
+A2A_CONTEXT_MAILBOX = (os.getenv("A2A_CONTEXT_MAILBOX") or "true").lower() in ("1", "true", "yes")
+# 앞 턴이 끝나기를 기다리던 메시지들을 한 번의 모델 턴으로 합칩니다.
+A2A_MAILBOX_MERGE = (os.getenv("A2A_MAILBOX_MERGE") or "").lower() in ("1", "true", "yes")
+# 한 턴에 합치는 최대 메시지 수입니다.
+A2A_MAILBOX_MERGE_MAX = int(os.getenv("A2A_MAILBOX_MERGE_MAX") or 8)
+
+# /stats에 대기열 길이를 보여 줄 대화 수입니다.
+_DEEPEST_CONTEXTS = 10
+
+# 대기하던 메시지에 차례가 왔음을 알리는 값입니다.
+_YOUR_TURN = object()
+
+
+class _Letter:
+    def __init__(self, item: Any):
+        self.item = item
+        self.future = asyncio.get_running_loop().create_future()
+        self.queued_at = time.monotonic()
+
+
+def _has_turn(letter: _Letter) -> bool:
+    future = letter.future
+    return future.done() and not future.cancelled() and future.exception() is None and future.result() is _YOUR_TURN
+
+
+class _Mailbox:
+    def __init__(self):
+        self.busy = False
+        self.pending: deque[_Letter] = deque()
+
+
+class ContextMailbox:
+    """Runs the items of one key (contextId) one turn at a time.
+
+    `run(key, item, handler)` calls `handler([item, ...])` once no earlier
+    item of the same key is being handled. Items of different keys run in
+    parallel. With `merge`, the items that queued up behind a running turn
+    are handled together in the next turn (at most `merge_max`); the
+    callers merged into another caller's turn get that turn's result.
+    If a turn is cancelled, the items merged into it are queued again.
+
+    Serialization is per process; workers do not coordinate.
+    """
+
+    def __init__(
+        self,
+        name: str = '',
+        *,
+        merge: bool = A2A_MAILBOX_MERGE,
+        merge_max: int = A2A_MAILBOX_MERGE_MAX,
+    ):
+        self._name = name
+        self._merge = merge
+        self._merge_max = max(1, merge_max)
+        self._boxes: dict[Hashable, _Mailbox] = {}
+        self._stats: Counter = Counter()
+        self._max_depth = 0
+
+    async def run(self, key: Hashable, item: Any, handler: Callable[[list[Any]], Awaitable[Any]]) -> Any:
+        box = self._boxes.get(key)
+        if box is None:
+            box = self._boxes[key] = _Mailbox()
+        letter = _Letter(item)
+        if box.busy:
+            box.pending.append(letter)
+            self._stats['queued'] += 1
+            self._max_depth = max(self._max_depth, len(box.pending))
+            add_mailbox_waiting(self._name, 1)
+            try:
+                outcome = await asyncio.shield(letter.future)
+            except asyncio.CancelledError:
+                if not letter.future.done():
+                    letter.future.cancel()
+                    if letter in box.pending:
+                        box.pending.remove(letter)
+                        add_mailbox_waiting(self._name, -1)
+                elif _has_turn(letter):
+                    # 차례를 받은 직후에 취소되었으면 다음 메시지에 넘깁니다.
+                    self._next(key, box)
+                raise
+            if outcome is not _YOUR_TURN:
+                return outcome
+        else:
+            box.busy = True
+        observe_stage(self._name, 'mailbox_wait', time.monotonic() - letter.queued_at)
+        batch = [letter]
+        if self._merge:
+            while box.pending and len(batch) < self._merge_max:
+                batch.append(box.pending.popleft())
+                add_mailbox_waiting(self._name, -1)
+            if len(batch) > 1:
+                self._stats['merged'] += len(batch) - 1
+        self._stats['turns'] += 1
+        try:
+            result = await handler([queued.item for queued in batch])
+        except asyncio.CancelledError:
+            # 함께 처리하던 메시지는 답을 받지 못했으므로 다시 맨 앞에 넣습니다.
+            for queued in reversed(batch[1:]):
+                if not queued.future.done():
+                    box.pending.appendleft(queued)
+                    add_mailbox_waiting(self._name, 1)
+                    self._stats['requeued'] += 1
+            raise
+        except BaseException as e:
+            for queued in batch[1:]:
+                if not queued.future.done():
+                    queued.future.set_exception(e)
+            raise
+        else:
+            for queued in batch[1:]:
+                if not queued.future.done():
+                    queued.future.set_result(result)
+            return result
+        finally:
+            self._next(key, box)
+
+    def _next(self, key: Hashable, box: _Mailbox):
+        while box.pending:
+            letter = box.pending.popleft()
+            add_mailbox_waiting(self._name, -1)
+            if not letter.future.done():
+                letter.future.set_result(_YOUR_TURN)
+                return
+        box.busy = False
+        if self._boxes.get(key) is box:
+            del self._boxes[key]
+
+    def depth(self, key: Hashable) -> int:
+        """Messages of `key` waiting behind its running turn."""
+        box = self._boxes.get(key)
+        return len(box.pending) if box is not None else 0
+
+    def stats(self) -> dict:
+        depths = sorted(
+            ((key, len(box.pending)) for key, box in self._boxes.items() if box.pending),
+            key=lambda entry: entry[1],
+            reverse=True,
+        )
+        return {
+            'merge': self._merge,
+            'active_contexts': len(self._boxes),
+            'waiting': sum(depth for _, depth in depths),
+            'max_depth': self._max_depth,
+            'deepest': {str(key): depth for key, depth in depths[:_DEEPEST_CONTEXTS]},
+            **self._stats,
+        }
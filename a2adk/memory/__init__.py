@@ -0,0 +1,4 @@
+from a2adk.memory.cache import MEMORY_CACHE, CachingMemoryService, memory_session
+from a2adk.memory.ingestion import MemoryIngestionQueue
+
+__all__ = ['CachingMemoryService', 'MEMORY_CACHE', 'MemoryIngestionQueue', 'memory_session']
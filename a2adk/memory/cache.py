@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from google.adk.memory import BaseMemoryService
+from google.adk.memory.base_memory_service import SearchMemoryResponse
+from google.adk.sessions import Session
+
+from a2adk.metrics import observe_stage
+from a2adk.response_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 메모리 검색 결과 캐시를 켭니다(VERTEXAIRAG_MEMORY_SERVICE 등 원격 메모리와 함께 사용).
+MEMORY_CACHE = (os.getenv("MEMORY_CACHE") or "").lower() in ("1", "true", "yes")
+# 같은 사용자의 같은 질의(정규화 후)를 재사용하는 시간(초)과 대화 안에서 재사용하는 시간(초)입니다.
+MEMORY_CACHE_TTL = float(os.getenv("MEMORY_CACHE_TTL") or 300)
+MEMORY_CACHE_SESSION_TTL = float(os.getenv("MEMORY_CACHE_SESSION_TTL") or 1800)
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES") or 1000)
+# 같은 대화에서 단어 집합의 유사도(Jaccard)가 이 값 이상이면 같은 질의로 봅니다. 0이면 정확히 같은 질의만 재사용합니다.
+MEMORY_CACHE_SIMILARITY = float(os.getenv("MEMORY_CACHE_SIMILARITY") or 0.8)
+# 세션을 불러오는 동안 메모리 검색을 미리 시작합니다.
+MEMORY_PREFETCH = (os.getenv("MEMORY_PREFETCH") or "true").lower() in ("1", "true", "yes")
+
+# 대화별로 기억하는 최근 질의 수입니다.
+_SESSION_QUERIES = 8
+_WORD = re.compile(r'\w+')
+
+# search_memory에는 세션이 전달되지 않으므로 실행 중인 턴의 세션 ID를 여기에 둡니다.
+_current_session: ContextVar[Optional[str]] = ContextVar('a2adk_memory_session', default=None)
+
+
+@contextmanager
+def memory_session(session_id: str):
+    """Attribute memory searches inside the `with` body to `session_id`."""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def _words(query: str) -> frozenset[str]:
+    return frozenset(_WORD.findall(query))
+
+
+def _similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    def __init__(self, query: str, response: SearchMemoryResponse, expires: float, generation: int):
+        self.query = query
+        self.words = _words(query)
+        self.response = response
+        self.expires = expires
+        self.generation = generation
+
+
+class CachingMemoryService(BaseMemoryService):
+    """Memory service wrapper caching `search_memory` results.
+
+    Results are cached per user for `ttl` seconds under the normalized query,
+    and per conversation for `session_ttl` seconds, where a query whose words
+    are at least `similarity` alike (Jaccard) to a recent one of the same
+    conversation reuses its result. Concurrent searches for the same query
+    share one remote call, and `prefetch` starts a search before the agent
+    asks for it. `add_session_to_memory` invalidates the user's results.
+
+    Invalidation is per process; results ingested by other workers become
+    visible when the entries expire.
+    """
+
+    def __init__(
+        self,
+        memory_service: BaseMemoryService,
+        *,
+        ttl: float = MEMORY_CACHE_TTL,
+        session_ttl: float = MEMORY_CACHE_SESSION_TTL,
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        similarity: float = MEMORY_CACHE_SIMILARITY,
+    ):
+        self._memory_service = memory_service
+        self._ttl = ttl
+        self._session_ttl = session_ttl
+        self._max_entries = max_entries
+        self._similarity = similarity
+        # (app, user, 정규화된 질의) -> 결과
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        # (app, user, session) -> 최근 질의 결과
+        self._session_entries: OrderedDict[tuple[str, str, str], list[_Entry]] = OrderedDict()
+        self._inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+        # (app, user) -> 메모리가 추가될 때마다 증가합니다. 이전 세대의 결과는 쓰지 않습니다.
+        self._generations: Counter = Counter()
+        self._stats: Counter = Counter()
+
+    @property
+    def wrapped(self) -> BaseMemoryService:
+        return self._memory_service
+
+    async def add_session_to_memory(self, session: Session):
+        await self._memory_service.add_session_to_memory(session)
+        self.invalidate(session.app_name, session.user_id)
+
+    async def search_memory(self, *, app_name: str, user_id: str, query: str) -> SearchMemoryResponse:
+        return await self._search(app_name, user_id, _current_session.get(), query)
+
+    def prefetch(self, app_name: str, user_id: str, session_id: str, query: str):
+        """Start searching `query` in the background unless a usable result is cached."""
+        if not query:
+            return
+        normalized = normalize_text(query)
+        key = (app_name, user_id, normalized)
+        if key in self._inflight or self._lookup(app_name, user_id, session_id, normalized, count=False) is not None:
+            return
+        self._stats['prefetched'] += 1
+        # 에이전트의 검색이 이 작업을 기다리도록 바로 진행 중으로 등록합니다.
+        task = asyncio.create_task(self._fetch(app_name, user_id, normalized, query))
+        self._inflight[key] = task
+        task.add_done_callback(self._log_prefetch_error)
+
+    def invalidate(self, app_name: str, user_id: str):
+        self._generations[(app_name, user_id)] += 1
+        self._stats['invalidations'] += 1
+
+    def stats(self) -> dict:
+        hits = self._stats['session_hits'] + self._stats['hits'] + self._stats['coalesced']
+        total = hits + self._stats['misses']
+        return {
+            'entries': len(self._entries),
+            'sessions': len(self._session_entries),
+            'hit_ratio': round(hits / total, 3) if total else None,
+            **self._stats,
+        }
+
+    async def _search(
+        self, app_name: str, user_id: str, session_id: Optional[str], query: str
+    ) -> SearchMemoryResponse:
+        normalized = normalize_text(query)
+        cached = self._lookup(app_name, user_id, session_id, normalized)
+        if cached is not None:
+            return cached
+        key = (app_name, user_id, normalized)
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats['misses'] += 1
+            # 먼저 요청한 쪽이 취소되어도 같은 질의를 기다리는 다른 요청이 결과를 받도록 별도 작업으로 검색합니다.
+            task = asyncio.create_task(self._fetch(app_name, user_id, normalized, query))
+            self._inflight[key] = task
+        else:
+            self._stats['coalesced'] += 1
+        response, generation = await asyncio.shield(task)
+        if generation == self._generations[(app_name, user_id)]:
+            self._remember_in_session(app_name, user_id, session_id, normalized, response)
+        return response
+
+    async def _fetch(
+        self, app_name: str, user_id: str, normalized: str, query: str
+    ) -> tuple[SearchMemoryResponse, int]:
+        key = (app_name, user_id, normalized)
+        generation = self._generations[(app_name, user_id)]
+        started = time.perf_counter()
+        try:
+            response = await self._memory_service.search_memory(app_name=app_name, user_id=user_id, query=query)
+        finally:
+            self._inflight.pop(key, None)
+            observe_stage(app_name, 'memory_search', time.perf_counter() - started)
+        # 검색하는 동안 메모리가 추가되었다면 결과를 보관하지 않습니다.
+        if generation == self._generations[(app_name, user_id)]:
+            self._entries[key] = _Entry(normalized, response, time.monotonic() + self._ttl, generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return response, generation
+
+    def _lookup(
+        self, app_name: str, user_id: str, session_id: Optional[str], normalized: str, *, count: bool = True
+    ) -> Optional[SearchMemoryResponse]:
+        now = time.monotonic()
+        generation = self._generations[(app_name, user_id)]
+        if session_id is not None:
+            entries = self._session_entries.get((app_name, user_id, session_id))
+            if entries:
+                words = _words(normalized)
+                for entry in reversed(entries):
+                    if entry.expires <= now or entry.generation != generation:
+                        continue
+                    if entry.query == normalized or (
+                        self._similarity > 0 and _similarity(words, entry.words) >= self._similarity
+                    ):
+                        self._stats['session_hits'] += count
+                        return entry.response
+        key = (app_name, user_id, normalized)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > now and entry.generation == generation:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += count
+                self._remember_in_session(app_name, user_id, session_id, normalized, entry.response)
+                return entry.response
+            del self._entries[key]
+        return None
+
+    def _remember_in_session(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: Optional[str],
+        normalized: str,
+        response: SearchMemoryResponse,
+    ):
+        if session_id is None:
+            return
+        key = (app_name, user_id, session_id)
+        entries = [
+            entry for entry in self._session_entries.get(key, []) if entry.query != normalized
+        ][-(_SESSION_QUERIES - 1):]
+        entries.append(_Entry(
+            normalized, response, time.monotonic() + self._session_ttl, self._generations[(app_name, user_id)]
+        ))
+        self._session_entries[key] = entries
+        self._session_entries.move_to_end(key)
+        while len(self._session_entries) > self._max_entries:
+            self._session_entries.popitem(last=False)
+
+    def _log_prefetch_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Memory prefetch failed: {task.exception()}")
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from google.adk.events import Event
+from google.adk.memory import BaseMemoryService, InMemoryMemoryService
+from google.adk.sessions import BaseSessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from a2adk.metrics import stage_timer
+from a2adk.utils import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 같은 세션의 여러 턴을 한 번에 저장하기 위해 마지막 턴 이후 기다리는 시간(초)입니다.
+MEMORY_INGEST_DEBOUNCE = float(os.getenv("MEMORY_INGEST_DEBOUNCE") or 2.0)
+# 대화가 계속되더라도 첫 요청 후 이 시간(초) 안에는 저장합니다.
+MEMORY_INGEST_MAX_DELAY = float(os.getenv("MEMORY_INGEST_MAX_DELAY") or 30.0)
+# 대기 중인 세션이 이 수를 넘으면 submit()이 자리가 날 때까지 기다립니다.
+MEMORY_INGEST_MAX_PENDING = int(os.getenv("MEMORY_INGEST_MAX_PENDING") or 1000)
+MEMORY_INGEST_CONCURRENCY = int(os.getenv("MEMORY_INGEST_CONCURRENCY") or 4)
+# 세션별로 어디까지 저장했는지 기록하는 파일입니다. 워커 간에 공유됩니다.
+MEMORY_INGEST_WATERMARKS = os.getenv("MEMORY_INGEST_WATERMARKS") or get_data_path("memory_watermarks.db")
+
+SessionKey = tuple[str, str, str]
+
+
+def _has_content(event: Event) -> bool:
+    if not event.content or not event.content.parts:
+        return False
+    for part in event.content.parts:
+        if part.text and part.text.strip():
+            return True
+        if part.inline_data and part.inline_data.data:
+            return True
+    return False
+
+
+class _WatermarkStore:
+    """Timestamp of the last event ingested per session, in a SQLite file."""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS memory_watermarks ('
+            'app_name TEXT NOT NULL, user_id TEXT NOT NULL, session_id TEXT NOT NULL, '
+            'timestamp REAL NOT NULL, PRIMARY KEY (app_name, user_id, session_id))'
+        )
+
+    def get(self, key: SessionKey) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT timestamp FROM memory_watermarks WHERE app_name=? AND user_id=? AND session_id=?', key
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: SessionKey, timestamp: float):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO memory_watermarks (app_name, user_id, session_id, timestamp) '
+                'VALUES (?, ?, ?, ?)',
+                (*key, timestamp),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryIngestionQueue:
+    """Background pipeline that adds finished turns to the memory service.
+
+    - `submit()` returns immediately; ingestion happens after the task is complete.
+    - Several turns of the same session within `debounce` seconds are
+      coalesced into one upload (but never delayed beyond `max_delay`).
+    - Only events newer than the session's watermark are uploaded. Memory
+      services that replace a session's memory on every call (e.g.
+      InMemoryMemoryService) get the whole session instead.
+    - At most `max_pending` sessions wait; further submits wait for room.
+    - `close()` ingests everything still pending, for use at shutdown.
+    """
+
+    def __init__(
+        self,
+        memory_service: BaseMemoryService,
+        session_service: BaseSessionService,
+        *,
+        watermark_path: str = MEMORY_INGEST_WATERMARKS,
+        debounce: float = MEMORY_INGEST_DEBOUNCE,
+        max_delay: float = MEMORY_INGEST_MAX_DELAY,
+        max_pending: int = MEMORY_INGEST_MAX_PENDING,
+        concurrency: int = MEMORY_INGEST_CONCURRENCY,
+    ):
+        self._memory_service = memory_service
+        self._session_service = session_service
+        self._watermarks = _WatermarkStore(watermark_path)
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._concurrency = concurrency
+        self._incremental = not isinstance(memory_service, InMemoryMemoryService)
+        # 세션 키 -> (첫 제출 시각, 처리 예정 시각)
+        self._pending: dict[SessionKey, tuple[float, float]] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._space: asyncio.Condition | None = None
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        self._stats: Counter = Counter()
+
+    async def submit(self, app_name: str, user_id: str, session_id: str):
+        """Schedule the session's new events for ingestion."""
+        self._ensure_worker()
+        key = (app_name, user_id, session_id)
+        if key not in self._pending and len(self._pending) >= self._max_pending:
+            self._stats['backpressure_waits'] += 1
+            async with self._space:
+                await self._space.wait_for(lambda: len(self._pending) < self._max_pending)
+        now = time.monotonic()
+        if key in self._pending:
+            first_submitted, _ = self._pending[key]
+            self._stats['coalesced'] += 1
+        else:
+            first_submitted = now
+        self._pending[key] = (first_submitted, min(now + self._debounce, first_submitted + self._max_delay))
+        self._stats['submitted'] += 1
+        self._wakeup.set()
+
+    async def flush(self):
+        """Ingest every pending session now, ignoring the debounce delay."""
+        keys = list(self._pending)
+        await self._ingest_keys(keys)
+
+    async def close(self):
+        if self._worker is not None:
+            # 워커를 취소하면 이미 _pending에서 꺼낸 세션이 저장되지 않으므로,
+            # 진행 중인 저장이 끝나고 워커가 멈출 때까지 기다린 뒤 남은 세션을 저장합니다.
+            self._closing = True
+            self._wakeup.set()
+            try:
+                await self._worker
+            except Exception as e:
+                logger.error(f"Memory ingestion worker failed: {e}", exc_info=True)
+            self._worker = None
+        await self.flush()
+        await asyncio.to_thread(self._watermarks.close)
+
+    def stats(self) -> dict:
+        return {'pending': len(self._pending), **self._stats}
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Condition()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._closing:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            now = time.monotonic()
+            next_due = min(due for _, due in self._pending.values())
+            if next_due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except TimeoutError:
+                    pass
+                continue
+            keys = [key for key, (_, due) in self._pending.items() if due <= now]
+            await self._ingest_keys(keys)
+
+    async def _ingest_keys(self, keys: list[SessionKey]):
+        for key in keys:
+            self._pending.pop(key, None)
+        if self._space is not None:
+            async with self._space:
+                self._space.notify_all()
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def ingest(key: SessionKey):
+            async with semaphore:
+                try:
+                    with stage_timer(key[0], 'memory_ingest'):
+                        await self._ingest(key)
+                except Exception as e:
+                    self._stats['failed'] += 1
+                    logger.error(f"Failed to add session {key[2]} to memory: {e}", exc_info=True)
+
+        await asyncio.gather(*(ingest(key) for key in keys))
+
+    async def _ingest(self, key: SessionKey):
+        app_name, user_id, session_id = key
+        watermark = await asyncio.to_thread(self._watermarks.get, key)
+        config = GetSessionConfig(after_timestamp=watermark) if watermark and self._incremental else None
+        session = await self._session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is None or not session.events:
+            return
+        latest = max(event.timestamp for event in session.events)
+        new_events = [
+            event for event in session.events
+            if (watermark is None or event.timestamp > watermark) and _has_content(event)
+        ]
+        if not new_events:
+            logger.debug(f"Session {session_id} has no new content to save to memory. Skipping.")
+            return
+        if self._incremental:
+            session.events = new_events
+        await self._memory_service.add_session_to_memory(session)
+        await asyncio.to_thread(self._watermarks.set, key, latest)
+        self._stats['ingested_sessions'] += 1
+        self._stats['ingested_events'] += len(new_events)
@@ -0,0 +1,205 @@
+import glob
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+
+# prometheus_client는 선택 의존성입니다(uv sync --extra metrics). 없으면 아래 함수는 아무 일도 하지 않습니다.
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+# 단계별 소요 시간 히스토그램의 구간(초)입니다.
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# 콜백 사이에 시작 시각을 보관하는 최대 항목 수입니다(오류로 짝이 맞지 않는 항목 정리용).
+_MAX_PENDING_TIMERS = 10000
+
+if prometheus_client is not None:
+    STAGE_SECONDS = prometheus_client.Histogram(
+        'a2adk_stage_seconds',
+        'Time spent in each stage of an agent turn.',
+        ['agent', 'stage', 'tool'],
+        buckets=_LATENCY_BUCKETS,
+    )
+    TOOL_CALLS = prometheus_client.Counter(
+        'a2adk_tool_calls_total', 'Tool calls by result status.', ['agent', 'tool', 'status']
+    )
+    TURNS = prometheus_client.Counter(
+        'a2adk_turns_total', 'Agent turns by outcome.', ['agent', 'outcome']
+    )
+    ADMISSION_RUNNING = prometheus_client.Gauge(
+        'a2adk_admission_running', 'Agent runs holding an admission slot.', multiprocess_mode='livesum'
+    )
+    ADMISSION_WAITING = prometheus_client.Gauge(
+        'a2adk_admission_waiting', 'Requests waiting for an admission slot.', multiprocess_mode='livesum'
+    )
+    ADMISSION_REJECTED = prometheus_client.Counter(
+        'a2adk_admission_rejected_total', 'Requests rejected by admission control.', ['reason']
+    )
+    A2A_CALLS = prometheus_client.Counter(
+        'a2adk_a2a_calls_total',
+        'Remote A2A agent calls by event (requests, failures, circuit_rejected, hedges_sent, hedges_won).',
+        ['endpoint', 'event'],
+    )
+    A2A_TASK_WAIT = prometheus_client.Counter(
+        'a2adk_a2a_task_wait_total',
+        'Waiting on remote A2A tasks: get_task polls, polls avoided versus fixed-interval polling, subscriptions.',
+        ['kind'],
+    )
+    MAILBOX_WAITING = prometheus_client.Gauge(
+        'a2adk_mailbox_waiting', 'Messages waiting for an earlier turn of the same context.', ['agent'],
+        multiprocess_mode='livesum',
+    )
+
+# (invocation_id, agent) 또는 function_call_id -> 시작 시각(perf_counter)
+_timers: OrderedDict[Any, float] = OrderedDict()
+
+
+def metrics_enabled() -> bool:
+    return prometheus_client is not None
+
+
+def observe_stage(agent: str, stage: str, seconds: float, tool: str = ''):
+    if prometheus_client is not None:
+        STAGE_SECONDS.labels(agent, stage, tool).observe(seconds)
+
+
+@contextmanager
+def stage_timer(agent: str, stage: str, tool: str = ''):
+    """Observe the duration of the `with` body as `stage`, also when it raises."""
+    if prometheus_client is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(agent, stage, tool).observe(time.perf_counter() - started)
+
+
+def count_turn(agent: str, outcome: str):
+    if prometheus_client is not None:
+        TURNS.labels(agent, outcome).inc()
+
+
+def set_admission(running: int, waiting: int):
+    if prometheus_client is not None:
+        ADMISSION_RUNNING.set(running)
+        ADMISSION_WAITING.set(waiting)
+
+
+def count_admission_rejected(reason: str):
+    if prometheus_client is not None:
+        ADMISSION_REJECTED.labels(reason).inc()
+
+
+def count_a2a_call(endpoint: str, event: str):
+    if prometheus_client is not None:
+        A2A_CALLS.labels(endpoint, event).inc()
+
+
+def count_a2a_task_wait(kind: str, amount: int = 1):
+    if prometheus_client is not None and amount:
+        A2A_TASK_WAIT.labels(kind).inc(amount)
+
+
+def add_mailbox_waiting(agent: str, delta: int):
+    if prometheus_client is not None:
+        MAILBOX_WAITING.labels(agent).inc(delta)
+
+
+def _start_timer(key: Any):
+    _timers[key] = time.perf_counter()
+    if len(_timers) > _MAX_PENDING_TIMERS:
+        _timers.popitem(last=False)
+
+
+def _stop_timer(key: Any) -> Optional[float]:
+    started = _timers.pop(key, None)
+    return time.perf_counter() - started if started is not None else None
+
+
+def _before_model(callback_context, llm_request):
+    _start_timer((callback_context.invocation_id, callback_context.agent_name))
+
+
+def _after_model(callback_context, llm_response):
+    # 스트리밍 중 부분 응답에서는 시간을 재지 않고, 마지막 응답에서 모델 호출 전체 시간을 기록합니다.
+    if llm_response.partial:
+        return None
+    seconds = _stop_timer((callback_context.invocation_id, callback_context.agent_name))
+    if seconds is not None:
+        observe_stage(callback_context.agent_name, 'model', seconds)
+    return None
+
+
+def _before_tool(tool, args, tool_context):
+    _start_timer(tool_context.function_call_id)
+
+
+def _after_tool(tool, args, tool_context, tool_response):
+    seconds = _stop_timer(tool_context.function_call_id)
+    if seconds is not None:
+        observe_stage(tool_context.agent_name, 'tool', seconds, tool.name)
+    failed = isinstance(tool_response, dict) and (
+        tool_response.get('status') == 'error' or 'error' in tool_response
+    )
+    TOOL_CALLS.labels(tool_context.agent_name, tool.name, 'error' if failed else 'ok').inc()
+    return None
+
+
+def _prepend(callbacks, callback):
+    if not callbacks:
+        return [callback]
+    if not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    return callbacks if callback in callbacks else [callback, *callbacks]
+
+
+def instrument_agent(agent: BaseAgent):
+    """Add timing callbacks for model and tool calls to the agent tree. Idempotent."""
+    if prometheus_client is None:
+        return
+    if isinstance(agent, LlmAgent):
+        agent.before_model_callback = _prepend(agent.before_model_callback, _before_model)
+        agent.after_model_callback = _prepend(agent.after_model_callback, _after_model)
+        agent.before_tool_callback = _prepend(agent.before_tool_callback, _before_tool)
+        agent.after_tool_callback = _prepend(agent.after_tool_callback, _after_tool)
+    for sub_agent in agent.sub_agents:
+        instrument_agent(sub_agent)
+
+
+def prepare_multiprocess_dir(path: str):
+    """Use `path` for multi-process metrics of the workers started after this call.
+
+    Each worker writes its samples there, so `/metrics` on any worker reports
+    the sum over all workers.
+    """
+    if prometheus_client is None:
+        return
+    os.makedirs(path, exist_ok=True)
+    # 이전 실행의 값이 합산되지 않도록 지웁니다.
+    for filename in glob.glob(os.path.join(path, '*.db')):
+        os.remove(filename)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = path
+
+
+async def mark_worker_dead():
+    """Drop this worker's live gauges from the multi-process view; called on shutdown."""
+    if prometheus_client is not None and os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition text of all metrics and its content type."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
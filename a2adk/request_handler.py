@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from a2a.server.context import ServerCallContext
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import JSONRPCError, MessageSendParams
+from a2a.utils.errors import ServerError
+
+from a2adk.admission import AdmissionController, AdmissionRejected
+
+logger = logging.getLogger(__name__)
+
+# 스트리밍 요청의 클라이언트 연결이 끊기면 실행 중인 작업을 취소합니다.
+A2A_CANCEL_ON_DISCONNECT = (os.getenv("A2A_CANCEL_ON_DISCONNECT") or "").upper() in ("1", "TRUE")
+
+# 서버가 바빠 요청을 거절할 때의 JSON-RPC 오류 코드입니다(구현 정의 서버 오류 범위).
+SERVER_BUSY_ERROR_CODE = -32029
+
+
+class ADKRequestHandler(DefaultRequestHandler):
+    """DefaultRequestHandler with the server-side policies of this template.
+
+    - `cancel_on_disconnect`: when the request consuming a task's events is
+      cancelled (e.g. the client of a `message/stream` call disconnects),
+      cancel the agent run instead of letting it finish unobserved.
+    - `admission`: limits concurrent `message/send` and `message/stream`
+      runs, globally and per user (or per contextId for anonymous callers).
+      Rejected requests get a JSON-RPC error with `data.retryAfter` seconds.
+      The wait is observed under `agent_name`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        cancel_on_disconnect: bool = A2A_CANCEL_ON_DISCONNECT,
+        admission: Optional[AdmissionController] = None,
+        agent_name: str = '',
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._cancel_on_disconnect = cancel_on_disconnect
+        self.admission = admission if admission is not None else AdmissionController()
+        self._agent_name = agent_name
+
+    async def on_message_send(self, params: MessageSendParams, context: ServerCallContext | None = None):
+        async with self._admit(params, context):
+            return await super().on_message_send(params, context)
+
+    async def on_message_send_stream(
+        self, params: MessageSendParams, context: ServerCallContext | None = None
+    ) -> AsyncGenerator:
+        async with self._admit(params, context):
+            async for event in super().on_message_send_stream(params, context):
+                yield event
+
+    @asynccontextmanager
+    async def _admit(self, params: MessageSendParams, context: ServerCallContext | None):
+        if context is not None and context.user.is_authenticated:
+            key = ('user', context.user.user_name)
+        elif params.message.contextId:
+            key = ('context', params.message.contextId)
+        else:
+            key = None
+        try:
+            async with self.admission.admit(key, self._agent_name):
+                yield
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected request: {e.reason} (retry after {e.retry_after}s)")
+            raise ServerError(
+                error=JSONRPCError(
+                    code=SERVER_BUSY_ERROR_CODE,
+                    message=f'Server busy: {e.reason}',
+                    data={'retryAfter': e.retry_after},
+                )
+            ) from None
+
+    async def _cleanup_producer(self, producer_task: asyncio.Task, task_id: str) -> None:
+        current = asyncio.current_task()
+        if (
+            self._cancel_on_disconnect
+            and not producer_task.done()
+            and current is not None
+            and current.cancelling()
+        ):
+            logger.info(f"Client disconnected, cancelling task {task_id}")
+            producer_task.cancel()
+        await super()._cleanup_producer(producer_task, task_id)
+
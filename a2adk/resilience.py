@@ -0,0 +1,135 @@
+import time
+from collections import deque
+
+
+class LatencyTracker:
+    """Sliding window of request latencies for one endpoint."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        """Return the p-th quantile (0 < p < 1), or None until enough samples are recorded."""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        return {
+            'samples': len(self._samples),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f'Circuit open for {endpoint}, retry in {retry_after:.1f}s')
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed    -> calls pass; `failure_threshold` consecutive failures open it.
+    open      -> calls fail fast until `recovery_timeout` has elapsed.
+    half_open -> one trial call passes; success closes, failure re-opens.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self._endpoint = endpoint
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return
+        self._rejected += 1
+        retry_after = max(0.0, self._recovery_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self._endpoint, retry_after)
+
+    def record_success(self):
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                self._times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self):
+        """Forget an in-flight call that ended without a result, e.g. cancelled."""
+        self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._consecutive_failures,
+            'times_opened': self._times_opened,
+            'rejected': self._rejected,
+        }
+
+
+_latency_trackers: dict[str, LatencyTracker] = {}
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_latency_tracker(endpoint: str) -> LatencyTracker:
+    tracker = _latency_trackers.get(endpoint)
+    if tracker is None:
+        tracker = _latency_trackers[endpoint] = LatencyTracker()
+    return tracker
+
+
+def peek_circuit_breaker(endpoint: str) -> CircuitBreaker | None:
+    """Return the breaker of `endpoint` if a tool has created one."""
+    return _circuit_breakers.get(endpoint)
+
+
+def get_circuit_breaker(endpoint: str, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the breaker shared by every tool that talks to `endpoint`.
+
+    The thresholds of the first caller win; later callers share that breaker.
+    """
+    breaker = _circuit_breakers.get(endpoint)
+    if breaker is None:
+        breaker = _circuit_breakers[endpoint] = CircuitBreaker(
+            endpoint, failure_threshold=failure_threshold, recovery_timeout=recovery_timeout
+        )
+    return breaker
@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from google.genai import types
+
+from a2adk.utils import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 같은 질문에 대한 응답을 재사용합니다. 기본값은 사용하지 않음입니다.
+RESPONSE_CACHE = (os.getenv("RESPONSE_CACHE") or "").upper() in ("1", "TRUE")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL") or 300.0)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES") or 1000)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES") or 16 * 1024 * 1024)
+# 워커 간에 공유하는 디스크 캐시 경로입니다. 빈 값이면 메모리 캐시만 사용합니다.
+RESPONSE_CACHE_DISK = os.getenv("RESPONSE_CACHE_DISK", get_data_path("response_cache.db"))
+RESPONSE_CACHE_DISK_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_DISK_MAX_ENTRIES") or 10000)
+# 캐시 키에 포함할 세션 상태 키 목록입니다(쉼표 구분). 예: user:city,user:language
+RESPONSE_CACHE_STATE_KEYS = [
+    key.strip() for key in (os.getenv("RESPONSE_CACHE_STATE_KEYS") or "").split(",") if key.strip()
+]
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s?!.。？！]+$')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a prompt so trivially different phrasings share a cache entry."""
+    text = _WHITESPACE.sub(' ', text.strip().lower())
+    return _TRAILING_PUNCTUATION.sub('', text)
+
+
+def response_cache_key(
+    agent_name: str, content: types.Content, state: dict[str, Any], state_keys: list[str]
+) -> Optional[str]:
+    """Return the cache key of a user message, or None if it cannot be cached.
+
+    Only text messages are cached; files and other part types are not.
+    """
+    if not content.parts:
+        return None
+    texts = []
+    for part in content.parts:
+        if part.text is None or part.inline_data or part.file_data:
+            return None
+        texts.append(normalize_text(part.text))
+    key = json.dumps(
+        [agent_name, texts, {k: state.get(k) for k in state_keys}],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class _DiskCache:
+    """SQLite (WAL) table of cached responses shared by the workers of a host."""
+
+    def __init__(self, db_path: str, max_entries: int):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+
+    def get(self, key: str) -> Optional[tuple[str, float]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM response_cache WHERE key=? AND expires_at>?', (key, now)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute('UPDATE response_cache SET last_access=? WHERE key=?', (now, key))
+        return row
+
+    def put(self, key: str, value: str, expires_at: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO response_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, value, expires_at, now),
+            )
+            self._writes += 1
+            # 쓰기 100번마다 만료 항목과 오래 사용하지 않은 항목을 정리합니다.
+            if self._writes % 100 == 0:
+                self._conn.execute('DELETE FROM response_cache WHERE expires_at<=?', (now,))
+                self._conn.execute(
+                    'DELETE FROM response_cache WHERE key IN ('
+                    'SELECT key FROM response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                    (self._max_entries,),
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """Two-level (memory LRU + shared SQLite) cache of final agent responses.
+
+    Values are the serialized `types.Content` of the final response. Memory
+    entries are evicted by TTL, entry count and total size; disk hits are
+    promoted into memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = RESPONSE_CACHE_TTL,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        disk_path: Optional[str] = RESPONSE_CACHE_DISK,
+        disk_max_entries: int = RESPONSE_CACHE_DISK_MAX_ENTRIES,
+        state_keys: list[str] = RESPONSE_CACHE_STATE_KEYS,
+    ):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self.state_keys = state_keys
+        # key -> (expires_at(epoch), value)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._bytes = 0
+        self._disk = _DiskCache(disk_path, disk_max_entries) if disk_path else None
+        self._stats: Counter = Counter()
+
+    async def get(self, key: str) -> Optional[types.Content]:
+        """Return the cached response, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return types.Content.model_validate_json(entry[1])
+            self._remove(key)
+        if self._disk is not None:
+            row = await asyncio.to_thread(self._disk.get, key)
+            if row is not None:
+                value, expires_at = row
+                self._store(key, value, expires_at)
+                self._stats['hits'] += 1
+                self._stats['disk_hits'] += 1
+                return types.Content.model_validate_json(value)
+        self._stats['misses'] += 1
+        return None
+
+    async def put(self, key: str, content: types.Content):
+        """Cache a final response."""
+        value = content.model_dump_json(exclude_none=True)
+        expires_at = time.time() + self._ttl
+        self._store(key, value, expires_at)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, key, value, expires_at)
+        self._stats['stores'] += 1
+
+    async def close(self):
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.close)
+
+    def stats(self) -> dict:
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hit_ratio': round(self._stats['hits'] / lookups, 3) if lookups else None,
+            **self._stats,
+        }
+
+    def _store(self, key: str, value: str, expires_at: float):
+        if key in self._entries:
+            self._remove(key)
+        size = len(value)
+        if size > self._max_bytes:
+            return
+        self._entries[key] = (expires_at, value)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats['evictions'] += 1
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
@@ -1,25 +1,57 @@
+import importlib
+import os
+
 from starlette.routing import Route
-from a2adk.routes.bucket import get_bucket_file
-from a2adk.routes.session import list_sessions, get_session_messages
+
+from a2adk.startup import startup_report
+
+# (경로, "모듈:함수", 메서드, 이름, 사용 여부). 사용하지 않는 라우트의 모듈은 import하지 않습니다.
+ROUTES = [
+    (
+        "/buckets/{filepath:path}",
+        "a2adk.routes.bucket:get_bucket_file",
+        ["GET"],
+        'get_bucket_file',
+        lambda: bool(os.getenv("GCS_BUCKET")),
+    ),
+    (
+        "/apps/{app_name:path}/users/{user_id:path}/sessions/{session_id:path}/messages",
+        "a2adk.routes.session:get_session_messages",
+        ["GET"],
+        'get_session_messages',
+        None,
+    ),
+    (
+        "/apps/{app_name:path}/users/{user_id:path}/sessions",
+        "a2adk.routes.session:list_sessions",
+        ["GET"],
+        'list_sessions',
+        None,
+    ),
+    (
+        "/stats",
+        "a2adk.routes.stats:get_stats",
+        ["GET"],
+        'get_stats',
+        None,
+    ),
+    (
+        "/metrics",
+        "a2adk.routes.metrics:get_metrics",
+        ["GET"],
+        'get_metrics',
+        None,
+    ),
+]
+
 
 def get_routes():
-    return [
-        Route(
-              "/buckets/{filepath:path}", 
-              get_bucket_file, 
-              methods=["GET"],
-              name='get_bucket_file'
-              ),
-        Route(
-              "/apps/{app_name:path}/users/{user_id:path}/sessions/{session_id:path}/messages", 
-              get_session_messages, 
-              methods=["GET"], 
-              name='get_session_messages'
-              ),
-        Route(
-              "/apps/{app_name:path}/users/{user_id:path}/sessions", 
-              list_sessions, 
-              methods=["GET"], 
-              name='list_sessions'
-              ),
-    ]
\ No newline at end of file
+    routes = []
+    for path, endpoint, methods, name, enabled in ROUTES:
+        if enabled is not None and not enabled():
+            continue
+        module_name, function_name = endpoint.split(':')
+        with startup_report.stage(f'route:{name}', 'import'):
+            module = importlib.import_module(module_name)
+        routes.append(Route(path, getattr(module, function_name), methods=methods, name=name))
+    return routes
@@ -1,34 +1,243 @@
+import asyncio
+import logging
+import mimetypes
 import os
-from starlette.responses import StreamingResponse
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import urlparse
+
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, Response, StreamingResponse
 from starlette.requests import Request
 from starlette.exceptions import HTTPException
 
-from google.cloud import storage
+from a2adk.blob_cache import BlobCache
+from a2adk.utils import get_data_path
+
+logger = logging.getLogger(__name__)
 
 # 환경 변수에서 GCP 프로젝트와 버킷 이름을 가져옵니다.
+# GCS_BUCKET=file:///path/to/dir 로 설정하면 로컬 디렉터리를 버킷 대신 사용합니다(개발/테스트용).
+# GCS 에뮬레이터는 STORAGE_EMULATOR_HOST 환경 변수로 지정합니다.
 GCP_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
 GCS_BUCKET = os.getenv("GCS_BUCKET")
+# 자주 요청되는 파일을 보관하는 로컬 디스크 캐시입니다.
+GCS_BLOB_CACHE_DIR = os.getenv("GCS_BLOB_CACHE_DIR")
+# 캐시의 최대 크기(바이트)입니다. 0이면 캐시를 사용하지 않습니다.
+GCS_BLOB_CACHE_MAX_BYTES = int(os.getenv("GCS_BLOB_CACHE_MAX_BYTES") or 512 * 1024 * 1024)
+GCS_BLOB_CACHE_MAX_ENTRY_BYTES = int(os.getenv("GCS_BLOB_CACHE_MAX_ENTRY_BYTES") or 0) or None
+GCS_STREAM_CHUNK_SIZE = 256 * 1024
+
+
+class LocalBlob:
+    """Filesystem file exposing the subset of `storage.Blob` used by this route."""
+
+    def __init__(self, name: str, path: str):
+        stat = os.stat(path)
+        self.name = name
+        self.local_path = path
+        self.size = stat.st_size
+        self.generation = stat.st_mtime_ns
+        self.etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+        self.updated = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        self.content_type = None
+
+    def open(self, mode: str = 'rb', chunk_size: int | None = None):
+        return open(self.local_path, mode)
+
+    def download_to_filename(self, filename: str):
+        with open(self.local_path, 'rb') as src, open(filename, 'wb') as dst:
+            while chunk := src.read(GCS_STREAM_CHUNK_SIZE):
+                dst.write(chunk)
+
+
+class LocalBucket:
+    """Directory standing in for a GCS bucket (GCS_BUCKET=file:///path)."""
+
+    def __init__(self, root: str):
+        self._root = os.path.realpath(root)
+
+    def get_blob(self, name: str) -> LocalBlob | None:
+        path = os.path.realpath(os.path.join(self._root, name))
+        # 버킷 디렉터리 밖의 파일에 접근하지 못하도록 합니다.
+        if os.path.commonpath([self._root, path]) != self._root or not os.path.isfile(path):
+            return None
+        return LocalBlob(name, path)
+
+
+_bucket = None
+_bucket_lock = threading.Lock()
+_blob_cache = None
+_cache_fills: set[tuple[str, object]] = set()
+_cache_fills_lock = threading.Lock()
+
+
+def get_bucket():
+    """Return the bucket shared by all requests, creating the storage client once."""
+    global _bucket
+    if _bucket is None:
+        if not GCS_BUCKET:
+            raise RuntimeError("GCS_BUCKET 환경 변수가 설정되어 있지 않습니다.")
+        with _bucket_lock:
+            if _bucket is None:
+                if GCS_BUCKET.startswith('file://'):
+                    _bucket = LocalBucket(urlparse(GCS_BUCKET).path)
+                else:
+                    from google.cloud import storage
+                    client = storage.Client(project=GCP_PROJECT) if GCP_PROJECT else storage.Client()
+                    _bucket = client.bucket(GCS_BUCKET)
+    return _bucket
+
+
+def get_blob_cache() -> BlobCache | None:
+    global _blob_cache
+    if _blob_cache is None and GCS_BLOB_CACHE_MAX_BYTES > 0:
+        _blob_cache = BlobCache(
+            GCS_BLOB_CACHE_DIR or get_data_path("blob_cache"),
+            GCS_BLOB_CACHE_MAX_BYTES,
+            GCS_BLOB_CACHE_MAX_ENTRY_BYTES,
+        )
+    return _blob_cache
+
+
+def _fill_cache(cache: BlobCache, blob):
+    key = (blob.name, blob.generation)
+    with _cache_fills_lock:
+        if key in _cache_fills:
+            return
+        _cache_fills.add(key)
+    try:
+        if cache.get(blob.name, blob.generation) is None:
+            cache.put(blob.name, blob.generation, blob.download_to_filename)
+    except Exception as e:
+        # 캐시 적재 실패는 응답에 영향을 주지 않습니다.
+        logger.warning(f"Failed to cache blob {blob.name}: {e}")
+    finally:
+        with _cache_fills_lock:
+            _cache_fills.discard(key)
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None when the header should be ignored (multiple ranges or an
+    unknown unit) and raises HTTPException(416) when it cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start, _, end = spec.strip().partition('-')
+    try:
+        if not start:
+            # bytes=-N : 마지막 N바이트
+            length = int(end)
+            if length <= 0:
+                raise ValueError
+            return max(0, size - length), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _not_modified(request: Request, etag: str, updated: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated is not None:
+        try:
+            return updated.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _iter_blob(blob, start: int, length: int):
+    # 동기 제너레이터이므로 StreamingResponse가 스레드풀에서 실행합니다.
+    with blob.open("rb", chunk_size=GCS_STREAM_CHUNK_SIZE) as stream:
+        if start:
+            stream.seek(start)
+        while length > 0:
+            chunk = stream.read(min(GCS_STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
 
-if not GCS_BUCKET:
-    raise RuntimeError("GCS_BUCKET 환경 변수가 설정되어 있지 않습니다.")
 
 async def get_bucket_file(request: Request):
     '''
     GCP Object Storage(GCS)에서 파일을 읽어 제공하는 엔드포인트
     example: http://localhost:9999/buckets/goog-10-k-2024.pdf#page=11
+
+    Range 요청(206), 조건부 요청(304)을 지원하며 자주 요청되는 파일은 로컬 디스크 캐시에서 제공합니다.
     '''
     filepath = request.path_params["filepath"]
     try:
-        client = storage.Client(project=GCP_PROJECT) if GCP_PROJECT else storage.Client()
-        bucket = client.bucket(GCS_BUCKET)
-        blob = bucket.blob(filepath)
-        if not blob.exists():
+        bucket = await asyncio.to_thread(get_bucket)
+        # get_blob은 메타데이터를 한 번에 조회하며 파일이 없으면 None을 반환합니다.
+        blob = await asyncio.to_thread(bucket.get_blob, filepath)
+        if blob is None:
             raise HTTPException(status_code=404, detail="File not found in bucket.")
-        stream = blob.open("rb")
+
+        etag = f'"{blob.etag}"'
+        headers = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f'inline; filename="{os.path.basename(filepath)}"',
+        }
+        if blob.updated is not None:
+            headers["Last-Modified"] = format_datetime(blob.updated.astimezone(timezone.utc), usegmt=True)
+        if _not_modified(request, etag, blob.updated):
+            return Response(status_code=304, headers=headers)
+
+        media_type = (
+            blob.content_type
+            or mimetypes.guess_type(filepath)[0]
+            or "application/octet-stream"
+        )
+
+        # 로컬 파일은 FileResponse로 바로 보냅니다. Range 처리는 Starlette가 담당하며,
+        # uvicorn이 http.response.pathsend를 지원하지 않으므로 파일은 청크 단위로 읽어 보냅니다.
+        local_path = getattr(blob, 'local_path', None)
+        cache = get_blob_cache()
+        if local_path is None and cache is not None and cache.accepts(blob.size):
+            local_path = await asyncio.to_thread(cache.get, blob.name, blob.generation)
+        if local_path is not None:
+            return FileResponse(local_path, headers=headers, media_type=media_type)
+
+        background = None
+        if cache is not None and cache.accepts(blob.size):
+            background = BackgroundTask(_fill_cache, cache, blob)
+
+        size = blob.size
+        byte_range = None
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range in (etag, headers.get("Last-Modified"))):
+            byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            headers["Content-Length"] = str(size)
+            return StreamingResponse(
+                _iter_blob(blob, 0, size), media_type=media_type, headers=headers, background=background
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
         return StreamingResponse(
-            stream,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="{os.path.basename(filepath)}"'}
+            _iter_blob(blob, start, end - start + 1),
+            status_code=206,
+            media_type=media_type,
+            headers=headers,
+            background=background,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
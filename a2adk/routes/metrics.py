@@ -0,0 +1,16 @@
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.exceptions import HTTPException
+
+from a2adk.metrics import metrics_enabled, render_metrics
+
+
+async def get_metrics(request: Request):
+    """
+    Prometheus 형식의 지표를 반환합니다.
+    여러 워커로 실행하면 모든 워커의 값을 합산합니다.
+    """
+    if not metrics_enabled():
+        raise HTTPException(status_code=501, detail="prometheus_client is not installed (uv sync --extra metrics).")
+    data, content_type = render_metrics()
+    return Response(data, media_type=content_type)
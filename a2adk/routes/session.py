@@ -1,46 +1,89 @@
+import hashlib
 import json
-from starlette.responses import Response
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from starlette.responses import Response, StreamingResponse
 from starlette.requests import Request
 from starlette.exceptions import HTTPException
 
-from google.adk.sessions.base_session_service import BaseSessionService
+from google.adk.sessions.base_session_service import BaseSessionService, GetSessionConfig
+
+from a2adk.sessions import SessionSummaryIndex
+from a2adk.sessions.summary_index import decode_cursor, encode_cursor
+
+SESSION_LIST_LIMIT = int(os.getenv("SESSION_LIST_LIMIT") or 5)
+SESSION_LIST_MAX_LIMIT = int(os.getenv("SESSION_LIST_MAX_LIMIT") or 100)
 
 async def list_sessions(request: Request):
     """
-    지정된 앱과 사용자에 대한 모든 세션의 목록을 반환합니다.
+    지정된 앱과 사용자에 대한 세션 목록을 최근 업데이트 순으로 반환합니다.
+    세션 요약 인덱스에서 한 번의 쿼리로 읽으며, 전체 대화 이력은 불러오지 않습니다.
+    query params:
+      - limit: 한 페이지의 세션 수 (기본값 SESSION_LIST_LIMIT)
+      - cursor: 이전 응답의 next_cursor
     """
     session_service = request.app.state.session_service
     if not isinstance(session_service, BaseSessionService):
         raise HTTPException(status_code=500, detail="Session service is not available.")
+    session_index = getattr(request.app.state, "session_index", None)
+    if not isinstance(session_index, SessionSummaryIndex):
+        raise HTTPException(status_code=500, detail="Session index is not available.")
     
     app_name = request.path_params["app_name"]
     user_id = request.path_params["user_id"]
-    
-    sessions_response = await session_service.list_sessions(app_name=app_name, user_id=user_id)
-    sessions_data = sessions_response.model_dump(mode='json')
-    if "sessions" in sessions_data and isinstance(sessions_data["sessions"], list):
-        all_sessions = sessions_data["sessions"]
-        sorted_sessions = sorted(all_sessions, key=lambda s: s.get("last_update_time", 0), reverse=True)
-        limited_sessions = []
-        for session in sorted_sessions[:5]:
-            session_response = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session["id"])
-            session_data = session_response.model_dump(mode='json')
-            if "events" in session_data and isinstance(session_data["events"], list):
-                user_events = [event for event in session_data["events"] if event.get("content", {}).get("role") == "user"]
-                user_events.sort(key=lambda e: e.get("timestamp", 0), reverse=True)                # 최신 5개의 'user' 이벤트만 유지
-                latest_user_events = user_events[:5]
-                session_data["events"] = latest_user_events
-            limited_sessions.append(session_data)
-        sessions_data["sessions"] = limited_sessions
-        
+    try:
+        limit = int(request.query_params.get("limit") or SESSION_LIST_LIMIT)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="limit must be an integer.")
+    limit = max(1, min(limit, SESSION_LIST_MAX_LIMIT))
+    cursor = request.query_params.get("cursor")
+
+    # 다른 워커/호스트가 만들거나 바꾼 세션을 반영하고 더 이상 없는 세션은 뺍니다(첫 페이지에서만).
+    if not cursor:
+        await session_index.reconcile(session_service, app_name, user_id)
+    try:
+        sessions, next_cursor = await session_index.list_summaries(app_name, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return Response(
-        content=json.dumps(sessions_data),
+        content=json.dumps({"sessions": sessions, "next_cursor": next_cursor}),
         media_type="application/json"
     )
 
+def _event_to_message(event) -> dict | None:
+    """세션 이벤트를 프론트엔드 메시지 형식으로 변환합니다. 텍스트가 없는 이벤트는 None을 반환합니다."""
+    if not event.content or not event.content.parts:
+        return None
+    parts = [{'type': 'text', 'text': part.text} for part in event.content.parts if part.text]
+    if not parts:
+        return None
+    return {
+        'messageId': event.id,
+        'role': 'user' if event.content.role == 'user' else 'agent',
+        'timestamp': event.timestamp,
+        'parts': parts,
+    }
+
+def _parse_float(request: Request, name: str) -> float | None:
+    value = request.query_params.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a number.")
+
 async def get_session_messages(request: Request):
     """
     지정된 앱과 사용자에 대한 세션의 메시지를 반환합니다.
+    query params:
+      - since: 이 timestamp 이후(초과)의 메시지만 반환
+      - cursor: 이전 응답의 X-Next-Cursor 헤더 값 (since 대신 사용)
+      - last: 최근 N개 이벤트만 조회
+      - limit: 한 번에 반환할 최대 메시지 수
+      - format=ndjson (또는 Accept: application/x-ndjson): 한 줄에 메시지 하나씩 스트리밍
+    세션이 바뀌지 않았다면 ETag/Last-Modified 조건부 요청에 304를 반환합니다.
     """
     session_service = request.app.state.session_service
     if not isinstance(session_service, BaseSessionService):
@@ -49,32 +92,77 @@ async def get_session_messages(request: Request):
     app_name = request.path_params["app_name"]
     user_id = request.path_params["user_id"]
     session_id = request.path_params["session_id"]
-    
-    session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    since = _parse_float(request, "since")
+    last = _parse_float(request, "last")
+    limit = _parse_float(request, "limit")
+    cursor = request.query_params.get("cursor")
+    after_event_id = None
+    if cursor:
+        try:
+            since, after_event_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    ndjson = request.query_params.get("format") == "ndjson" or "application/x-ndjson" in request.headers.get("accept", "")
+
+    # 요약 인덱스의 버전(이벤트 수, 마지막 업데이트 시각)으로 세션을 읽기 전에 변경 여부를 판단합니다.
+    headers = {}
+    session_index = getattr(request.app.state, "session_index", None)
+    summary = None
+    if isinstance(session_index, SessionSummaryIndex):
+        summary = await session_index.get(app_name, user_id, session_id)
+    if summary is not None:
+        version = f"{session_id}:{summary['event_count']}:{summary['last_update_time']}:{request.url.query}:{ndjson}"
+        etag = '"' + hashlib.sha1(version.encode("utf-8")).hexdigest() + '"'
+        last_modified = formatdate(summary['last_update_time'], usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                return Response(status_code=304, headers=headers)
+        elif request.headers.get("if-modified-since"):
+            try:
+                if_modified_since = parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+            except (TypeError, ValueError):
+                if_modified_since = None
+            if if_modified_since is not None and int(summary['last_update_time']) <= if_modified_since:
+                return Response(status_code=304, headers=headers)
+
+    config = None
+    if since is not None or last is not None:
+        config = GetSessionConfig(after_timestamp=since, num_recent_events=int(last) if last else None)
+    session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found.")
+
+    events = session.events
+    if since is not None:
+        if after_event_id is not None:
+            # 같은 timestamp의 이벤트 중 커서 이벤트까지는 이미 전달되었습니다.
+            for i, event in enumerate(events):
+                if event.id == after_event_id:
+                    events = events[i + 1:]
+                    break
+            events = [event for event in events if event.timestamp >= since]
+        else:
+            events = [event for event in events if event.timestamp > since]
     messages = []
-    for event in session.events:
-        if event.content.parts[0].text:
-            # Construct the base message dictionary
-            base_message = {
-                'messageId': event.id,
-                'role': 'user' if event.content.role == 'user' else 'agent',
-                'timestamp': event.timestamp,
-                'parts': []
-            }
+    for event in events:
+        message = _event_to_message(event)
+        if message:
+            messages.append(message)
+    if limit is not None and len(messages) > int(limit):
+        messages = messages[:int(limit)]
+        headers["X-Next-Cursor"] = encode_cursor(messages[-1]['timestamp'], messages[-1]['messageId'])
+
+    if ndjson:
+        async def generate():
+            for message in messages:
+                yield json.dumps(message) + "\n"
+        return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
 
-            # Iterate over parts and add them to the message
-            for part in event.content.parts:
-                if hasattr(part, 'text'):
-                    base_message['parts'].append({'type': 'text', 'text': part.text})
-                else:
-                    # Fallback for unknown part types
-                    base_message['parts'].append({'type': 'unknown', 'content': str(part)})
-            
-            # Add message to messages list if it has parts
-            if base_message['parts']:
-                messages.append(base_message)
-            
     return Response(
         content=json.dumps(messages),
-        media_type="application/json"
-    )
\ No newline at end of file
+        media_type="application/json",
+        headers=headers,
+    )
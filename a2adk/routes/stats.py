@@ -0,0 +1,41 @@
+import sys
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.exceptions import HTTPException
+
+from a2adk.agents.tool_cache import tool_cache_stats
+from a2adk.startup import startup_report
+
+
+async def get_stats(request: Request):
+    """
+    응답 캐시와 도구별 캐시의 통계(적중/실패 횟수, 절약한 시간 등), 원격 A2A 에이전트별 호출/서킷 브레이커/지연 시간 통계와
+    실행 대기열 상태(실행/대기 수, 대기 시간, 거절 수), 대화별 메시지 대기열 길이, 워커 시작 단계별 소요 시간을 반환합니다.
+    여러 에이전트 모드에서는 에이전트별 로드 상태, 세션 캐시/압축, 메모리 검색 캐시와 메모리 저장 대기열을 사용하면 그 통계도 반환합니다.
+    비활성화된 항목은 null로 표시됩니다.
+    """
+    agent_executor = getattr(request.app.state, "agent_executor", None)
+    agent_host = getattr(request.app.state, "agent_host", None)
+    if agent_executor is None and agent_host is None:
+        raise HTTPException(status_code=500, detail="Agent executor is not available.")
+    admission = getattr(request.app.state, "admission", None)
+    session_compaction = getattr(request.app.state, "session_compaction", None)
+    session_cache = getattr(request.app.state, "session_cache", None)
+    memory_cache = getattr(request.app.state, "memory_cache", None)
+    # 원격 A2A 도구를 쓰는 에이전트가 로드되지 않았다면 모듈을 import하지 않습니다.
+    a2atool = sys.modules.get("a2adk.a2atool")
+    return JSONResponse({
+        "response_cache": (agent_host or agent_executor).response_cache_stats(),
+        "agents": agent_host.stats() if agent_host is not None else None,
+        "tools": tool_cache_stats(),
+        "a2a_tools": a2atool.a2a_tool_stats() if a2atool is not None else None,
+        "admission": admission.stats() if admission is not None else None,
+        # 여러 에이전트 모드에서는 agents.loaded의 에이전트별 mailbox/memory_ingestion에 있습니다.
+        "mailbox": agent_executor.mailbox_stats() if agent_executor is not None else None,
+        "memory_ingestion": agent_executor.memory_ingestion_stats() if agent_executor is not None else None,
+        "session_cache": session_cache.stats() if session_cache is not None else None,
+        "memory_cache": memory_cache.stats() if memory_cache is not None else None,
+        "session_compaction": session_compaction.stats() if session_compaction is not None else None,
+        "startup": startup_report.summary(),
+    })
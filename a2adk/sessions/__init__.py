@@ -0,0 +1,23 @@
+from a2adk.sessions.cache import (
+    SESSION_CACHE,
+    SESSION_CACHE_INVALIDATION,
+    CachingSessionService,
+    SessionVersions,
+    create_session_versions,
+)
+from a2adk.sessions.compaction import SESSION_COMPACTION, CompactingSessionService
+from a2adk.sessions.sqlite_session_service import SqliteSessionService
+from a2adk.sessions.summary_index import SessionSummaryIndex, SummaryIndexingSessionService
+
+__all__ = [
+    'CachingSessionService',
+    'CompactingSessionService',
+    'SESSION_CACHE',
+    'SESSION_CACHE_INVALIDATION',
+    'SESSION_COMPACTION',
+    'SessionSummaryIndex',
+    'SessionVersions',
+    'SqliteSessionService',
+    'SummaryIndexingSessionService',
+    'create_session_versions',
+]
@@ -0,0 +1,377 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+# 세션 캐시를 켭니다. 읽기는 캐시에서, 이벤트 추가는 캐시와 저장소에 함께 반영합니다.
+SESSION_CACHE = (os.getenv("SESSION_CACHE") or "").lower() in ("1", "true", "yes")
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES") or 1000)
+# 다른 워커의 변경을 알리는 채널입니다. sqlite:///경로 (한 호스트의 워커) 또는 redis://... (여러 호스트).
+SESSION_CACHE_INVALIDATION = os.getenv("SESSION_CACHE_INVALIDATION")
+
+# 앱/사용자 상태(app:, user:)가 바뀌면 해당 범위의 모든 세션을 무효화할 때 쓰는 세션 ID입니다.
+_ANY = '*'
+# 삭제된 세션의 버전입니다.
+_DELETED = -1.0
+
+SessionKey = tuple[str, str, str]
+
+
+class SessionVersions:
+    """Channel telling workers which cached sessions changed elsewhere.
+
+    Writers `publish` a version token of a session (the timestamp of the
+    change) after changing it; `versions` returns the latest known token of a
+    session and the time of the latest app/user-wide state change covering it.
+    """
+
+    async def publish(self, key: SessionKey, version: float):
+        raise NotImplementedError
+
+    async def versions(self, key: SessionKey) -> tuple[Optional[float], float]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class SqliteSessionVersions(SessionVersions):
+    """Session versions in a SQLite (WAL) file shared by the workers of a host.
+
+    Every read is a local point query, so a worker never serves a session
+    that another worker on the host has changed.
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS session_versions ('
+            'app_name TEXT NOT NULL, user_id TEXT NOT NULL, session_id TEXT NOT NULL, version REAL NOT NULL, '
+            'PRIMARY KEY (app_name, user_id, session_id))'
+        )
+
+    async def publish(self, key: SessionKey, version: float):
+        await asyncio.to_thread(self._publish, key, version)
+
+    async def versions(self, key: SessionKey) -> tuple[Optional[float], float]:
+        return await asyncio.to_thread(self._versions, key)
+
+    async def close(self):
+        await asyncio.to_thread(self._conn.close)
+
+    def _publish(self, key: SessionKey, version: float):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO session_versions VALUES (?, ?, ?, ?)', (*key, version))
+
+    def _versions(self, key: SessionKey) -> tuple[Optional[float], float]:
+        app_name, user_id, session_id = key
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT user_id, session_id, version FROM session_versions WHERE app_name=? AND '
+                '((user_id=? AND session_id IN (?, ?)) OR (user_id=? AND session_id=?))',
+                (app_name, user_id, session_id, _ANY, _ANY, _ANY),
+            ).fetchall()
+        version = None
+        scope_changed = 0.0
+        for row_user_id, row_session_id, row_version in rows:
+            if row_session_id == _ANY:
+                scope_changed = max(scope_changed, row_version)
+            elif row_user_id == user_id:
+                version = row_version
+        return version, scope_changed
+
+
+class RedisSessionVersions(SessionVersions):
+    """Session versions announced over Redis pub/sub, for workers on several hosts.
+
+    Each worker keeps the versions it has heard of in memory, so reads need
+    no round trip; changes become visible after the pub/sub delivery delay.
+    """
+
+    _CHANNEL = 'a2adk:session_versions'
+
+    def __init__(self, url: str, max_entries: int = SESSION_CACHE_MAX_ENTRIES * 10):
+        from a2adk.tasks.redis_backend import create_redis_client
+        self._client = create_redis_client(url)
+        self._max_entries = max_entries
+        self._versions: OrderedDict[SessionKey, float] = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, key: SessionKey, version: float):
+        self._start()
+        self._remember(key, version)
+        await self._client.publish(self._CHANNEL, json.dumps([*key, version]))
+
+    async def versions(self, key: SessionKey) -> tuple[Optional[float], float]:
+        self._start()
+        app_name, user_id, _ = key
+        scope_changed = max(
+            self._versions.get((app_name, user_id, _ANY), 0.0),
+            self._versions.get((app_name, _ANY, _ANY), 0.0),
+        )
+        return self._versions.get(key), scope_changed
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        await self._client.aclose()
+
+    def _start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    def _remember(self, key: SessionKey, version: float):
+        self._versions[key] = version
+        self._versions.move_to_end(key)
+        if len(self._versions) > self._max_entries:
+            self._versions.popitem(last=False)
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(self._CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get('type') == 'message':
+                            app_name, user_id, session_id, version = json.loads(message['data'])
+                            self._remember((app_name, user_id, session_id), version)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Session version listener failed, reconnecting: {e}")
+                await asyncio.sleep(1.0)
+
+
+def create_session_versions(url: str) -> SessionVersions:
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        return RedisSessionVersions(url)
+    if url.startswith('sqlite:///'):
+        return SqliteSessionVersions(url.removeprefix('sqlite:///'))
+    raise ValueError(f'Unsupported SESSION_CACHE_INVALIDATION: {url}')
+
+
+class _CachedSession:
+    def __init__(self, session: Session, after: Optional[float], version: Optional[float]):
+        self.session = session
+        # None이면 전체 이력, 아니면 이 timestamp 이후의 이벤트만 보관합니다.
+        self.after = after
+        # 마지막으로 알려진 버전입니다. 채널에 다른 버전이 올라오면 다시 읽습니다.
+        self.version = version
+        self.loaded_at = time.time()
+
+
+class CachingSessionService(BaseSessionService):
+    """Read-through LRU cache in front of any session service.
+
+    Sessions are cached by (app, user, session) and handed out as copies.
+    `append_event` writes through to the wrapped service and then applies
+    the event to the cached copy, so the next turn needs no round trip.
+    Reads with `after_timestamp` or `num_recent_events` are served from a
+    cached copy that covers them.
+
+    Each write publishes a version token for the session (its last update
+    time as set by the wrapped service) on the optional `versions` channel. A hit whose token
+    differs from the latest published one, or that predates an app/user
+    state change, is reloaded.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        *,
+        max_entries: int = SESSION_CACHE_MAX_ENTRIES,
+        versions: Optional[SessionVersions] = None,
+    ):
+        self._session_service = session_service
+        self._max_entries = max_entries
+        self._versions = versions
+        self._entries: OrderedDict[SessionKey, _CachedSession] = OrderedDict()
+        self._stats: Counter = Counter()
+
+    @property
+    def wrapped(self) -> BaseSessionService:
+        return self._session_service
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self._session_service.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._put(key, _CachedSession(self._copy(session), None, session.last_update_time))
+        await self._publish(key, session.last_update_time, state)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        entry = await self._get_fresh(key)
+        if entry is not None and self._covers(entry, config):
+            self._stats['hits'] += 1
+            return self._view(entry, config)
+        self._stats['misses'] += 1
+        # 읽는 도중의 변경을 놓치지 않도록 버전을 먼저 확인합니다.
+        version = (await self._versions.versions(key))[0] if self._versions is not None else None
+        session = await self._session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None and (config is None or not config.num_recent_events):
+            self._put(key, _CachedSession(self._copy(session), config.after_timestamp if config else None, version))
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await self._session_service.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._entries.pop(key, None)
+        await self._session_service.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        await self._publish(key, _DELETED)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        try:
+            event = await self._session_service.append_event(session=session, event=event)
+        except Exception:
+            # 저장소가 거절했다면(예: 오래된 세션) 캐시도 믿을 수 없습니다.
+            self._entries.pop(key, None)
+            raise
+        if event.partial:
+            return event
+        # 저장소가 정한 갱신 시각(예: DatabaseSessionService의 커밋 시각)을 그대로 써야
+        # 다음 턴에 오래된 세션으로 거절되지 않습니다.
+        last_update_time = session.last_update_time
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._apply(entry.session, event, last_update_time)
+            entry.version = last_update_time
+        state_delta = event.actions.state_delta if event.actions else None
+        await self._publish(key, last_update_time, state_delta)
+        return event
+
+    def invalidate(self, app_name: str, user_id: Optional[str] = None, session_id: Optional[str] = None):
+        """Drop cached sessions of an app, a user or one session."""
+        for key in list(self._entries):
+            if key[0] == app_name and user_id in (None, key[1]) and session_id in (None, key[2]):
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        hits = self._stats['hits']
+        total = hits + self._stats['misses']
+        return {
+            'entries': len(self._entries),
+            'hit_ratio': round(hits / total, 3) if total else None,
+            **self._stats,
+        }
+
+    async def close(self):
+        if self._versions is not None:
+            await self._versions.close()
+
+    async def _get_fresh(self, key: SessionKey) -> Optional[_CachedSession]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._versions is not None:
+            version, scope_changed = await self._versions.versions(key)
+            if (version is not None and version != entry.version) or scope_changed > entry.loaded_at:
+                # 다른 워커가 바꾼 세션입니다.
+                self._stats['invalidated'] += 1
+                self._entries.pop(key, None)
+                return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _covers(self, entry: _CachedSession, config: Optional[GetSessionConfig]) -> bool:
+        if entry.after is None:
+            return True
+        if config is None:
+            return False
+        if config.after_timestamp and config.after_timestamp >= entry.after:
+            return True
+        return bool(config.num_recent_events) and len(entry.session.events) >= config.num_recent_events
+
+    def _view(self, entry: _CachedSession, config: Optional[GetSessionConfig]) -> Session:
+        session = self._copy(entry.session)
+        if config is not None:
+            if config.num_recent_events:
+                session.events = session.events[-config.num_recent_events:]
+            if config.after_timestamp:
+                session.events = [event for event in session.events if event.timestamp >= config.after_timestamp]
+        return session
+
+    def _put(self, key: SessionKey, entry: _CachedSession):
+        if self._max_entries <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _copy(self, session: Session) -> Session:
+        # 이벤트는 추가된 뒤 바뀌지 않으므로 목록과 상태만 복사합니다.
+        return session.model_copy(update={'events': list(session.events), 'state': dict(session.state)})
+
+    def _apply(self, session: Session, event: Event, last_update_time: float):
+        session.events.append(event)
+        session.last_update_time = last_update_time
+        if event.actions and event.actions.state_delta:
+            for key, value in event.actions.state_delta.items():
+                if not key.startswith(State.TEMP_PREFIX):
+                    session.state[key] = value
+
+    async def _publish(self, key: SessionKey, version: float, state_delta: Optional[dict[str, Any]] = None):
+        app_name, user_id, _ = key
+        # 앱/사용자 상태는 다른 세션에도 보이므로 해당 범위의 캐시를 비웁니다.
+        app_wide = any(k.startswith(State.APP_PREFIX) for k in state_delta or {})
+        user_wide = any(k.startswith(State.USER_PREFIX) for k in state_delta or {})
+        if app_wide or user_wide:
+            own = self._entries.pop(key, None)
+            self.invalidate(app_name, None if app_wide else user_id)
+            if own is not None:
+                self._put(key, own)
+        if self._versions is None:
+            return
+        try:
+            await self._versions.publish(key, version)
+            if app_wide:
+                await self._versions.publish((app_name, _ANY, _ANY), time.time())
+            elif user_wide:
+                await self._versions.publish((app_name, user_id, _ANY), time.time())
+            if (app_wide or user_wide) and key in self._entries:
+                self._entries[key].loaded_at = time.time()
+        except Exception as e:
+            logger.error(f"Failed to publish session version for {key[2]}: {e}", exc_info=True)
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.genai import types
+
+from a2adk.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+# summary: 오래된 이벤트를 요약 하나로 바꿉니다. drop: 요약 없이 모델 컨텍스트에서만 뺍니다. 비어 있으면 사용하지 않습니다.
+SESSION_COMPACTION = (os.getenv("SESSION_COMPACTION") or '').lower()
+# 모델에 전달되는 이벤트 수 또는 추정 토큰 수가 이 값을 넘으면 압축합니다. 0이면 해당 기준을 쓰지 않습니다.
+SESSION_COMPACTION_EVENTS = int(os.getenv("SESSION_COMPACTION_EVENTS") or 50)
+SESSION_COMPACTION_TOKENS = int(os.getenv("SESSION_COMPACTION_TOKENS") or 0)
+# 압축 후에도 그대로 남길 최근 이벤트 수입니다.
+SESSION_COMPACTION_KEEP_EVENTS = int(os.getenv("SESSION_COMPACTION_KEEP_EVENTS") or 10)
+# 요약에 사용할 모델입니다.
+SESSION_COMPACTION_MODEL = os.getenv("SESSION_COMPACTION_MODEL") or os.getenv("ROOT_AGENT_MODEL") or 'gemini-2.0-flash'
+
+# 압축 기록을 보관하는 세션 상태 키입니다. 모든 세션 백엔드에 그대로 저장됩니다.
+COMPACTION_STATE_KEY = 'a2adk_compaction'
+# 세션별로 기억해 두는 압축 경계 수입니다.
+_MAX_HINTS = 10000
+
+_SUMMARY_PROMPT = (
+    'Summarize the conversation below so that an assistant can continue it without the original messages. '
+    'Keep facts, names, numbers, decisions, open questions and user preferences. '
+    'Answer with the summary only.'
+)
+
+Summarizer = Callable[[Optional[str], list[Event]], Awaitable[str]]
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ''
+    return ' '.join(part.text for part in event.content.parts if part.text and not part.thought).strip()
+
+
+def _estimate_tokens(event: Event) -> int:
+    # 토큰 수는 직렬화한 내용 길이로 어림합니다(약 4자당 1토큰).
+    if not event.content:
+        return 0
+    return len(event.content.model_dump_json(exclude_none=True)) // 4
+
+
+class CompactingSessionService(BaseSessionService):
+    """Session service wrapper that bounds the history handed to the model.
+
+    When the events after the last compaction exceed `max_events` or
+    `max_tokens`, the older ones are compacted in the background after the
+    turn's final response: everything before the last `keep_events` events
+    (cut at a user message, so tool calls stay with their responses) is left
+    out of `get_session`, and with `mode='summary'` replaced by one summary
+    event that also folds in the previous summary.
+
+    The wrapped service keeps the full history; the compaction record lives
+    in the session state under `COMPACTION_STATE_KEY`, so it works with every
+    backend and across workers. Reads with an explicit `GetSessionConfig`
+    (e.g. the session messages route) are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        *,
+        mode: str = SESSION_COMPACTION or 'summary',
+        max_events: int = SESSION_COMPACTION_EVENTS,
+        max_tokens: int = SESSION_COMPACTION_TOKENS,
+        keep_events: int = SESSION_COMPACTION_KEEP_EVENTS,
+        model: str = SESSION_COMPACTION_MODEL,
+        summarize: Optional[Summarizer] = None,
+    ):
+        if mode not in ('summary', 'drop'):
+            raise ValueError(f'Unknown session compaction mode: {mode}')
+        self._session_service = session_service
+        self._mode = mode
+        self._max_events = max_events
+        self._max_tokens = max_tokens
+        self._keep_events = max(1, keep_events)
+        self._model = model
+        self._summarize = summarize
+        self._client = None
+        # (app, user, session) -> 마지막 압축 경계(timestamp). 다음 조회에서 그 이후 이벤트만 읽습니다.
+        self._hints: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._tasks: dict[tuple[str, str, str], asyncio.Task] = {}
+        self._stats: Counter = Counter()
+
+    @property
+    def wrapped(self) -> BaseSessionService:
+        return self._session_service
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        return await self._session_service.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        if config is not None:
+            return await self._session_service.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id, config=config
+            )
+        after = self._hints.get((app_name, user_id, session_id))
+        session = await self._session_service.get_session(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            config=GetSessionConfig(after_timestamp=after) if after else None,
+        )
+        if session is None:
+            return None
+        record = session.state.get(COMPACTION_STATE_KEY)
+        if record:
+            session.events = self._uncompacted_events(session, record)
+            if record.get('summary'):
+                session.events.insert(0, self._summary_event(record))
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await self._session_service.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._hints.pop((app_name, user_id, session_id), None)
+        await self._session_service.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await self._session_service.append_event(session=session, event=event)
+        if not event.partial and event.is_final_response() and self._needs_compaction(session):
+            self._schedule(session.app_name, session.user_id, session.id)
+        return event
+
+    def stats(self) -> dict:
+        return {'mode': self._mode, 'running': len(self._tasks), **self._stats}
+
+    async def close(self):
+        """Wait for running compactions; called on server shutdown."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _needs_compaction(self, session: Session) -> bool:
+        events = [event for event in session.events if event.invocation_id != COMPACTION_STATE_KEY]
+        if self._max_events > 0 and len(events) > self._max_events:
+            return True
+        if self._max_tokens > 0 and sum(_estimate_tokens(event) for event in events) > self._max_tokens:
+            return True
+        return False
+
+    def _schedule(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        if key in self._tasks:
+            return
+        task = asyncio.create_task(self._compact(app_name, user_id, session_id))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    def _remember(self, key: tuple[str, str, str], after: float):
+        self._hints[key] = after
+        self._hints.move_to_end(key)
+        if len(self._hints) > _MAX_HINTS:
+            self._hints.popitem(last=False)
+
+    def _uncompacted_events(self, session: Session, record: dict[str, Any]) -> list[Event]:
+        self._remember((session.app_name, session.user_id, session.id), record['after'])
+        for index, event in enumerate(session.events):
+            if event.id == record['first_event_id']:
+                return session.events[index:]
+        return [event for event in session.events if event.timestamp >= record['after']]
+
+    def _summary_event(self, record: dict[str, Any]) -> Event:
+        return Event(
+            id=f"{COMPACTION_STATE_KEY}-{record['first_event_id']}",
+            invocation_id=COMPACTION_STATE_KEY,
+            author='user',
+            timestamp=record['after'],
+            content=types.UserContent(parts=[types.Part(
+                text=f"Summary of the earlier conversation:\n{record['summary']}"
+            )]),
+        )
+
+    def _boundary(self, events: list[Event]) -> Optional[int]:
+        """Index of the first event to keep, or None if nothing can be compacted."""
+        for index in range(len(events) - self._keep_events, 0, -1):
+            event = events[index]
+            if event.author == 'user' and _event_text(event):
+                return index
+        return None
+
+    async def _compact(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        started = time.perf_counter()
+        try:
+            after = self._hints.get(key)
+            session = await self._session_service.get_session(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                config=GetSessionConfig(after_timestamp=after) if after else None,
+            )
+            if session is None:
+                return
+            record = session.state.get(COMPACTION_STATE_KEY) or {}
+            events = self._uncompacted_events(session, record) if record else session.events
+            boundary = self._boundary(events)
+            if boundary is None:
+                self._stats['skipped'] += 1
+                return
+            summary = record.get('summary')
+            if self._mode == 'summary':
+                summary = await self._summarize_events(summary, events[:boundary])
+            first_kept = events[boundary]
+            record = {
+                'after': first_kept.timestamp,
+                'first_event_id': first_kept.id,
+                'summary': summary,
+                'compacted_events': record.get('compacted_events', 0) + boundary,
+                'time': time.time(),
+            }
+            # 요약하는 동안 다음 턴이 진행되었을 수 있으므로 최신 세션에 기록합니다.
+            latest = await self._session_service.get_session(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                config=GetSessionConfig(num_recent_events=1),
+            )
+            if latest is None:
+                return
+            await self._session_service.append_event(
+                session=latest,
+                event=Event(
+                    invocation_id=COMPACTION_STATE_KEY,
+                    author='user',
+                    actions=EventActions(state_delta={COMPACTION_STATE_KEY: record}),
+                ),
+            )
+            self._remember(key, record['after'])
+            self._stats['compactions'] += 1
+            self._stats['compacted_events'] += boundary
+            logger.debug(f"Compacted {boundary} events of session {session_id}")
+        except Exception as e:
+            self._stats['failed'] += 1
+            logger.error(f"Failed to compact session {session_id}: {e}", exc_info=True)
+        finally:
+            observe_stage(app_name, 'compaction', time.perf_counter() - started)
+
+    async def _summarize_events(self, previous: Optional[str], events: list[Event]) -> str:
+        if self._summarize is not None:
+            return await self._summarize(previous, events)
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        lines = [f'{event.author}: {text}' for event in events if (text := _event_text(event))]
+        if previous:
+            lines.insert(0, f'(summary of the conversation before) {previous}')
+        response = await self._client.aio.models.generate_content(
+            model=self._model,
+            contents=f'{_SUMMARY_PROMPT}\n\n' + '\n'.join(lines),
+        )
+        return (response.text or '').strip() or previous or ''
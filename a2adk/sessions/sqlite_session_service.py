@@ -0,0 +1,306 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+# 중간 이벤트를 모아서 기록하는 주기(초)입니다. 최종 응답 이벤트는 즉시 기록합니다.
+SQLITE_SESSION_FLUSH_INTERVAL = float(os.getenv("SQLITE_SESSION_FLUSH_INTERVAL") or 0.05)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _split_state(state: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Split a state dict into (app, user, session) parts, dropping temp: keys."""
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app_state[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+class SqliteSessionService(BaseSessionService):
+    """Session service stored in a SQLite (WAL) file shared by the workers of a host.
+
+    Appended events are written behind: they are kept in a pending batch and
+    committed together every SQLITE_SESSION_FLUSH_INTERVAL seconds, or
+    immediately when the event is a final response, so a conversation's
+    next turn sees the full history on any worker.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = SQLITE_SESSION_FLUSH_INTERVAL):
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(_SCHEMA)
+        self._pending: list[tuple[Session, Event]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        now = time.time()
+        app_state, user_state, session_state = await asyncio.to_thread(
+            self._create_session, app_name, user_id, session_id, state or {}, now
+        )
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merge_state(app_state, user_state, session_state),
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+        return await asyncio.to_thread(self._get_session, app_name, user_id, session_id, config)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        await self.flush()
+        rows = await asyncio.to_thread(self._query,
+            'SELECT id, update_time FROM sessions WHERE app_name=? AND user_id=?',
+            (app_name, user_id),
+        )
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=user_id, id=row['id'], state={}, last_update_time=row['update_time'])
+            for row in rows
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self.flush()
+        await asyncio.to_thread(self._delete_session, app_name, user_id, session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        self._pending.append((session, event))
+        if event.is_final_response():
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return event
+
+    async def flush(self):
+        """Commit every pending event in one transaction."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            self._pending = []
+            try:
+                await asyncio.to_thread(self._write_events, pending)
+            except BaseException:
+                self._pending[:0] = pending
+                raise
+
+    async def close(self):
+        await self.flush()
+        await asyncio.to_thread(self._conn.close)
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write session events: {e}", exc_info=True)
+        finally:
+            self._flush_task = None
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(self._conn)
+                self._conn.execute('COMMIT')
+                return result
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _create_session(self, app_name: str, user_id: str, session_id: str, state: dict[str, Any], now: float):
+        app_delta, user_delta, session_state = _split_state(state)
+
+        def create(conn: sqlite3.Connection):
+            conn.execute(
+                'INSERT INTO sessions (app_name, user_id, id, state, create_time, update_time) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (app_name, user_id, session_id, json.dumps(session_state), now, now),
+            )
+            app_state = self._update_state(conn, 'app_states', (app_name,), app_delta)
+            user_state = self._update_state(conn, 'user_states', (app_name, user_id), user_delta)
+            return app_state, user_state, session_state
+
+        return self._transaction(create)
+
+    def _get_session(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        with self._lock:
+            conn = self._conn
+            row = conn.execute(
+                'SELECT state, update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?',
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            where = 'app_name=? AND user_id=? AND session_id=?'
+            params: tuple = (app_name, user_id, session_id)
+            if config and config.after_timestamp:
+                where += ' AND timestamp >= ?'
+                params += (config.after_timestamp,)
+            if config and config.num_recent_events:
+                sql = (
+                    f'SELECT data FROM (SELECT seq, data FROM events WHERE {where} '
+                    'ORDER BY seq DESC LIMIT ?) ORDER BY seq'
+                )
+                params += (config.num_recent_events,)
+            else:
+                sql = f'SELECT data FROM events WHERE {where} ORDER BY seq'
+            events = [Event.model_validate_json(data) for (data,) in conn.execute(sql, params).fetchall()]
+            app_state = self._load_state(conn, 'app_states', (app_name,))
+            user_state = self._load_state(conn, 'user_states', (app_name, user_id))
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merge_state(app_state, user_state, json.loads(row[0])),
+            events=events,
+            last_update_time=row[1],
+        )
+
+    def _delete_session(self, app_name: str, user_id: str, session_id: str):
+        def delete(conn: sqlite3.Connection):
+            conn.execute(
+                'DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?',
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                'DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?',
+                (app_name, user_id, session_id),
+            )
+
+        self._transaction(delete)
+
+    def _write_events(self, pending: list[tuple[Session, Event]]):
+        def write(conn: sqlite3.Connection):
+            conn.executemany(
+                'INSERT INTO events (app_name, user_id, session_id, timestamp, data) VALUES (?, ?, ?, ?, ?)',
+                [
+                    (session.app_name, session.user_id, session.id, event.timestamp,
+                     event.model_dump_json(exclude_none=True))
+                    for session, event in pending
+                ],
+            )
+            sessions = {}
+            for session, event in pending:
+                sessions[(session.app_name, session.user_id, session.id)] = session
+                if event.actions and event.actions.state_delta:
+                    app_delta, user_delta, _ = _split_state(event.actions.state_delta)
+                    self._update_state(conn, 'app_states', (session.app_name,), app_delta)
+                    self._update_state(conn, 'user_states', (session.app_name, session.user_id), user_delta)
+            # 세션마다 마지막 상태만 기록합니다.
+            conn.executemany(
+                'UPDATE sessions SET state=?, update_time=? WHERE app_name=? AND user_id=? AND id=?',
+                [
+                    (json.dumps(_split_state(session.state)[2]), session.last_update_time, *key)
+                    for key, session in sessions.items()
+                ],
+            )
+
+        self._transaction(write)
+
+    def _load_state(self, conn: sqlite3.Connection, table: str, key: tuple) -> dict[str, Any]:
+        where = ' AND '.join(f'{column}=?' for column in ('app_name', 'user_id')[:len(key)])
+        row = conn.execute(f'SELECT state FROM {table} WHERE {where}', key).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _update_state(self, conn: sqlite3.Connection, table: str, key: tuple, delta: dict[str, Any]) -> dict[str, Any]:
+        state = self._load_state(conn, table, key)
+        if not delta:
+            return state
+        state.update(delta)
+        columns = ('app_name', 'user_id')[:len(key)]
+        conn.execute(
+            f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}, state) VALUES ({", ".join("?" * len(key))}, ?)',
+            (*key, json.dumps(state)),
+        )
+        return state
+
+    def _merge_state(self, app_state: dict, user_state: dict, session_state: dict) -> dict[str, Any]:
+        merged = dict(session_state)
+        for key, value in app_state.items():
+            merged[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            merged[State.USER_PREFIX + key] = value
+        return merged
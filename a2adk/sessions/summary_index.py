@@ -0,0 +1,330 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from a2adk.sessions.compaction import COMPACTION_STATE_KEY
+
+logger = logging.getLogger(__name__)
+
+# 세션 목록에 포함할 최근 사용자 메시지 수입니다.
+SESSION_SUMMARY_USER_MESSAGES = int(os.getenv("SESSION_SUMMARY_USER_MESSAGES") or 5)
+SESSION_SUMMARY_TITLE_LENGTH = 80
+SESSION_SUMMARY_PREVIEW_LENGTH = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_summaries (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    synced_update_time REAL NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    title TEXT,
+    preview TEXT,
+    recent_user_events TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE INDEX IF NOT EXISTS session_summaries_by_time
+    ON session_summaries (app_name, user_id, last_update_time DESC, session_id DESC);
+"""
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ''
+    return ' '.join(part.text for part in event.content.parts if part.text).strip()
+
+
+def encode_cursor(last_update_time: float, session_id: str) -> str:
+    raw = json.dumps([last_update_time, session_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        last_update_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(last_update_time), str(session_id)
+    except Exception as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+class SessionSummaryIndex:
+    """SQLite (WAL) index of per-session summaries for listing sessions.
+
+    Each row keeps the last update time, a title (first user message), a
+    preview (latest message) and the last K user events, so that the session
+    list can be served with one query instead of loading every history.
+    The database file can be shared by all workers on a host.
+
+    Rows are only written by this host, so `reconcile` compares them with
+    the session service before a list is served: sessions created or
+    updated elsewhere (other pods, or before the index existed) are
+    rebuilt, and sessions the service no longer knows (deleted elsewhere,
+    or lost with an in-memory service on restart) are dropped.
+    """
+
+    def __init__(self, db_path: str, recent_user_messages: int = SESSION_SUMMARY_USER_MESSAGES):
+        self._db_path = db_path
+        self._recent_user_messages = recent_user_messages
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(session_summaries)')}
+        if 'synced_update_time' not in columns:
+            # 이전 버전의 인덱스 파일입니다. 다음 reconcile에서 모든 행을 다시 만듭니다.
+            self._conn.execute(
+                'ALTER TABLE session_summaries ADD COLUMN synced_update_time REAL NOT NULL DEFAULT 0'
+            )
+
+    async def record_session(self, session: Session):
+        await asyncio.to_thread(self._record_session, session)
+
+    async def record_event(self, session: Session, event: Event):
+        await asyncio.to_thread(self._record_event, session, event)
+
+    async def delete(self, app_name: str, user_id: str, session_id: str):
+        await asyncio.to_thread(self._execute,
+            'DELETE FROM session_summaries WHERE app_name=? AND user_id=? AND session_id=?',
+            (app_name, user_id, session_id),
+        )
+
+    async def get(self, app_name: str, user_id: str, session_id: str) -> Optional[dict[str, Any]]:
+        rows = await asyncio.to_thread(self._query,
+            'SELECT * FROM session_summaries WHERE app_name=? AND user_id=? AND session_id=?',
+            (app_name, user_id, session_id),
+        )
+        return self._to_summary(rows[0]) if rows else None
+
+    async def list_summaries(
+        self, app_name: str, user_id: str, limit: int, cursor: str | None = None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return up to `limit` summaries, newest first, and the cursor of the next page."""
+        if cursor:
+            last_update_time, session_id = decode_cursor(cursor)
+            rows = await asyncio.to_thread(self._query,
+                'SELECT * FROM session_summaries WHERE app_name=? AND user_id=? '
+                'AND (last_update_time < ? OR (last_update_time = ? AND session_id < ?)) '
+                'ORDER BY last_update_time DESC, session_id DESC LIMIT ?',
+                (app_name, user_id, last_update_time, last_update_time, session_id, limit + 1),
+            )
+        else:
+            rows = await asyncio.to_thread(self._query,
+                'SELECT * FROM session_summaries WHERE app_name=? AND user_id=? '
+                'ORDER BY last_update_time DESC, session_id DESC LIMIT ?',
+                (app_name, user_id, limit + 1),
+            )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['last_update_time'], rows[-1]['session_id'])
+        return [self._to_summary(row) for row in rows], next_cursor
+
+    async def reconcile(self, session_service: BaseSessionService, app_name: str, user_id: str):
+        """Bring the rows of a user in line with `session_service.list_sessions`.
+
+        Sessions missing from the index or updated after their row was
+        written are rebuilt from their history; rows of sessions that are not
+        listed any more are deleted.
+        """
+        response = await session_service.list_sessions(app_name=app_name, user_id=user_id)
+        rows = await asyncio.to_thread(self._query,
+            'SELECT session_id, synced_update_time FROM session_summaries WHERE app_name=? AND user_id=?',
+            (app_name, user_id),
+        )
+        synced = {row['session_id']: row['synced_update_time'] for row in rows}
+        listed_ids = set()
+        rebuilt = 0
+        for listed in response.sessions:
+            listed_ids.add(listed.id)
+            if listed.id in synced and synced[listed.id] >= listed.last_update_time:
+                continue
+            session = await session_service.get_session(
+                app_name=app_name, user_id=user_id, session_id=listed.id
+            )
+            if session is not None:
+                await asyncio.to_thread(self._rebuild_session, session)
+                rebuilt += 1
+        removed = [session_id for session_id in synced if session_id not in listed_ids]
+        for session_id in removed:
+            await self.delete(app_name, user_id, session_id)
+        if rebuilt or removed:
+            logger.info(
+                'Reconciled session summaries for %s/%s: %d rebuilt, %d removed',
+                app_name, user_id, rebuilt, len(removed),
+            )
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _record_session(self, session: Session):
+        self._execute(
+            'INSERT INTO session_summaries (app_name, user_id, session_id, last_update_time, synced_update_time) '
+            'VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (app_name, user_id, session_id) DO UPDATE SET '
+            'last_update_time=excluded.last_update_time, synced_update_time=excluded.synced_update_time',
+            (session.app_name, session.user_id, session.id, session.last_update_time, session.last_update_time),
+        )
+
+    def _record_event(self, session: Session, event: Event):
+        text = _event_text(event)
+        is_user_message = bool(text) and event.author == 'user'
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT title, recent_user_events FROM session_summaries '
+                    'WHERE app_name=? AND user_id=? AND session_id=?',
+                    (session.app_name, session.user_id, session.id),
+                ).fetchone()
+                title = row['title'] if row else None
+                recent_user_events = json.loads(row['recent_user_events']) if row else []
+                if is_user_message:
+                    title = title or text[:SESSION_SUMMARY_TITLE_LENGTH]
+                    recent_user_events.append(self._user_event(event, text))
+                    recent_user_events = recent_user_events[-self._recent_user_messages:]
+                self._conn.execute(
+                    'INSERT INTO session_summaries '
+                    '(app_name, user_id, session_id, last_update_time, synced_update_time, event_count, title, preview, '
+                    'recent_user_events) '
+                    'VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?) '
+                    'ON CONFLICT (app_name, user_id, session_id) DO UPDATE SET '
+                    'last_update_time=excluded.last_update_time, synced_update_time=excluded.synced_update_time, '
+                    'event_count=event_count + 1, '
+                    'title=excluded.title, preview=COALESCE(excluded.preview, preview), '
+                    'recent_user_events=excluded.recent_user_events',
+                    (
+                        session.app_name, session.user_id, session.id, event.timestamp,
+                        # 저장소의 갱신 시각(예: DB 커밋 시각)은 이벤트 시각보다 늦을 수 있습니다.
+                        max(session.last_update_time, event.timestamp),
+                        title, text[:SESSION_SUMMARY_PREVIEW_LENGTH] or None, json.dumps(recent_user_events),
+                    ),
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _rebuild_session(self, session: Session):
+        title = None
+        preview = None
+        recent_user_events = []
+        events = [event for event in session.events if event.invocation_id != COMPACTION_STATE_KEY]
+        # 목록 순서는 append_event로 기록한 행과 같이 마지막 이벤트의 시각으로 정합니다.
+        last_update_time = events[-1].timestamp if events else session.last_update_time
+        for event in events:
+            text = _event_text(event)
+            if not text:
+                continue
+            preview = text[:SESSION_SUMMARY_PREVIEW_LENGTH]
+            if event.author == 'user':
+                title = title or text[:SESSION_SUMMARY_TITLE_LENGTH]
+                recent_user_events.append(self._user_event(event, text))
+        self._execute(
+            'INSERT OR REPLACE INTO session_summaries '
+            '(app_name, user_id, session_id, last_update_time, synced_update_time, event_count, title, preview, '
+            'recent_user_events) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                session.app_name, session.user_id, session.id, last_update_time, session.last_update_time, len(events),
+                title, preview, json.dumps(recent_user_events[-self._recent_user_messages:]),
+            ),
+        )
+
+    def _user_event(self, event: Event, text: str) -> dict[str, Any]:
+        # 프론트엔드의 Session.events 형식과 맞춥니다.
+        return {
+            'id': event.id,
+            'author': event.author,
+            'timestamp': event.timestamp,
+            'content': {'role': 'user', 'parts': [{'text': text}]},
+        }
+
+    def _to_summary(self, row: sqlite3.Row) -> dict[str, Any]:
+        recent_user_events = json.loads(row['recent_user_events'])
+        recent_user_events.reverse()
+        return {
+            'id': row['session_id'],
+            'app_name': row['app_name'],
+            'user_id': row['user_id'],
+            'last_update_time': row['last_update_time'],
+            'event_count': row['event_count'],
+            'title': row['title'],
+            'preview': row['preview'],
+            'events': recent_user_events,
+        }
+
+
+class SummaryIndexingSessionService(BaseSessionService):
+    """Session service wrapper that keeps a SessionSummaryIndex up to date."""
+
+    def __init__(self, session_service: BaseSessionService, index: SessionSummaryIndex):
+        self._session_service = session_service
+        self.index = index
+
+    @property
+    def wrapped(self) -> BaseSessionService:
+        return self._session_service
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self._session_service.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        await self.index.record_session(session)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await self._session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return await self._session_service.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self._session_service.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        await self.index.delete(app_name, user_id, session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await self._session_service.append_event(session=session, event=event)
+        # 압축 기록은 보이는 내용을 바꾸지 않으므로 목록 순서가 바뀌지 않도록 인덱싱하지 않습니다.
+        if not event.partial and event.invocation_id != COMPACTION_STATE_KEY:
+            try:
+                await self.index.record_event(session, event)
+            except Exception as e:
+                # 인덱스 갱신 실패가 대화 진행을 막지 않도록 합니다.
+                logger.error(f"Failed to update session summary for {session.id}: {e}", exc_info=True)
+        return event
@@ -0,0 +1,60 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 설정하면 워커가 시작될 때 단계별 import/초기화 시간을 로그로 남깁니다.
+STARTUP_REPORT = os.getenv("STARTUP_REPORT", "").lower() in ("1", "true", "yes")
+
+# 이 모듈이 처음 import된 시각입니다. 보고서의 전체 시간은 여기서부터 잽니다.
+_STARTED = time.perf_counter()
+
+
+class StartupReport:
+    """Import and init time of each startup stage of a worker.
+
+    Stages are recorded in order with `stage(name, phase)`. `finish()` fixes
+    the total startup time and logs one line per stage; `summary()` returns
+    the same data for `/stats`.
+    """
+
+    def __init__(self):
+        # (stage, phase, seconds)
+        self._entries: list[tuple[str, str, float]] = []
+        self._total: float | None = None
+
+    @contextmanager
+    def stage(self, name: str, phase: str = 'init'):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._entries.append((name, phase, time.perf_counter() - started))
+
+    def record(self, name: str, phase: str, seconds: float):
+        self._entries.append((name, phase, seconds))
+
+    def summary(self) -> dict:
+        stages: dict[str, dict[str, float]] = {}
+        for name, phase, seconds in self._entries:
+            times = stages.setdefault(name, {})
+            times[phase] = round(times.get(phase, 0.0) + seconds, 4)
+        return {
+            'total_seconds': round(self._total if self._total is not None else time.perf_counter() - _STARTED, 4),
+            'stages': stages,
+        }
+
+    def finish(self):
+        self._total = time.perf_counter() - _STARTED
+        summary = self.summary()
+        lines = [f"Startup took {summary['total_seconds']:.3f}s (pid {os.getpid()})"]
+        for name, times in summary['stages'].items():
+            phases = ', '.join(f'{phase} {seconds:.3f}s' for phase, seconds in times.items())
+            lines.append(f'  {name}: {phases}')
+        level = logging.WARNING if STARTUP_REPORT else logging.DEBUG
+        logger.log(level, '\n'.join(lines))
+
+
+startup_report = StartupReport()
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+import uuid
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Artifact, Part, TaskArtifactUpdateEvent, TextPart
+
+# 부분 응답(토큰)을 모아서 보내는 시간 창(초)과 최대 크기(바이트)입니다.
+A2A_STREAM_COALESCE_INTERVAL = float(os.getenv("A2A_STREAM_COALESCE_INTERVAL") or 0.05)
+A2A_STREAM_COALESCE_BYTES = int(os.getenv("A2A_STREAM_COALESCE_BYTES") or 1024)
+
+
+class ArtifactStreamCoalescer:
+    """Merges streamed text deltas into artifact chunks for one task.
+
+    Deltas are buffered and put on the event queue as a single
+    `TaskArtifactUpdateEvent(append=True)` once `interval` seconds have passed
+    since the first buffered delta or the buffer reaches `max_bytes`. The
+    first chunk goes out immediately to keep time-to-first-token low.
+    `finish()` replaces the streamed chunks with the final parts under the
+    same artifact id and marks it as the last chunk.
+    """
+
+    def __init__(
+        self,
+        task_updater: TaskUpdater,
+        *,
+        interval: float = A2A_STREAM_COALESCE_INTERVAL,
+        max_bytes: int = A2A_STREAM_COALESCE_BYTES,
+    ):
+        self._task_updater = task_updater
+        self._interval = interval
+        self._max_bytes = max_bytes
+        self.artifact_id = str(uuid.uuid4())
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._buffered_since = 0.0
+        self._started = False
+        self._timer: asyncio.TimerHandle | None = None
+        self.chunks_sent = 0
+
+    def add(self, text: str):
+        if not text:
+            return
+        if not self._started:
+            self._buffer.append(text)
+            self.flush()
+            return
+        if not self._buffer:
+            self._buffered_since = time.monotonic()
+            self._timer = asyncio.get_running_loop().call_later(self._interval, self.flush)
+        self._buffer.append(text)
+        self._buffered_bytes += len(text.encode('utf-8'))
+        if (
+            self._buffered_bytes >= self._max_bytes
+            or time.monotonic() - self._buffered_since >= self._interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        text = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._enqueue([Part(root=TextPart(text=text))], append=self._started, last_chunk=False)
+        self._started = True
+
+    def finish(self, parts: list[Part]):
+        """Send the final content of the artifact, replacing the streamed chunks."""
+        self.discard()
+        self._enqueue(parts, append=False, last_chunk=True)
+
+    def discard(self):
+        """Drop buffered deltas without sending them, e.g. when the task is cancelled."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _enqueue(self, parts: list[Part], *, append: bool, last_chunk: bool):
+        self._task_updater.event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=self._task_updater.task_id,
+                contextId=self._task_updater.context_id,
+                artifact=Artifact(artifactId=self.artifact_id, parts=parts),
+                append=append,
+                lastChunk=last_chunk,
+            )
+        )
+        self.chunks_sent += 1
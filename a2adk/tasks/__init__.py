@@ -0,0 +1,13 @@
+from a2adk.tasks.base import BatchingTaskStore
+from a2adk.tasks.queue_manager import DistributedQueueManager, EventBroker
+from a2adk.tasks.sqlite_backend import SqliteEventBroker, SqliteTaskStore
+
+# Redis 백엔드는 선택 의존성(redis)이 필요하므로 a2adk.tasks.redis_backend에서 직접 가져옵니다.
+
+__all__ = [
+    'BatchingTaskStore',
+    'DistributedQueueManager',
+    'EventBroker',
+    'SqliteEventBroker',
+    'SqliteTaskStore',
+]
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from abc import abstractmethod
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+
+logger = logging.getLogger(__name__)
+
+# 배치 쓰기가 실패했을 때 다시 시도하기까지 기다리는 시간(초)입니다. 실패가 이어지면 두 배씩 늘립니다.
+TASK_STORE_RETRY_DELAY = 0.5
+TASK_STORE_RETRY_MAX_DELAY = 30.0
+
+
+class BatchingTaskStore(TaskStore):
+    """TaskStore base class that group-commits concurrent saves.
+
+    Saves made while a batch is being written are collected into the next
+    batch, so N concurrent `save()` calls cost one transaction (or one
+    pipeline) instead of N. Each `save()` returns only after its batch is
+    durable, and `get()` sees tasks that are still waiting in a batch.
+    Tasks of a failed batch are written again by the next batch, which is
+    scheduled with backoff if no other save starts one.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, Task] = {}
+        self._batch: asyncio.Future | None = None
+        self._failures = 0
+
+    async def save(self, task: Task):
+        self._pending[task.id] = task
+        if self._batch is None:
+            self._schedule_batch()
+        # 배치 쓰기가 취소되지 않도록 shield로 기다립니다.
+        await asyncio.shield(self._batch)
+
+    async def get(self, task_id: str) -> Task | None:
+        task = self._pending.get(task_id)
+        if task is not None:
+            return task
+        return await self._read(task_id)
+
+    async def delete(self, task_id: str):
+        self._pending.pop(task_id, None)
+        await self._delete(task_id)
+
+    def _schedule_batch(self, delay: float = 0):
+        self._batch = asyncio.get_running_loop().create_future()
+        asyncio.create_task(self._flush(self._batch, delay))
+
+    async def _flush(self, batch: asyncio.Future, delay: float = 0):
+        # 같은 루프 턴에 들어온 save를 모두 모읍니다.
+        await asyncio.sleep(delay)
+        tasks = self._pending
+        self._pending = {}
+        self._batch = None
+        try:
+            await self._write(list(tasks.values()))
+        except Exception as e:
+            # 쓰지 못한 작업은 다음 배치에서 다시 시도할 수 있도록 되돌립니다.
+            for task_id, task in tasks.items():
+                self._pending.setdefault(task_id, task)
+            logger.error(f"Failed to save {len(tasks)} tasks: {e}", exc_info=True)
+            batch.set_exception(e)
+            self._failures += 1
+            if self._batch is None:
+                # 이후 save가 없어도 되돌린 작업이 저장되도록 다음 배치를 예약합니다.
+                self._schedule_batch(
+                    min(TASK_STORE_RETRY_DELAY * 2 ** (self._failures - 1), TASK_STORE_RETRY_MAX_DELAY)
+                )
+        else:
+            self._failures = 0
+            batch.set_result(None)
+        # 아무도 기다리지 않는 배치의 예외가 경고로 남지 않도록 합니다.
+        batch.exception()
+
+    @abstractmethod
+    async def _write(self, tasks: list[Task]):
+        """Persist a batch of tasks in one transaction."""
+
+    @abstractmethod
+    async def _read(self, task_id: str) -> Task | None:
+        """Load a persisted task."""
+
+    @abstractmethod
+    async def _delete(self, task_id: str):
+        """Remove a persisted task."""
+
+    async def close(self):
+        """Release the backend connection."""
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+
+from a2a.server.events import EventQueue, NoTaskQueue, QueueManager, TaskQueueExists
+from a2a.server.events.event_consumer import QueueClosed
+from a2a.server.events.event_queue import Event
+from a2a.types import (
+    JSONRPCError,
+    Message,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+_EVENT_TYPES = {
+    'message': Message,
+    'task': Task,
+    'status-update': TaskStatusUpdateEvent,
+    'artifact-update': TaskArtifactUpdateEvent,
+}
+
+
+def serialize_event(event: Event) -> str:
+    if isinstance(event, (Message, Task, TaskStatusUpdateEvent, TaskArtifactUpdateEvent)):
+        return event.model_dump_json(exclude_none=True)
+    # A2AError는 RootModel이므로 내부 오류 객체를 꺼냅니다.
+    error = getattr(event, 'root', event)
+    return json.dumps({'kind': 'error', 'error': error.model_dump(mode='json', exclude_none=True)})
+
+
+def deserialize_event(payload: str) -> Event:
+    data = json.loads(payload)
+    kind = data.get('kind')
+    if kind == 'error':
+        return JSONRPCError.model_validate(data['error'])
+    return _EVENT_TYPES[kind].model_validate(data)
+
+
+class EventBroker(ABC):
+    """Cross-worker channel for the events of running tasks.
+
+    A payload of None marks the end of a task's event stream.
+    """
+
+    @abstractmethod
+    async def register(self, task_id: str):
+        """Mark the task's event stream as live on this worker."""
+
+    @abstractmethod
+    async def unregister(self, task_id: str):
+        """Mark the task's event stream as finished."""
+
+    @abstractmethod
+    async def is_live(self, task_id: str) -> bool:
+        """Return True if some worker is producing events for the task."""
+
+    @abstractmethod
+    async def publish(self, task_id: str, payloads: list[str | None]):
+        """Publish serialized events, in order, in one batch."""
+
+    @abstractmethod
+    async def subscribe(self, task_id: str) -> AsyncIterator[str | None]:
+        """Subscribe to events published from now on.
+
+        The subscription is active when this coroutine returns. The iterator
+        ends after the end marker, or when the stream is no longer live.
+        """
+
+    async def close(self):
+        """Release the backend connection."""
+
+
+class DistributedQueueManager(QueueManager):
+    """QueueManager that lets any worker tap a task running on another worker.
+
+    Queues are kept in memory on the worker that runs the task, like
+    InMemoryQueueManager, and every event is also published to the broker.
+    `tap()` for a task that is not local subscribes to the broker instead,
+    so `tasks/resubscribe` works regardless of which worker receives it.
+    """
+
+    def __init__(self, broker: EventBroker):
+        self._broker = broker
+        self._task_queue: dict[str, EventQueue] = {}
+        # task_id -> (전달용 tap, 전달 태스크)
+        self._forwarders: dict[str, tuple[EventQueue, asyncio.Task]] = {}
+        self._subscribers: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def add(self, task_id: str, queue: EventQueue):
+        async with self._lock:
+            if task_id in self._task_queue:
+                raise TaskQueueExists()
+            await self._add(task_id, queue)
+
+    async def get(self, task_id: str) -> EventQueue | None:
+        async with self._lock:
+            return self._task_queue.get(task_id)
+
+    async def tap(self, task_id: str) -> EventQueue | None:
+        async with self._lock:
+            if task_id in self._task_queue:
+                return self._task_queue[task_id].tap()
+        return await self._remote_tap(task_id)
+
+    async def close(self, task_id: str):
+        async with self._lock:
+            if task_id not in self._task_queue:
+                raise NoTaskQueue()
+            queue = self._task_queue.pop(task_id)
+            tap, forwarder = self._forwarders.pop(task_id)
+        await queue.close()
+        # Python 3.13의 EventQueue.close()는 자식 큐의 close()를 await하지 않아 tap이 닫히지 않으므로 직접 닫습니다.
+        # 전달 태스크는 남은 이벤트와 종료 표시를 발행하고 등록을 해제한 뒤 끝납니다.
+        await tap.close()
+        await forwarder
+
+    async def create_or_tap(self, task_id: str) -> EventQueue:
+        async with self._lock:
+            if task_id not in self._task_queue:
+                queue = EventQueue()
+                await self._add(task_id, queue)
+                return queue
+            return self._task_queue[task_id].tap()
+
+    async def _add(self, task_id: str, queue: EventQueue):
+        self._task_queue[task_id] = queue
+        await self._broker.register(task_id)
+        tap = queue.tap()
+        self._forwarders[task_id] = (tap, asyncio.create_task(self._forward(task_id, tap)))
+
+    async def _forward(self, task_id: str, tap: EventQueue):
+        """Publish the events of a local queue until it is closed."""
+        try:
+            while True:
+                if tap.is_closed() and tap.queue.empty():
+                    break
+                try:
+                    # close()가 tap을 닫으므로 남은 이벤트를 모두 읽은 뒤 끝납니다.
+                    # 닫힌 빈 큐는 QueueEmpty를, 기다리는 중에 닫히면 QueueClosed를 던집니다.
+                    event = await tap.dequeue_event()
+                except (QueueClosed, asyncio.QueueEmpty):
+                    break
+                tap.task_done()
+                payloads = [serialize_event(event)]
+                # 밀려 있는 이벤트는 한 번에 발행합니다.
+                while not tap.queue.empty():
+                    event = await tap.dequeue_event(no_wait=True)
+                    tap.task_done()
+                    payloads.append(serialize_event(event))
+                await self._broker.publish(task_id, payloads)
+        except Exception as e:
+            logger.error(f"Failed to publish events of task {task_id}: {e}", exc_info=True)
+        finally:
+            try:
+                await self._broker.publish(task_id, [None])
+                await self._broker.unregister(task_id)
+            except Exception as e:
+                logger.error(f"Failed to close event stream of task {task_id}: {e}")
+
+    async def _remote_tap(self, task_id: str) -> EventQueue | None:
+        if not await self._broker.is_live(task_id):
+            return None
+        subscription = await self._broker.subscribe(task_id)
+        queue = EventQueue()
+        subscriber = asyncio.create_task(self._pump(task_id, subscription, queue))
+        self._subscribers.add(subscriber)
+        subscriber.add_done_callback(self._subscribers.discard)
+        logger.debug('Tapped task %s through the event broker', task_id)
+        return queue
+
+    async def _pump(self, task_id: str, subscription: AsyncIterator[str | None], queue: EventQueue):
+        try:
+            async for payload in subscription:
+                if payload is None or queue.is_closed():
+                    break
+                queue.enqueue_event(deserialize_event(payload))
+        except Exception as e:
+            logger.error(f"Event subscription for task {task_id} failed: {e}", exc_info=True)
+        finally:
+            await subscription.aclose()
+            try:
+                # 구독자가 떠나 큐가 비워지지 않더라도 무한히 기다리지 않습니다.
+                await asyncio.wait_for(queue.close(), timeout=5)
+            except TimeoutError:
+                pass
+
+    async def aclose(self):
+        for subscriber in list(self._subscribers):
+            subscriber.cancel()
+        forwarders = [forwarder for _, forwarder in self._forwarders.values()]
+        for forwarder in forwarders:
+            forwarder.cancel()
+        # 취소된 전달 태스크가 종료 표시를 발행하고 등록을 해제할 때까지 연결을 닫지 않습니다.
+        await asyncio.gather(*forwarders, return_exceptions=True)
+        await self._broker.close()
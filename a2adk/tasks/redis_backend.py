@@ -0,0 +1,108 @@
+import logging
+import time
+from collections.abc import AsyncIterator
+
+import redis.asyncio as redis
+
+from a2a.types import Task
+
+from a2adk.tasks.base import BatchingTaskStore
+from a2adk.tasks.queue_manager import EventBroker
+
+logger = logging.getLogger(__name__)
+
+# 워커가 비정상 종료되어 종료 표시가 남지 않은 작업을 정리하는 시간(초)입니다.
+REDIS_LIVE_QUEUE_TTL = 3600
+# 발행 채널에서 종료 표시로 사용하는 값입니다. (Pub/Sub은 None을 보낼 수 없습니다.)
+_END_OF_STREAM = ''
+
+
+def create_redis_client(url: str) -> redis.Redis:
+    """Create a client for any Redis-protocol server (Redis, Valkey, KeyDB, ...)."""
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+class RedisTaskStore(BatchingTaskStore):
+    """TaskStore persisted in Redis; each batch of saves is one pipeline."""
+
+    def __init__(self, client: redis.Redis, prefix: str = 'a2a', ttl: int | None = None):
+        super().__init__()
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl
+
+    def _key(self, task_id: str) -> str:
+        return f'{self._prefix}:task:{task_id}'
+
+    async def _write(self, tasks: list[Task]):
+        async with self._client.pipeline(transaction=False) as pipe:
+            for task in tasks:
+                pipe.set(self._key(task.id), task.model_dump_json(exclude_none=True), ex=self._ttl)
+            await pipe.execute()
+
+    async def _read(self, task_id: str) -> Task | None:
+        data = await self._client.get(self._key(task_id))
+        return Task.model_validate_json(data) if data else None
+
+    async def _delete(self, task_id: str):
+        await self._client.delete(self._key(task_id))
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class RedisEventBroker(EventBroker):
+    """EventBroker on Redis Pub/Sub, one channel per task."""
+
+    def __init__(self, client: redis.Redis, prefix: str = 'a2a'):
+        self._client = client
+        self._prefix = prefix
+
+    def _channel(self, task_id: str) -> str:
+        return f'{self._prefix}:events:{task_id}'
+
+    def _live_key(self, task_id: str) -> str:
+        return f'{self._prefix}:queue:{task_id}'
+
+    async def register(self, task_id: str):
+        await self._client.set(self._live_key(task_id), time.time(), ex=REDIS_LIVE_QUEUE_TTL)
+
+    async def unregister(self, task_id: str):
+        await self._client.delete(self._live_key(task_id))
+
+    async def is_live(self, task_id: str) -> bool:
+        return bool(await self._client.exists(self._live_key(task_id)))
+
+    async def publish(self, task_id: str, payloads: list[str | None]):
+        channel = self._channel(task_id)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for payload in payloads:
+                pipe.publish(channel, _END_OF_STREAM if payload is None else payload)
+            await pipe.execute()
+
+    async def subscribe(self, task_id: str) -> AsyncIterator[str | None]:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(self._channel(task_id))
+        return self._listen(task_id, pubsub)
+
+    async def _listen(self, task_id: str, pubsub) -> AsyncIterator[str | None]:
+        try:
+            idle_since = time.monotonic()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    idle_since = time.monotonic()
+                    if message['data'] == _END_OF_STREAM:
+                        yield None
+                        return
+                    yield message['data']
+                elif time.monotonic() - idle_since > 1.0:
+                    # 종료 표시를 놓쳤더라도 작업이 끝났으면 구독을 마칩니다.
+                    if not await self.is_live(task_id):
+                        return
+                    idle_since = time.monotonic()
+        finally:
+            await pubsub.aclose()
+
+    async def close(self):
+        await self._client.aclose()
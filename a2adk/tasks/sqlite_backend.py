@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator
+
+from a2a.types import Task
+
+from a2adk.tasks.base import BatchingTaskStore
+from a2adk.tasks.queue_manager import EventBroker
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커가 발행한 이벤트를 확인하는 주기(초)입니다.
+SQLITE_EVENT_POLL_INTERVAL = 0.05
+# 구독이 끝난 이벤트를 보관하는 시간(초)입니다.
+SQLITE_EVENT_RETENTION = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS a2a_tasks (
+    task_id TEXT PRIMARY KEY,
+    context_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS a2a_task_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    payload TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS a2a_task_events_by_task ON a2a_task_events (task_id, id);
+CREATE TABLE IF NOT EXISTS a2a_live_task_queues (
+    task_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class _SqliteDatabase:
+    """One WAL connection guarded by a lock; every call runs in a worker thread."""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(_SCHEMA)
+
+    def execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows: list[tuple]):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SqliteTaskStore(BatchingTaskStore):
+    """TaskStore persisted in a SQLite (WAL) file shared by the workers of a host."""
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self._db = _SqliteDatabase(db_path)
+
+    async def _write(self, tasks: list[Task]):
+        now = time.time()
+        await asyncio.to_thread(self._db.executemany,
+            'INSERT OR REPLACE INTO a2a_tasks (task_id, context_id, state, data, updated_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [
+                (task.id, task.contextId, task.status.state.value, task.model_dump_json(exclude_none=True), now)
+                for task in tasks
+            ],
+        )
+
+    async def _read(self, task_id: str) -> Task | None:
+        rows = await asyncio.to_thread(self._db.query,
+            'SELECT data FROM a2a_tasks WHERE task_id=?', (task_id,)
+        )
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def _delete(self, task_id: str):
+        await asyncio.to_thread(self._db.execute, 'DELETE FROM a2a_tasks WHERE task_id=?', (task_id,))
+
+    async def close(self):
+        await asyncio.to_thread(self._db.close)
+
+
+class SqliteEventBroker(EventBroker):
+    """EventBroker backed by an append-only SQLite table that subscribers poll."""
+
+    def __init__(self, db_path: str, poll_interval: float = SQLITE_EVENT_POLL_INTERVAL):
+        self._db = _SqliteDatabase(db_path)
+        self._poll_interval = poll_interval
+
+    async def register(self, task_id: str):
+        await asyncio.to_thread(self._db.execute,
+            'INSERT OR REPLACE INTO a2a_live_task_queues (task_id, created_at) VALUES (?, ?)',
+            (task_id, time.time()),
+        )
+
+    async def unregister(self, task_id: str):
+        await asyncio.to_thread(self._db.execute,
+            'DELETE FROM a2a_live_task_queues WHERE task_id=?', (task_id,)
+        )
+        await asyncio.to_thread(self._db.execute,
+            'DELETE FROM a2a_task_events WHERE created_at < ?', (time.time() - SQLITE_EVENT_RETENTION,)
+        )
+
+    async def is_live(self, task_id: str) -> bool:
+        rows = await asyncio.to_thread(self._db.query,
+            'SELECT 1 FROM a2a_live_task_queues WHERE task_id=?', (task_id,)
+        )
+        return bool(rows)
+
+    async def publish(self, task_id: str, payloads: list[str | None]):
+        now = time.time()
+        await asyncio.to_thread(self._db.executemany,
+            'INSERT INTO a2a_task_events (task_id, payload, created_at) VALUES (?, ?, ?)',
+            [(task_id, payload, now) for payload in payloads],
+        )
+
+    async def subscribe(self, task_id: str) -> AsyncIterator[str | None]:
+        rows = await asyncio.to_thread(self._db.query, 'SELECT COALESCE(MAX(id), 0) FROM a2a_task_events')
+        return self._poll(task_id, rows[0][0])
+
+    async def _poll(self, task_id: str, last_id: int) -> AsyncIterator[str | None]:
+        idle_since = time.monotonic()
+        while True:
+            rows = await asyncio.to_thread(self._db.query,
+                'SELECT id, payload FROM a2a_task_events WHERE task_id=? AND id>? ORDER BY id',
+                (task_id, last_id),
+            )
+            for last_id, payload in rows:
+                yield payload
+                if payload is None:
+                    return
+            if rows:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since > 1.0:
+                # 종료 표시를 놓쳤더라도 작업이 끝났으면 구독을 마칩니다.
+                if not await self.is_live(task_id):
+                    return
+                idle_since = time.monotonic()
+            await asyncio.sleep(self._poll_interval)
+
+    async def close(self):
+        await asyncio.to_thread(self._db.close)
@@ -1,5 +1,7 @@
+import base64
+import os
+import tempfile
 from uuid import uuid4
-import httpx
 
 from google.genai import types
 
@@ -14,6 +16,17 @@ from a2a.types import (
   SendMessageRequest
   )
 
+from a2adk.http_client import get_http_client
+
+# 워커 간에 공유하는 로컬 파일(SQLite 인덱스, 캐시 등)을 저장하는 디렉터리입니다.
+A2ADK_DATA_DIR = os.getenv("A2ADK_DATA_DIR") or os.path.join(tempfile.gettempdir(), "a2adk")
+
+
+def get_data_path(filename: str) -> str:
+    """Return the path of `filename` under A2ADK_DATA_DIR, creating the directory if needed."""
+    os.makedirs(A2ADK_DATA_DIR, exist_ok=True)
+    return os.path.join(A2ADK_DATA_DIR, filename)
+
 
 def convert_a2a_parts_to_genai(parts: list[Part]) -> list[types.Part]:
     """Convert a list of A2A Part types into a list of Google GenAI Part types."""
@@ -29,13 +42,13 @@ def convert_a2a_part_to_genai(part: Part) -> types.Part:
         if isinstance(part.file, FileWithUri):
             return types.Part(
                 file_data=types.FileData(
-                    file_uri=part.file.uri, mime_type=part.file.mime_type
+                    file_uri=part.file.uri, mime_type=part.file.mimeType
                 )
             )
         elif isinstance(part.file, FileWithBytes):
             return types.Part(
                 inline_data=types.Blob(
-                    data=part.file.bytes, mime_type=part.file.mime_type
+                    data=base64.b64decode(part.file.bytes), mime_type=part.file.mimeType
                 )
             )
         else:
@@ -61,15 +74,15 @@ def convert_genai_part_to_a2a(part: types.Part) -> Part:
         return FilePart(
             file=FileWithUri(
                 uri=part.file_data.file_uri,
-                mime_type=part.file_data.mime_type,
+                mimeType=part.file_data.mime_type,
             )
         )
     elif part.inline_data:
         return Part(
             root=FilePart(
                 file=FileWithBytes(
-                    bytes=part.inline_data.data,
-                    mime_type=part.inline_data.mime_type,
+                    bytes=base64.b64encode(part.inline_data.data).decode('ascii'),
+                    mimeType=part.inline_data.mime_type,
                 )
             )
         )
@@ -78,9 +91,8 @@ def convert_genai_part_to_a2a(part: types.Part) -> Part:
 
 
 async def send_a2a_message(request: SendMessageRequest, agent_endpoint: str):
-    async with httpx.AsyncClient() as client:
-        agent_client = A2AClient(
-            httpx_client=client, 
-            url=agent_endpoint
-        )
-        return await agent_client.send_message(request)
+    agent_client = A2AClient(
+        httpx_client=get_http_client(), 
+        url=agent_endpoint
+    )
+    return await agent_client.send_message(request)
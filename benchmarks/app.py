@@ -0,0 +1,29 @@
+from google.adk.tools import FunctionTool, ToolContext
+
+from a2adk.__main__ import create_app
+from a2adk.a2atool import A2ATool
+from a2adk.agents import agent as agents
+
+from benchmarks.fake_llm import FakeLlm
+from benchmarks.peer import BENCH_PEER_URL
+
+
+def create_bench_app():
+    """`create_app()` with the root agent's model replaced by `FakeLlm`.
+
+    The agent also gets an `ask_peer` tool that calls the fake remote agent
+    (benchmarks/peer.py) through A2ATool; prompts mentioning "peer" use it.
+    """
+    peer = A2ATool(BENCH_PEER_URL)
+
+    async def ask_peer(message: str, tool_context: ToolContext) -> dict:
+        """Ask the peer agent."""
+        return await peer(message, tool_context)
+
+    root_agent = agents.root_agent
+    model = FakeLlm(model='bench-fake')
+    model.tool_keywords = {**model.tool_keywords, 'peer': ('ask_peer', {'message': 'hello peer'})}
+    root_agent.model = model
+    if not any(getattr(tool, 'name', None) == 'ask_peer' for tool in root_agent.tools):
+        root_agent.tools.append(FunctionTool(ask_peer))
+    return create_app()
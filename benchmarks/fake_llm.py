@@ -0,0 +1,58 @@
+import asyncio
+import os
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+# 첫 토큰까지의 지연(초), 응답을 나누는 청크 수와 청크 사이 지연(초)입니다.
+BENCH_MODEL_LATENCY = float(os.getenv("BENCH_MODEL_LATENCY") or 0.05)
+BENCH_MODEL_CHUNKS = int(os.getenv("BENCH_MODEL_CHUNKS") or 8)
+BENCH_MODEL_CHUNK_DELAY = float(os.getenv("BENCH_MODEL_CHUNK_DELAY") or 0.005)
+
+
+class FakeLlm(BaseLlm):
+    """Deterministic stand-in for Gemini used by the benchmarks.
+
+    - A prompt that mentions a tool keyword (`tool_keywords`) gets a function
+      call to that tool first; the tool result is then echoed back.
+    - Anything else is answered with an echo of the prompt, split into
+      `chunks` partial responses when the runner streams (SSE mode).
+    """
+
+    latency: float = BENCH_MODEL_LATENCY
+    chunks: int = BENCH_MODEL_CHUNKS
+    chunk_delay: float = BENCH_MODEL_CHUNK_DELAY
+    # 프롬프트에 포함된 단어 -> (도구 이름, 인자)
+    tool_keywords: dict[str, tuple[str, dict]] = {
+        'weather': ('get_weather', {'city': 'New York'}),
+        'time': ('get_current_time', {'city': 'New York'}),
+    }
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        last = llm_request.contents[-1] if llm_request.contents else None
+        parts = last.parts if last and last.parts else []
+        function_responses = [part.function_response for part in parts if part.function_response]
+        if function_responses:
+            text = ' '.join(str(response.response) for response in function_responses)
+        else:
+            prompt = ' '.join(part.text for part in parts if part.text)
+            for keyword, (tool, args) in self.tool_keywords.items():
+                if keyword in prompt.lower() and tool in llm_request.tools_dict:
+                    yield LlmResponse(content=types.Content(
+                        role='model', parts=[types.Part(function_call=types.FunctionCall(name=tool, args=args))]
+                    ))
+                    return
+            text = f'Echo: {prompt}'
+        if stream and self.chunks > 1:
+            size = max(1, len(text) // self.chunks)
+            for start in range(0, len(text), size):
+                yield LlmResponse(
+                    content=types.Content(role='model', parts=[types.Part(text=text[start:start + size])]),
+                    partial=True,
+                )
+                await asyncio.sleep(self.chunk_delay)
+        yield LlmResponse(content=types.Content(role='model', parts=[types.Part(text=text)]))
@@ -0,0 +1,49 @@
+import asyncio
+import os
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.types import AgentCapabilities, AgentCard, Part, TaskState, TextPart
+
+# 원격 A2A 에이전트 대역의 응답 지연(초)입니다.
+BENCH_PEER_LATENCY = float(os.getenv("BENCH_PEER_LATENCY") or 0.05)
+BENCH_PEER_URL = os.getenv("BENCH_PEER_URL") or "http://127.0.0.1:10118/"
+
+
+class EchoAgentExecutor(AgentExecutor):
+    """Completes every task with an echo of the message after a fixed delay."""
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue):
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        if not context.current_task:
+            updater.submit()
+        updater.start_work()
+        await asyncio.sleep(BENCH_PEER_LATENCY)
+        updater.add_artifact(
+            [Part(root=TextPart(text=f'Peer echo: {context.get_user_input()}'))], artifact_id=context.task_id
+        )
+        updater.complete()
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        TaskUpdater(event_queue, context.task_id, context.context_id).update_status(
+            TaskState.canceled, final=True
+        )
+
+
+def create_peer_app():
+    """Starlette app of a fake remote A2A agent, for `uvicorn --factory`."""
+    agent_card = AgentCard(
+        name='bench_peer',
+        description='Echoes the message back (benchmark stand-in for a remote agent).',
+        url=BENCH_PEER_URL,
+        version='1.0.0',
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+    request_handler = DefaultRequestHandler(agent_executor=EchoAgentExecutor(), task_store=InMemoryTaskStore())
+    return A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).build()
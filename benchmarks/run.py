@@ -0,0 +1,370 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+SCENARIOS = ('send', 'stream', 'tool', 'peer', 'sessions')
+# 시나리오별 프롬프트입니다. FakeLlm은 키워드에 따라 도구를 호출합니다.
+PROMPTS = {
+    'send': 'hello',
+    'stream': 'hello',
+    'tool': 'what is the weather?',
+    'peer': 'ask the peer',
+}
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Load test create_app() with a fake model and a fake remote A2A agent.',
+    )
+    parser.add_argument('--workers', type=int, default=1, help='UVICORN_WORKERS of the server under test')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients per scenario')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests before each scenario')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f'comma separated, from {SCENARIOS}')
+    parser.add_argument('--streaming-mode', choices=('sse', 'none'), default='sse', help='ADK_STREAMING_MODE')
+    parser.add_argument('--model-latency', type=float, default=0.05, help='fake model latency (s)')
+    parser.add_argument('--peer-latency', type=float, default=0.05, help='fake remote agent latency (s)')
+    parser.add_argument('--output-dir', default=os.path.join(ROOT_DIR, 'benchmarks', 'results'))
+    parser.add_argument('--url', help='benchmark a server that is already running instead of starting one')
+    return parser.parse_args()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn(factory: str, port: int, workers: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', factory, '--factory',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning',
+        ],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, url: str, process: subprocess.Popen | None, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}')
+        try:
+            if (await client.get(url + '.well-known/agent.json')).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f'{url} did not become ready in {timeout}s')
+
+
+def _process_tree_rss(pid: int) -> int | None:
+    """RSS in bytes of a process and all its descendants (Linux /proc only)."""
+    if not os.path.isdir('/proc'):
+        return None
+    children: dict[int, list[int]] = {}
+    for stat_path in glob.glob('/proc/[0-9]*/stat'):
+        try:
+            with open(stat_path) as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat_path.split('/')[2]))
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+        stack.extend(children.get(current, []))
+    return total
+
+
+def _summary(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    values = sorted(values)
+
+    def percentile(q: float) -> float:
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    return {
+        'p50': round(percentile(0.50) * 1000, 2),
+        'p95': round(percentile(0.95) * 1000, 2),
+        'p99': round(percentile(0.99) * 1000, 2),
+        'mean': round(sum(values) / len(values) * 1000, 2),
+    }
+
+
+def _message_request(method: str, text: str, context_id: str) -> dict:
+    return {
+        'jsonrpc': '2.0',
+        'id': str(uuid.uuid4()),
+        'method': method,
+        'params': {
+            'message': {
+                'role': 'user',
+                'parts': [{'kind': 'text', 'text': text}],
+                'messageId': str(uuid.uuid4()),
+                'contextId': context_id,
+            }
+        },
+    }
+
+
+async def _send(client: httpx.AsyncClient, url: str, text: str, context_id: str) -> tuple[bool, None]:
+    response = await client.post(url, json=_message_request('message/send', text, context_id))
+    body = response.json()
+    ok = response.status_code == 200 and 'error' not in body and body['result']['status']['state'] == 'completed'
+    return ok, None
+
+
+async def _stream(client: httpx.AsyncClient, url: str, text: str, context_id: str) -> tuple[bool, float | None]:
+    started = time.perf_counter()
+    first_event = None
+    last = None
+    async with client.stream('POST', url, json=_message_request('message/stream', text, context_id)) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith('data:'):
+                continue
+            if first_event is None:
+                first_event = time.perf_counter() - started
+            last = json.loads(line[5:])
+    ok = (
+        last is not None
+        and 'error' not in last
+        and last['result'].get('final', False)
+        and last['result']['status']['state'] == 'completed'
+    )
+    return ok, first_event
+
+
+async def _sessions(client: httpx.AsyncClient, url: str, app_name: str, context_id: str) -> tuple[bool, None]:
+    base = f'{url}apps/{app_name}/users/self/sessions'
+    listed = await client.get(base, params={'limit': 20})
+    messages = await client.get(f'{base}/{context_id}/messages', params={'last': 20})
+    return listed.status_code == 200 and messages.status_code == 200, None
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    url: str,
+    scenario: str,
+    *,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    context_ids: list[str],
+    app_name: str,
+) -> dict:
+    async def one(i: int) -> tuple[bool, float | None]:
+        if scenario == 'sessions':
+            return await _sessions(client, url, app_name, context_ids[i % len(context_ids)])
+        context_id = str(uuid.uuid4())
+        context_ids.append(context_id)
+        if scenario == 'stream':
+            return await _stream(client, url, PROMPTS[scenario], context_id)
+        return await _send(client, url, PROMPTS[scenario], context_id)
+
+    latencies: list[float] = []
+    first_events: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def client_loop():
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                ok, first_event = await one(i)
+            except (httpx.HTTPError, KeyError, ValueError):
+                ok, first_event = False, None
+            latencies.append(time.perf_counter() - started)
+            if first_event is not None:
+                first_events.append(first_event)
+            if not ok:
+                errors += 1
+
+    for i in range(warmup):
+        await one(i)
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    result = {
+        'requests': requests,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'latency_ms': _summary(latencies),
+    }
+    if first_events:
+        result['first_event_ms'] = _summary(first_events)
+    return result
+
+
+def _git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {'commit': git('rev-parse', '--short', 'HEAD'), 'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+
+
+def _previous_result(output_dir: str, config: dict) -> dict | None:
+    for path in sorted(glob.glob(os.path.join(output_dir, '*.json')), reverse=True):
+        with open(path) as f:
+            result = json.load(f)
+        if result.get('config') == config:
+            return result
+    return None
+
+
+def _print_report(result: dict, previous: dict | None):
+    if previous:
+        print(f"Compared with {previous['git']['commit']} ({previous['timestamp']})")
+    header = f"{'scenario':<10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    print(header)
+    for name, stats in result['scenarios'].items():
+        latency = stats['latency_ms'] or {}
+        line = (
+            f"{name:<10}{stats['throughput_rps']:>10}{latency.get('p50', '-'):>10}"
+            f"{latency.get('p95', '-'):>10}{latency.get('p99', '-'):>10}{stats['errors']:>8}"
+        )
+        before = previous['scenarios'].get(name) if previous else None
+        if before and before['throughput_rps']:
+            change = (stats['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100
+            line += f"  rps {change:+.1f}%"
+        print(line)
+    if result['rss_bytes'] is not None:
+        print(f"server RSS peak: {result['rss_bytes'] / 1024 / 1024:.1f} MiB")
+
+
+async def run(args) -> dict:
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+    data_dir = tempfile.mkdtemp(prefix='a2adk-bench-')
+    os.makedirs(os.path.join(data_dir, 'bucket'), exist_ok=True)
+    peer_port, server_port = _free_port(), _free_port()
+    peer_url = f'http://127.0.0.1:{peer_port}/'
+    env = {
+        **os.environ,
+        'GOOGLE_API_KEY': os.getenv('GOOGLE_API_KEY') or 'benchmark',
+        'GCS_BUCKET': f"file://{os.path.join(data_dir, 'bucket')}",
+        'A2ADK_DATA_DIR': data_dir,
+        'UVICORN_WORKERS': str(args.workers),
+        'ADK_STREAMING_MODE': args.streaming_mode,
+        'BENCH_MODEL_LATENCY': str(args.model_latency),
+        'BENCH_PEER_LATENCY': str(args.peer_latency),
+        'BENCH_PEER_URL': peer_url,
+        'PYTHONPATH': os.pathsep.join(filter(None, [ROOT_DIR, os.getenv('PYTHONPATH')])),
+    }
+    processes = []
+    url = args.url
+    if url is None:
+        url = f'http://127.0.0.1:{server_port}/'
+        env['VITE_A2A_SERVER_URL'] = url
+        processes.append(_start_uvicorn('benchmarks.peer:create_peer_app', peer_port, 1, env))
+        processes.append(_start_uvicorn('benchmarks.app:create_bench_app', server_port, args.workers, env))
+    server = processes[-1] if processes else None
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    rss_peak = None
+    try:
+        async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+            if processes:
+                await _wait_ready(client, peer_url, processes[0])
+            await _wait_ready(client, url, server)
+            app_name = 'weather_time_agent'
+
+            async def sample_rss():
+                nonlocal rss_peak
+                while True:
+                    rss = _process_tree_rss(server.pid)
+                    if rss is not None:
+                        rss_peak = max(rss_peak or 0, rss)
+                    await asyncio.sleep(0.2)
+
+            sampler = asyncio.create_task(sample_rss()) if server is not None else None
+            context_ids: list[str] = []
+            results = {}
+            try:
+                for scenario in scenarios:
+                    if scenario == 'sessions' and not context_ids:
+                        await _run_scenario(
+                            client, url, 'send', concurrency=args.concurrency, requests=args.concurrency,
+                            warmup=0, context_ids=context_ids, app_name=app_name,
+                        )
+                    results[scenario] = await _run_scenario(
+                        client, url, scenario, concurrency=args.concurrency, requests=args.requests,
+                        warmup=args.warmup, context_ids=context_ids, app_name=app_name,
+                    )
+                    print(f'{scenario}: {results[scenario]}', file=sys.stderr)
+            finally:
+                if sampler is not None:
+                    sampler.cancel()
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': _git_revision(),
+        'python': sys.version.split()[0],
+        'config': {
+            'workers': args.workers,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'streaming_mode': args.streaming_mode,
+            'model_latency': args.model_latency,
+            'peer_latency': args.peer_latency,
+            'url': args.url,
+        },
+        'scenarios': results,
+        'rss_bytes': rss_peak,
+    }
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(run(args))
+    os.makedirs(args.output_dir, exist_ok=True)
+    previous = _previous_result(args.output_dir, result['config'])
+    path = os.path.join(
+        args.output_dir, f"{result['timestamp'].replace(':', '')}-{result['git']['commit'] or 'unknown'}.json"
+    )
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+    _print_report(result, previous)
+    print(f'Saved {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import asyncio
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.artifacts.gcs_artifact_service import GcsArtifactService
+from google.genai import types
+
+from a2adk import artifacts
+
+
+class FakeGcsArtifactService(GcsArtifactService):
+    """GcsArtifactService whose artifacts are kept in memory."""
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self.saved = InMemoryArtifactService()
+
+    async def save_artifact(self, **kwargs) -> int:
+        return await self.saved.save_artifact(**kwargs)
+
+
+def _spill(artifact_service) -> list[types.Part]:
+    part = types.Part(inline_data=types.Blob(data=b'x' * 10, mime_type='image/png', display_name='chart.png'))
+    return asyncio.run(artifacts.spill_large_inline_parts(
+        [part], artifact_service=artifact_service, app_name='app', user_id='self', session_id='s', max_bytes=4
+    ))
+
+
+def test_spilled_response_links_to_bucket_route(monkeypatch):
+    monkeypatch.setattr(artifacts, 'A2A_SERVER_URL', 'https://agents.example.com/')
+    monkeypatch.setattr(artifacts, 'GCS_BUCKET', 'files')
+    [part] = _spill(FakeGcsArtifactService('files'))
+    assert part.file_data.file_uri == 'https://agents.example.com/buckets/app/self/s/chart.png/0'
+    assert part.file_data.mime_type == 'image/png'
+
+
+def test_response_stays_inline_without_fetchable_url(monkeypatch):
+    monkeypatch.setattr(artifacts, 'A2A_SERVER_URL', 'https://agents.example.com')
+    monkeypatch.setattr(artifacts, 'GCS_BUCKET', 'files')
+    for service in (FakeGcsArtifactService('other'), InMemoryArtifactService()):
+        [part] = _spill(service)
+        assert part.inline_data.data == b'x' * 10
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from a2a.server.events.event_consumer import QueueClosed
+from a2a.types import Task, TaskState, TaskStatus, TaskStatusUpdateEvent
+
+from a2adk.tasks import BatchingTaskStore, DistributedQueueManager, SqliteEventBroker, SqliteTaskStore
+from a2adk.tasks import base
+
+
+def _sqlite_backend(tmp_path):
+    path = str(tmp_path / 'tasks.db')
+    return lambda: (SqliteTaskStore(path), SqliteEventBroker(path, poll_interval=0.01))
+
+
+def _redis_backend(tmp_path):
+    fakeredis = pytest.importorskip('fakeredis')
+    from a2adk.tasks.redis_backend import RedisEventBroker, RedisTaskStore
+
+    server = fakeredis.FakeServer()
+
+    def create():
+        return (
+            RedisTaskStore(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)),
+            RedisEventBroker(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)),
+        )
+
+    return create
+
+
+class FlakyTaskStore(BatchingTaskStore):
+    """In-memory store whose first `failures` writes fail."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.tasks: dict[str, Task] = {}
+
+    async def _write(self, tasks: list[Task]):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('backend unavailable')
+        self.tasks.update((task.id, task) for task in tasks)
+
+    async def _read(self, task_id: str) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def _delete(self, task_id: str):
+        self.tasks.pop(task_id, None)
+
+
+BACKENDS = pytest.mark.parametrize('backend', [_sqlite_backend, _redis_backend], ids=['sqlite', 'redis'])
+
+
+def _task(state: TaskState) -> Task:
+    return Task(id='t', contextId='c', status=TaskStatus(state=state))
+
+
+def _status(state: TaskState, final: bool = False) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(taskId='t', contextId='c', status=TaskStatus(state=state), final=final)
+
+
+@BACKENDS
+def test_task_saved_on_one_worker_is_read_on_another(tmp_path, backend):
+    async def run():
+        create = backend(tmp_path)
+        (store_a, broker_a), (store_b, broker_b) = create(), create()
+        await asyncio.gather(store_a.save(_task(TaskState.submitted)), store_a.save(_task(TaskState.working)))
+        assert (await store_b.get('t')).status.state == TaskState.working
+        await store_a.delete('t')
+        assert await store_b.get('t') is None
+        for closeable in (store_a, broker_a, store_b, broker_b):
+            await closeable.close()
+
+    asyncio.run(run())
+
+
+@BACKENDS
+def test_remote_tap_receives_events_until_the_task_queue_closes(tmp_path, backend):
+    async def run():
+        create = backend(tmp_path)
+        (_, broker_a), (_, broker_b) = create(), create()
+        worker_a, worker_b = DistributedQueueManager(broker_a), DistributedQueueManager(broker_b)
+
+        queue = await worker_a.create_or_tap('t')
+        assert await broker_b.is_live('t')
+        remote = await worker_b.tap('t')
+        assert remote is not None
+
+        queue.enqueue_event(_status(TaskState.working))
+        queue.enqueue_event(_status(TaskState.completed, final=True))
+        for state in (TaskState.working, TaskState.completed):
+            event = await asyncio.wait_for(remote.dequeue_event(), timeout=5)
+            assert event.status.state == state
+            remote.task_done()
+
+        await asyncio.wait_for(worker_a.close('t'), timeout=5)
+        # 종료 표시를 받은 원격 tap도 닫혀야 합니다.
+        with pytest.raises((QueueClosed, asyncio.QueueEmpty)):
+            await asyncio.wait_for(remote.dequeue_event(), timeout=5)
+        assert not worker_a._forwarders
+        assert not await broker_b.is_live('t')
+        assert await worker_b.tap('t') is None
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+    asyncio.run(run())
+
+
+def test_failed_batch_is_retried_without_another_save(monkeypatch):
+    monkeypatch.setattr(base, 'TASK_STORE_RETRY_DELAY', 0.01)
+
+    async def run():
+        store = FlakyTaskStore(failures=2)
+        with pytest.raises(ConnectionError):
+            await store.save(_task(TaskState.working))
+        for _ in range(100):
+            if 't' in store.tasks:
+                break
+            await asyncio.sleep(0.01)
+        assert store.tasks['t'].status.state == TaskState.working
+        assert not store._pending and store._batch is None
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+import asyncio
+import uuid
+
+import pytest
+from a2a.server.events import EventQueue
+from a2a.server.agent_execution import RequestContext
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Message, MessageSendParams, Part, Role, Task, TaskIdParams, TaskState, TaskStatus, TextPart
+from a2a.utils.errors import ServerError
+
+from a2adk.adk_agent_executor import ADKAgentExecutor
+from a2adk.request_handler import ADKRequestHandler
+
+
+def _executor() -> ADKAgentExecutor:
+    return ADKAgentExecutor('root_agent', artifact_service=None, session_service=None, memory_service=None)
+
+
+def test_cancel_cancels_the_running_agent_once():
+    async def run():
+        executor = _executor()
+        started = asyncio.Event()
+        producers = []
+
+        async def never_finishes(messages):
+            producers.append(asyncio.current_task())
+            started.set()
+            await asyncio.sleep(60)
+
+        executor._process_messages = never_finishes
+        handler = ADKRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+        message = Message(messageId=str(uuid.uuid4()), contextId='c', role=Role.user, parts=[Part(TextPart(text='hi'))])
+        send = asyncio.create_task(handler.on_message_send(MessageSendParams(message=message)))
+        await started.wait()
+        task_id = next(iter(handler._running_agents))
+
+        canceled = await handler.on_cancel_task(TaskIdParams(id=task_id))
+        assert canceled.status.state == TaskState.canceled
+        assert (await send).status.state == TaskState.canceled
+        # execute()가 취소 상태를 한 번 해제하므로 남은 취소 요청이 없어야 합니다.
+        assert producers[0].done() and producers[0].cancelling() == 0
+
+    asyncio.run(run())
+
+
+def test_cancel_refuses_tasks_running_elsewhere():
+    async def run():
+        task = Task(id='t', contextId='c', status=TaskStatus(state=TaskState.working))
+        context = RequestContext(None, task_id='t', context_id='c', task=task)
+        with pytest.raises(ServerError):
+            await _executor().cancel(context, EventQueue())
+
+    asyncio.run(run())
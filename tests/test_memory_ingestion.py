@@ -0,0 +1,43 @@
+import asyncio
+
+from google.adk.events import Event
+from google.adk.memory import BaseMemoryService
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from a2adk.memory import MemoryIngestionQueue
+
+
+class SlowMemoryService(BaseMemoryService):
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.sessions: list[str] = []
+
+    async def add_session_to_memory(self, session):
+        self.started.set()
+        await asyncio.sleep(0.1)
+        self.sessions.append(session.id)
+
+    async def search_memory(self, *, app_name, user_id, query):
+        raise NotImplementedError
+
+
+def test_close_finishes_the_batch_in_flight(tmp_path):
+    async def run():
+        sessions = InMemorySessionService()
+        session = await sessions.create_session(app_name='app', user_id='u', session_id='s')
+        await sessions.append_event(
+            session,
+            Event(invocation_id='e-1', author='user', content=types.UserContent(parts=[types.Part(text='hi')])),
+        )
+        memory = SlowMemoryService()
+        queue = MemoryIngestionQueue(
+            memory, sessions, watermark_path=str(tmp_path / 'watermarks.db'), debounce=0, max_delay=0
+        )
+        await queue.submit('app', 'u', 's')
+        await memory.started.wait()
+        await queue.close()
+        assert memory.sessions == ['s']
+        assert queue.stats()['ingested_sessions'] == 1
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+import asyncio
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.genai import types
+
+from a2adk.sessions import CachingSessionService
+
+
+class CommitTimeSessionService(InMemorySessionService):
+    """In-memory sessions that behave like DatabaseSessionService on append.
+
+    The stored update time is the commit time, later than the event's
+    timestamp, and appending to a session older than the stored one fails.
+    """
+
+    def __init__(self, delay: float = 1.0):
+        super().__init__()
+        self._delay = delay
+        self.update_times: dict[str, float] = {}
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        stored = self.update_times.get(session.id)
+        if stored is not None and stored > session.last_update_time:
+            raise ValueError('stale session')
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp + self._delay
+        self.update_times[session.id] = session.last_update_time
+        return event
+
+
+def _event(text: str) -> Event:
+    return Event(invocation_id='e-1', author='user', content=types.UserContent(parts=[types.Part(text=text)]))
+
+
+def test_append_keeps_update_time_of_wrapped_service():
+    async def run():
+        wrapped = CommitTimeSessionService()
+        cache = CachingSessionService(wrapped)
+        await cache.create_session(app_name='app', user_id='u', session_id='s')
+        for turn in range(3):
+            session = await cache.get_session(app_name='app', user_id='u', session_id='s')
+            await cache.append_event(session, _event(f'turn {turn}'))
+        session = await cache.get_session(app_name='app', user_id='u', session_id='s')
+        assert session.last_update_time == wrapped.update_times['s']
+        assert [event.content.parts[0].text for event in session.events] == ['turn 0', 'turn 1', 'turn 2']
+        assert cache.stats()['hits'] == 4
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import asyncio
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from a2adk.sessions import SessionSummaryIndex, SummaryIndexingSessionService
+
+
+def _event(text: str) -> Event:
+    return Event(invocation_id='e-1', author='user', content=types.UserContent(parts=[types.Part(text=text)]))
+
+
+def test_reconcile_adds_sessions_written_elsewhere_and_drops_unknown(tmp_path):
+    async def run():
+        backend = InMemorySessionService()
+        index = SessionSummaryIndex(str(tmp_path / 'index.db'))
+        service = SummaryIndexingSessionService(backend, index)
+
+        local = await service.create_session(app_name='app', user_id='u', session_id='local')
+        await service.append_event(local, _event('hello'))
+        # 다른 워커가 만든 세션은 이 워커의 인덱스를 거치지 않습니다.
+        remote = await backend.create_session(app_name='app', user_id='u', session_id='remote')
+        await backend.append_event(remote, _event('from another pod'))
+
+        await index.reconcile(service, 'app', 'u')
+        summaries, _ = await index.list_summaries('app', 'u', limit=10)
+        assert [summary['id'] for summary in summaries] == ['remote', 'local']
+        assert summaries[0]['title'] == 'from another pod'
+        assert 'state' not in summaries[0]
+
+        # 메모리 세션 서비스가 재시작되어 세션이 사라진 경우입니다.
+        await backend.delete_session(app_name='app', user_id='u', session_id='local')
+        await index.reconcile(service, 'app', 'u')
+        summaries, _ = await index.list_summaries('app', 'u', limit=10)
+        assert [summary['id'] for summary in summaries] == ['remote']
+
+    asyncio.run(run())
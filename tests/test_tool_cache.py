@@ -0,0 +1,34 @@
+import asyncio
+
+from a2adk.agents.tool_cache import CachedFunctionTool, ToolCachePolicy
+
+
+def count_items(city: str) -> int:
+    """Count the items of a city."""
+    return 0
+
+
+async def lookup(city: str) -> list:
+    """Look up a city."""
+    return []
+
+
+def test_blocking_tool_drops_unknown_args_and_keeps_falsy_result():
+    async def run():
+        tool = CachedFunctionTool(count_items, ToolCachePolicy())
+        assert await tool.run_async(args={'city': 'Seoul', 'country': 'KR'}, tool_context=None) == 0
+        assert await tool.run_async(args={'city': 'Seoul'}, tool_context=None) == 0
+        assert tool.stats()['hits'] == 1
+
+        missing = await tool.run_async(args={'country': 'KR'}, tool_context=None)
+        assert 'city' in missing['error']
+
+    asyncio.run(run())
+
+
+def test_async_tool_keeps_falsy_result():
+    async def run():
+        tool = CachedFunctionTool(lookup, ToolCachePolicy())
+        assert await tool.run_async(args={'city': 'Seoul', 'extra': 1}, tool_context=None) == []
+
+    asyncio.run(run())